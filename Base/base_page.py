@@ -3,15 +3,176 @@ from selenium.common import NoSuchElementException, StaleElementReferenceExcepti
     ElementNotInteractableException
  
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.common.by import By
 import logging
 from functools import wraps
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
+import inspect
+import random
 import time
+import uuid
+from utils.metrics import metrics
+from utils.navigation_cache import navigation_cache
+from utils.settings_manager import settings_manager
+from utils.visual_diff import get_visual_diff, relative_rect
+
+logger = logging.getLogger(__name__)
+
+
+class InputModes:
+    """Typing strategies of WrapWebElement.send_keys"""
+    NATIVE = "native"        # one WebDriver send keys command
+    JS = "js"                # value set by script, fires input/change events
+    HUMANLIKE = "humanlike"  # one key at a time with jittered delay
+    AUTO = "auto"            # JS for clear_and_type and long text, native otherwise
+
+
+# Keys.* values are characters of the Unicode private use area; a script cannot type them
+KEY_SEQUENCE_CHARS = ("\ue000", "\uf8ff")
+
+# Sets value through the native setter (works with framework-controlled inputs) and fires input/change events.
+# Returns false without touching elements that do not take a typed value (file inputs, non-input elements) or would
+# reject typing (disabled, readonly), so native typing runs and raises its error. Like typing, honours maxlength.
+SET_VALUE_SCRIPT = """
+var element = arguments[0], value = arguments[1], clear = arguments[2];
+if (!(element instanceof HTMLInputElement || element instanceof HTMLTextAreaElement) || element.type === 'file' ||
+        element.disabled || element.readOnly) {
+    return false;
+}
+var prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+var setter = Object.getOwnPropertyDescriptor(prototype, 'value').set;
+var text = clear ? value : element.value + value;
+if (element.maxLength >= 0) { text = text.slice(0, element.maxLength); }
+element.focus();
+setter.call(element, text);
+element.dispatchEvent(new Event('input', {bubbles: true}));
+element.dispatchEvent(new Event('change', {bubbles: true}));
+return true;
+"""
+
+# Runs a recorded ActionBatch in one asynchronous script call, waiting in the browser for each element to be visible.
+# Calls back with null on success or {index, error} for the first step that failed. Steps a native command would reject
+# (disabled, readonly or obscured elements) fail here too, so the native fallback runs them and reports the real error.
+# Progress (index of the first step not completed) is kept in window and sessionStorage, which survives same-origin
+# navigation, so it can be read back with BATCH_PROGRESS_SCRIPT when the script call itself fails.
+RUN_BATCH_SCRIPT = """
+var steps = arguments[0], deadline = Date.now() + arguments[1], runId = arguments[2];
+var done = arguments[arguments.length - 1];
+function progress(index) {
+    window.__bddBatchProgress = {run: runId, index: index};
+    try { sessionStorage.setItem('__bddBatchProgress', JSON.stringify(window.__bddBatchProgress)); } catch (e) {}
+}
+function finish(result) {
+    try { sessionStorage.removeItem('__bddBatchProgress'); } catch (e) {}
+    done(result);
+}
+function locate(step) {
+    if (step.using === 'id') { return document.getElementById(step.value); }
+    if (step.using === 'xpath') {
+        return document.evaluate(step.value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (step.using === 'link text' || step.using === 'partial link text') {
+        return Array.prototype.find.call(document.links, function (link) {
+            var text = link.textContent.trim();
+            return step.using === 'link text' ? text === step.value : text.indexOf(step.value) !== -1;
+        }) || null;
+    }
+    return document.querySelector(step.value);
+}
+function visible(element) {
+    return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length) &&
+        window.getComputedStyle(element).visibility !== 'hidden';
+}
+function setValue(element, value) {
+    if (element.disabled || element.readOnly) { return 'Element is not editable'; }
+    if (element.maxLength >= 0) { value = value.slice(0, element.maxLength); }
+    var prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    element.focus();
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    return null;
+}
+function click(element) {
+    if (element.disabled) { return 'Element is disabled'; }
+    var rect = element.getBoundingClientRect();
+    var target = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+    if (!target || !(target === element || element.contains(target))) {
+        return 'Element is obscured or outside the viewport';
+    }
+    element.click();
+    return null;
+}
+var index = 0;
+function next() {
+    for (; index < steps.length; index++) {
+        var step = steps[index], element;
+        try {
+            element = locate(step);
+        } catch (e) {
+            return finish({index: index, error: 'Invalid locator: ' + e.message});
+        }
+        if (!element || !visible(element)) {
+            if (Date.now() > deadline) { return finish({index: index, error: 'Element not visible'}); }
+            return setTimeout(next, 50);
+        }
+        var error = null;
+        try {
+            if (step.action === 'type') { error = setValue(element, step.text); }
+            else if (step.action === 'clear') { error = setValue(element, ''); }
+            else if (step.action === 'click') { error = click(element); }
+        } catch (e) {
+            error = e.message;
+        }
+        if (error) { return finish({index: index, error: error}); }
+        progress(index + 1);
+    }
+    finish(null);
+}
+progress(0);
+next();
+"""
+
+# Index of the first step a batch run (arguments[0]) did not complete, null if its progress is unknown
+BATCH_PROGRESS_SCRIPT = """
+var progress = window.__bddBatchProgress;
+try {
+    if (!progress) { progress = JSON.parse(sessionStorage.getItem('__bddBatchProgress')); }
+    sessionStorage.removeItem('__bddBatchProgress');
+} catch (e) {}
+return progress && progress.run === arguments[0] ? progress.index : null;
+"""
+
+# Locator strategies without a direct DOM lookup, converted to CSS selectors for RUN_BATCH_SCRIPT
+BATCH_CSS_STRATEGIES = {
+    By.NAME: lambda value: f'[name="{value}"]',
+    By.CLASS_NAME: lambda value: f".{value}",
+    By.TAG_NAME: lambda value: value,
+}
+
+
+class BatchStepError(Exception):
+    """Raised when a step of an ActionBatch fails, identifying the step and its locator."""
+
+    def __init__(self, index, action, locator, reason):
+        self.index = index
+        self.action = action
+        self.locator = locator
+        super().__init__(f"Batch step {index + 1} ({action} {locator}) failed: {reason}")
 
 
 class BasePage:
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        Records the duration of public page object methods as "ClassName.method" action metrics.
+        """
+        super().__init_subclass__(**kwargs)
+        for name, attribute in list(vars(cls).items()):
+            if not name.startswith('_') and inspect.isfunction(attribute):
+                setattr(cls, name, metrics.timed("action", f"{cls.__name__}.{name}")(attribute))
+
     def __init__(self, driver):
         self.driver = driver    
         self.wait = WebDriverWait(self.driver, 10)
@@ -22,6 +183,24 @@ class BasePage:
         """
         self.driver.get(url)
 
+    def navigate_to_page(self, url, ready_locator, soft_reset_script=None, timeout=20):
+        """
+        Navigate to a page unless the driver already shows it in a clean, ready state
+        :param str url: URL to load
+        :param ready_locator: locator of the element that marks the page as ready
+        :param str soft_reset_script: Script restoring in-page state when the full load is skipped
+        :param int timeout: Maximum time to wait for the ready element after a full load
+        :return: True if the page was fully loaded, False if the load was avoided
+
+        """
+        if navigation_cache.try_reuse(self.driver, url, ready_locator, soft_reset_script):
+            return False
+        start = time.perf_counter()
+        self.driver.get(url)
+        self.wait_for_element_visible(ready_locator, timeout)
+        navigation_cache.record_load(self.driver, url, (time.perf_counter() - start) * 1000)
+        return True
+
     def get_page_title(self):
         """
         Get the current page title.
@@ -104,19 +283,17 @@ class BasePage:
         start_time = int(round(time.time() * 1000))
         element = None
         try:
-            logging.info("Waiting for maximum :: " + str(timeout) +
-                         " :: seconds for element to be visible and clickable")
+            logger.info("Waiting for maximum :: %s :: seconds for element %s", timeout, locator)
             wait = WebDriverWait(self.driver, timeout, poll_frequency=1.5,
                                  ignored_exceptions=[NoSuchElementException, ElementNotVisibleException,
                                                      ElementNotSelectableException])
             element = wait.until(wait_type(locator))
             end_time = int(round(time.time() * 1000))
             duration = (end_time - start_time) / 1000.00
-            logging.info("Element '"
-                         "' appeared on the web pages after :: " + "{0:.2f}".format(duration) + " :: seconds")
+            metrics.record("wait", f"{locator[0]}={locator[1]}", end_time - start_time)
+            logger.info("Element %s appeared on the web pages after :: %.2f :: seconds", locator, duration)
         except ElementNotVisibleException:
-            logging.error("Element '"
-                          "' not appeared on the web pages after :: " + str(timeout) + " :: seconds")
+            logger.error("Element %s not appeared on the web pages after :: %s :: seconds", locator, timeout)
         if isinstance(element, WebElement):
             return WrapWebElement(self.driver, element, locator)
         else:
@@ -156,38 +333,258 @@ class BasePage:
             return False
         return True
 
+    def assert_visual_match(self, locator, name, ignore=(), timeout=20):
+        """
+        Compare the screenshot of an element with its stored baseline
+        :param locator: locator of the element (region) to compare
+        :param str name: Baseline name, stored under the page object's folder
+        :param ignore: Locators of child elements or (x, y, width, height) rectangles to exclude
+        :param int timeout: Maximum time you want to wait for the element
+
+        """
+        start = time.perf_counter()
+        region = self.wait_for_element_visible(locator, timeout)
+        ignore_rects = []
+        if ignore:
+            scale = self.driver.execute_script("return window.devicePixelRatio || 1;")
+            region_rect = region.element.rect
+            for item in ignore:
+                if isinstance(item[0], str) and not isinstance(item[1], int):
+                    for element in self.driver.find_elements(*item):
+                        ignore_rects.append(relative_rect(region_rect, element.rect, scale))
+                else:
+                    ignore_rects.append(tuple(item))
+        result = get_visual_diff().check(region.element.screenshot_as_png, type(self).__name__, name, ignore_rects)
+        metrics.record("visual", f"{type(self).__name__}.{name}", (time.perf_counter() - start) * 1000)
+        assert result.passed, f"Visual mismatch for {type(self).__name__}.{name}: {result.message}"
+        return result
+
+    def batch(self, timeout=20):
+        """
+        Start recording a batch of element actions executed in a single WebDriver call
+        :param int timeout: Maximum time to wait for all batch elements to become visible
+        :rtype: ActionBatch
+
+        """
+        return ActionBatch(self, timeout)
+
+
+class ActionBatch:
+    """
+    Records clear/type/click steps on locators and runs them in one asynchronous script call.
+    If the script fails, the steps it did not complete are executed one by one with the regular waits
+    (within what is left of the timeout) so that the failing step is reported precisely.
+
+    """
+
+    def __init__(self, page, timeout=20):
+        self.page = page
+        self.timeout = timeout
+        self.steps = []
+
+    def clear(self, locator):
+        """
+        Record clearing an input
+        :param locator: locator of the element
+        :rtype: ActionBatch
+
+        """
+        self.steps.append(("clear", locator, None))
+        return self
+
+    def type(self, locator, text):
+        """
+        Record replacing the value of an input
+        :param locator: locator of the element
+        :param str text: Value to set
+        :rtype: ActionBatch
+
+        """
+        self.steps.append(("type", locator, text))
+        return self
+
+    def click(self, locator):
+        """
+        Record clicking an element
+        :param locator: locator of the element
+        :rtype: ActionBatch
+
+        """
+        self.steps.append(("click", locator, None))
+        return self
+
+    @staticmethod
+    def _to_script_step(action, locator, text):
+        using, value = locator
+        if using in BATCH_CSS_STRATEGIES:
+            using, value = By.CSS_SELECTOR, BATCH_CSS_STRATEGIES[using](value)
+        return {"action": action, "using": using, "value": value, "text": text}
+
+    def _run_step(self, index, timeout):
+        """Run one step with the regular waits, raising BatchStepError on failure."""
+        action, locator, text = self.steps[index]
+        try:
+            if action == "click":
+                self.page.wait_for_element_clickable(locator, timeout).click()
+            elif action == "type":
+                self.page.wait_for_element_visible(locator, timeout).clear_and_type(text, InputModes.NATIVE)
+            else:
+                self.page.wait_for_element_visible(locator, timeout).clear()
+        except Exception as e:
+            raise BatchStepError(index, action, locator, f"{type(e).__name__}: {e}") from e
+
+    def run(self):
+        """
+        Execute the recorded steps
+        :return: Number of WebDriver round trips used
+        :rtype: int
+
+        """
+        start = time.perf_counter()
+        script_steps = [self._to_script_step(*step) for step in self.steps]
+        run_id = uuid.uuid4().hex
+        round_trips = 1
+        try:
+            failure = self.page.driver.execute_async_script(RUN_BATCH_SCRIPT, script_steps, self.timeout * 1000,
+                                                            run_id)
+            if failure is None:
+                metrics.record("batch", "ActionBatch.script", (time.perf_counter() - start) * 1000)
+                return 1
+            first_pending = failure["index"]
+            logger.warning("Batch step %s failed in script (%s), continuing step by step",
+                           first_pending + 1, failure["error"])
+        except Exception as e:
+            # Steps the script completed (e.g. a click that navigated away) must not run twice
+            first_pending = self._read_progress(run_id)
+            round_trips += 1
+            if first_pending is None:
+                raise RuntimeError(f"Batch script failed ({e}) and its progress is unknown; "
+                                   f"steps are not repeated") from e
+            logger.warning("Batch script failed after %s of %s steps (%s), running the rest one by one",
+                           first_pending, len(self.steps), e)
+
+        deadline = start + self.timeout
+        for index in range(first_pending, len(self.steps)):
+            self._run_step(index, max(deadline - time.perf_counter(), 0))
+        metrics.record("batch", "ActionBatch.fallback", (time.perf_counter() - start) * 1000)
+        return round_trips + len(self.steps) - first_pending
+
+    def _read_progress(self, run_id):
+        """Index of the first step the failed script did not complete, None if it cannot be read."""
+        try:
+            return self.page.driver.execute_script(BATCH_PROGRESS_SCRIPT, run_id)
+        except Exception as e:
+            logger.warning("Could not read batch progress: %s", e)
+            return None
+
 
-class WrapWebElement(WebElement):
+class WrapWebElement:
     """
     This class defines the generic interceptor for the methods of wrapped web element references.It also provides
     implementations for methods that acquire web element references
 
+    The wrapper only holds the element, driver and locator in slots; WebElement attributes not defined here
+    (text, get_attribute, rect, ...) are delegated to the wrapped element. It is registered as a virtual
+    WebElement subclass, so isinstance checks and execute_script arguments keep working.
     """
-    element = None
-    driver = None
-    locator = None
+    __slots__ = ("element", "driver", "locator")
 
     def __init__(self, driver, element, locator=None):
-        super().__init__(element.parent, element._id)
         self.element = element
         self.driver = driver
         self.locator = locator
 
-    def send_keys(self, value, delay=0):
+    def __getattr__(self, name):
+        # Only reached for attributes the wrapper does not define; slots and dunders are never delegated
+        if name in WrapWebElement.__slots__ or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.element, name)
+
+    @property
+    def id(self):
+        # Read by Selenium for every element passed to execute_script, skip the __getattr__ fallback
+        return self.element.id
+
+    def __eq__(self, other):
+        return self.element == (other.element if isinstance(other, WrapWebElement) else other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.element)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.element.id} locator={self.locator}>"
+
+    @staticmethod
+    def _resolve_input_mode(value, mode=None, delay=0, clear=False):
+        """
+        Resolve the typing strategy for a value
+        :param str value: A string for typing
+        :param str mode: Requested InputModes value, defaults to input_mode setting
+        :param float delay: Per-character delay, forces humanlike typing
+        :param bool clear: Clear before typing; auto mode then fuses both into one script call
+        :rtype: str
+        :raises ValueError: If the mode is not an InputModes value
+
+        """
+        mode = mode or settings_manager.get("input_mode", InputModes.AUTO)
+        if mode not in (InputModes.NATIVE, InputModes.JS, InputModes.HUMANLIKE, InputModes.AUTO):
+            raise ValueError(f"Unsupported input mode: {mode}")
+        if delay:
+            return InputModes.HUMANLIKE
+        if mode == InputModes.AUTO:
+            low, high = KEY_SEQUENCE_CHARS
+            if any(low <= char <= high for char in value):
+                return InputModes.NATIVE
+            if clear:
+                return InputModes.JS
+            threshold = settings_manager.get("input_js_threshold", 64)
+            return InputModes.JS if len(value) >= threshold else InputModes.NATIVE
+        return mode
+
+    def _type(self, value, mode, delay=0, clear=False):
+        """
+        Type value with the resolved strategy and record its latency as an "input" metric
+        """
+        start = time.perf_counter()
+        if mode == InputModes.JS and not self.driver.execute_script(SET_VALUE_SCRIPT, self.element, value, clear):
+            logger.debug("%s takes no scripted value, typing natively", self.locator)
+            mode = InputModes.NATIVE
+        if mode != InputModes.JS:
+            if clear:
+                self.element.clear()
+            if mode == InputModes.HUMANLIKE:
+                delay = delay or float(settings_manager.get("input_humanlike_delay", 0.05))
+                for char in value:
+                    self.element.send_keys(char)
+                    time.sleep(delay * random.uniform(0.5, 1.5))
+            else:
+                self.element.send_keys(value)
+        metrics.record("input", f"input.{mode}{'+clear' if clear else ''}", (time.perf_counter() - start) * 1000)
+        return self
+
+    def send_keys(self, value, delay=0, mode=None):
         """
         Sends keys to current focused element.
         :param str value: A string for typing
         :param float delay: Requested wait time between typing each character
+        :param str mode: Typing strategy (InputModes), defaults to input_mode setting
         :rtype: WrapWebElement
 
         """
-        if delay:
-            for char in list(value):
-                self.element.send_keys(char)
-                time.sleep(delay)
-        else:
-            self.element.send_keys(value)
-        return self
+        return self._type(value, self._resolve_input_mode(value, mode, delay), delay)
+
+    def clear_and_type(self, value, mode=None):
+        """
+        Clears the element and types the value; in JS mode both happen in a single script call.
+        :param str value: A string for typing
+        :param str mode: Typing strategy (InputModes), defaults to input_mode setting
+        :rtype: WrapWebElement
+
+        """
+        return self._type(value, self._resolve_input_mode(value, mode, clear=True), clear=True)
 
     def find_element(self, *locator):
         """
@@ -268,8 +665,4 @@ class WrapWebElement(WebElement):
         return self
 
 
-
-
-
-
-
+WebElement.register(WrapWebElement)
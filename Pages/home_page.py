@@ -15,15 +15,28 @@ class HomePage(BasePage):
     
     HEADER = (By.CSS_SELECTOR, ".navbar-brand")
 
+    # Restores the homepage when its full load is skipped: closes open dialogs, resets forms, scrolls to the top
+    SOFT_RESET_SCRIPT = """
+    document.querySelectorAll('.modal.show').forEach(function (modal) {
+        modal.classList.remove('show');
+        modal.style.display = 'none';
+        modal.setAttribute('aria-hidden', 'true');
+    });
+    document.querySelectorAll('.modal-backdrop').forEach(function (backdrop) { backdrop.remove(); });
+    document.body.classList.remove('modal-open');
+    document.querySelectorAll('form').forEach(function (form) { form.reset(); });
+    if (document.activeElement) { document.activeElement.blur(); }
+    window.scrollTo(0, 0);
+    """
+
 
     def __init__(self, driver):
         super().__init__(driver)
         self.BASE_URL = settings_manager.get("base_url")
 
     def navigate_to_homepage(self):
-        """Navigate to DemoBlaze homepage"""
-        self.driver.get(self.BASE_URL)
-        self.wait_for_page_load()
+        """Navigate to DemoBlaze homepage, skipping the load if a reused driver already shows it"""
+        self.navigate_to_page(self.BASE_URL, self.HEADER, self.SOFT_RESET_SCRIPT)
         return HomePage(self.driver)
 
     def wait_for_page_load(self):
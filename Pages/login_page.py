@@ -17,18 +17,20 @@ class LoginPage(BasePage):
     
     def enter_username(self, username):
         """Enters username in authentication form"""
-        self.wait_for_element_visible(self.LOGIN_USERNAME_FIELD).clear().send_keys(username)
+        self.wait_for_element_visible(self.LOGIN_USERNAME_FIELD).clear_and_type(username)
     
     def enter_password(self, password):
         """Enters password in authentication form"""
-        self.wait_for_element_visible(self.LOGIN_PASSWORD_FIELD).clear().send_keys(password)
+        self.wait_for_element_visible(self.LOGIN_PASSWORD_FIELD).clear_and_type(password)
     
     def click_login_button(self):
         """Clicks the login button"""
         self.wait_for_element_clickable(self.LOGIN_BUTTON).click()
 
     def login(self, username, password):
-        """Completes login process"""
-        self.enter_username(username)
-        self.enter_password(password)
-        self.click_login_button()
+        """Completes login process in a single batched WebDriver call"""
+        self.batch() \
+            .type(self.LOGIN_USERNAME_FIELD, username) \
+            .type(self.LOGIN_PASSWORD_FIELD, password) \
+            .click(self.LOGIN_BUTTON) \
+            .run()
@@ -0,0 +1,63 @@
+"""
+Element Wrapper Micro-benchmark
+Measures allocation size and wrap cost of WrapWebElement, and get_element_list/find_elements with large results
+against the local stub WebDriver server.
+
+    python -m benchmarks.bench_elements --elements 1000 --iterations 200
+"""
+import argparse
+import tracemalloc
+
+from selenium.webdriver.common.by import By
+
+from Base.base_page import BasePage, WrapWebElement
+from benchmarks.bench_utils import measure, print_table, summarize
+from benchmarks.stub_webdriver import create_stub_driver, start_stub_server
+
+LOCATOR = (By.CSS_SELECTOR, ".row")
+
+
+def wrapper_bytes(driver, elements):
+    """Traced bytes allocated per wrapper, including everything the wrapper creates."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        wrappers = [WrapWebElement(driver, element, LOCATOR) for element in elements]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    # The list holding the wrappers is not part of their cost
+    return (allocated - wrappers.__sizeof__()) / len(wrappers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WrapWebElement allocation and wrap cost benchmark")
+    parser.add_argument("--elements", type=int, default=1000, help="Elements returned per find")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    server, url = start_stub_server(elements_per_find=args.elements)
+    driver = create_stub_driver(url)
+    try:
+        page = BasePage(driver)
+        elements = driver.find_elements(*LOCATOR)
+        parent = page.get_element(LOCATOR)
+
+        results = {
+            f"wrap {args.elements} elements": summarize(measure(
+                lambda: [WrapWebElement(driver, element, LOCATOR) for element in elements], args.iterations)),
+            f"get_element_list ({args.elements})": summarize(measure(
+                lambda: page.get_element_list(LOCATOR), args.iterations)),
+            f"element.find_elements ({args.elements})": summarize(measure(
+                lambda: parent.find_elements(LOCATOR), args.iterations)),
+            "wrapper attribute access (.id)": summarize(measure(lambda: parent.id, args.iterations * 100)),
+        }
+        print_table(results, f"{args.iterations} iterations")
+        print(f"\nAllocated per wrapper: {wrapper_bytes(driver, elements):.0f} bytes")
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Framework Micro-benchmark Suite
+Measures the framework's own overhead (BasePage waits and lookups, WrapWebElement chaining, page objects,
+settings and test data lookups) against the local stub WebDriver server, and compares it with a stored baseline.
+
+    python -m benchmarks.bench_framework --save-baseline     # record the baseline on this machine
+    python -m benchmarks.bench_framework --threshold 20      # compare, exit 1 on regressions
+"""
+import argparse
+import sys
+
+from selenium.webdriver.common.by import By
+
+from Base.base_page import BasePage, InputModes
+from Pages.home_page import HomePage
+from Pages.login_page import LoginPage
+from Pages.navigation_page import NavigationPage
+from benchmarks.bench_utils import compare, load_baseline, measure, print_table, save_baseline, summarize
+from benchmarks.stub_webdriver import create_stub_driver, start_stub_server
+from utils.metrics import metrics
+from utils.settings_manager import settings_manager
+from utils.test_data import test_data
+
+DEFAULT_BASELINE = "results/bench_baseline.json"
+
+LOCATOR = (By.ID, "loginusername")
+LIST_LOCATOR = (By.CSS_SELECTOR, ".row")
+ELEMENTS_PER_FIND = 10
+
+
+def build_benchmarks(driver):
+    """
+    Benchmarks as name -> (function, repeat); repeat > 1 for functions faster than the timer resolution.
+    """
+    page = BasePage(driver)
+    element = page.get_element(LOCATOR)
+    login_page, home_page, navigation_page = LoginPage(driver), HomePage(driver), NavigationPage(driver)
+    return {
+        "BasePage.wait_until (immediate)": (
+            lambda: BasePage.wait_until(lambda: 1, equals=1, timeout=1, interval=0.01), 100),
+        "BasePage.wait_until (find_elements)": (
+            lambda: BasePage.wait_until(driver.find_elements, params=LIST_LOCATOR, equals=1, timeout=1,
+                                        interval=0.01, list_check=True), 1),
+        "BasePage.get_element": (lambda: page.get_element(LOCATOR), 1),
+        f"BasePage.get_element_list ({ELEMENTS_PER_FIND})": (lambda: page.get_element_list(LIST_LOCATOR), 1),
+        "BasePage.wait_for_element": (lambda: page.wait_for_element(LOCATOR), 1),
+        "BasePage.wait_for_element_visible": (lambda: page.wait_for_element_visible(LOCATOR), 1),
+        "BasePage.wait_for_element_clickable": (lambda: page.wait_for_element_clickable(LOCATOR), 1),
+        "WrapWebElement clear().send_keys().click()": (
+            lambda: element.clear().send_keys("user", mode=InputModes.NATIVE).click(), 1),
+        "WrapWebElement clear_and_type (js)": (lambda: element.clear_and_type("user", mode=InputModes.JS), 1),
+        "WrapWebElement wait_visible().js_click()": (lambda: element.wait_visible().js_click(), 1),
+        "LoginPage.enter_username": (lambda: login_page.enter_username("testuser"), 1),
+        "LoginPage.login (batch)": (lambda: login_page.login("testuser", "testpass"), 1),
+        "HomePage.wait_for_page_load": (home_page.wait_for_page_load, 1),
+        "NavigationPage.get_welcome_message_text": (navigation_page.get_welcome_message_text, 1),
+        "SettingsManager.get": (lambda: settings_manager.get("browser", "chrome"), 1000),
+        "TestData.get_username": (lambda: test_data.get_username("testuser"), 1000),
+        "TestData.get_url": (lambda: test_data.get_url("homepage"), 1000),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Framework overhead micro-benchmarks")
+    parser.add_argument("--iterations", type=int, default=300, help="Samples per benchmark and round")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Rounds over all benchmarks; the round with the lowest p50 is kept per benchmark")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed p50 slowdown in percent")
+    args = parser.parse_args(argv)
+
+    server, url = start_stub_server(elements_per_find=ELEMENTS_PER_FIND)
+    driver = create_stub_driver(url)
+    # Metrics are buffered like in a run with the results store, and drained after every benchmark
+    metrics.start()
+    try:
+        benchmarks = {name: benchmark for name, benchmark in build_benchmarks(driver).items()
+                      if args.filter.lower() in name.lower()}
+        results = {}
+        # Interleaved rounds keep a burst of load on a shared machine from skewing a single benchmark
+        for _ in range(args.rounds):
+            for name, (function, repeat) in benchmarks.items():
+                summary = summarize(measure(function, args.iterations, repeat=repeat))
+                if name not in results or summary["p50"] < results[name]["p50"]:
+                    results[name] = summary
+                metrics.drain()
+    finally:
+        metrics.stop()
+        driver.quit()
+        server.shutdown()
+
+    print_table(results, f"Framework overhead against the stub WebDriver server, "
+                         f"best of {args.rounds} rounds of {args.iterations} samples")
+    if args.save_baseline:
+        save_baseline({**load_baseline(args.baseline), **results}, args.baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline first")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0f}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+WebDriver Transport Micro-benchmark
+Measures command round-trip latency against the local stub WebDriver server with Selenium's
+default transport (keep-alive, which webdriver.Chrome uses) and the tuned transport.
+Per-command connections (keep_alive=False) are shown for reference only.
+
+    python -m benchmarks.bench_transport --iterations 2000
+"""
+import argparse
+import warnings
+
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from benchmarks.bench_utils import measure, print_table, summarize
+from benchmarks.stub_webdriver import SESSION_ID, start_stub_server
+from utils.webdriver_transport import tune_executor
+
+
+def _executor(url, keep_alive, tuned=False, compression=False):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        executor = RemoteConnection(client_config=ClientConfig(remote_server_addr=url, keep_alive=keep_alive))
+    if tuned:
+        tune_executor(executor, keep_alive=True, compression=compression)
+    return executor
+
+
+def _command(executor, command):
+    return lambda: executor.execute(command, {"sessionId": SESSION_ID})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WebDriver command round-trip benchmark")
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    server, url = start_stub_server()
+    try:
+        small, large = {}, {}
+        variants = [
+            ("selenium default keep-alive", dict(keep_alive=True)),
+            ("tuned keep-alive pool", dict(keep_alive=True, tuned=True)),
+            ("per-command connection (reference)", dict(keep_alive=False)),
+        ]
+        for name, options in variants:
+            executor = _executor(url, **options)
+            small[name] = summarize(measure(_command(executor, Command.GET_TITLE), args.iterations))
+
+        large_iterations = max(args.iterations // 10, 20)
+        for compression in (False, True):
+            executor = _executor(url, keep_alive=True, tuned=True, compression=compression)
+            label = "gzip" if compression else "identity"
+            large[f"screenshot ({label})"] = summarize(
+                measure(_command(executor, Command.SCREENSHOT), large_iterations, warmup=2))
+            large[f"page source ({label})"] = summarize(
+                measure(_command(executor, Command.GET_PAGE_SOURCE), large_iterations, warmup=2))
+
+        print_table(small, f"Small command round trip (GET title), {args.iterations} iterations")
+        default_p50, tuned_p50 = small["selenium default keep-alive"]["p50"], small["tuned keep-alive pool"]["p50"]
+        print(f"Tuned vs Selenium default p50: {(tuned_p50 - default_p50) * 1000:+.1f} us "
+              f"({(tuned_p50 / default_p50 - 1) * 100:+.1f}%)")
+        print_table(large, f"Large payloads, {large_iterations} iterations")
+        print(f"\nStub server requests: {server.RequestHandlerClass.state.requests}, "
+              f"distinct client connections: {len(server.RequestHandlerClass.state.connections)}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
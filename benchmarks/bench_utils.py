@@ -0,0 +1,144 @@
+"""
+Benchmark Helpers
+Timing, percentile summaries and table output shared by the benchmark scripts
+"""
+import json
+import math
+import os
+import platform
+import time
+from typing import Callable, Dict, List
+
+
+def measure(function: Callable, iterations: int, warmup: int = 10, repeat: int = 1) -> List[float]:
+    """
+    Time repeated calls of a function.
+
+    Args:
+        function (Callable): Function without arguments
+        iterations (int): Measured samples
+        warmup (int): Unmeasured calls made first
+        repeat (int): Calls per sample, for functions faster than the timer resolution
+
+    Returns:
+        List[float]: Call durations in milliseconds (sample duration / repeat)
+    """
+    for _ in range(warmup):
+        function()
+    samples = []
+    calls = range(repeat)
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for _ in calls:
+            function()
+        samples.append((time.perf_counter() - start) * 1000 / repeat)
+    return samples
+
+
+def percentile(sorted_samples: List[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    rank = max(math.ceil(percent / 100 * len(sorted_samples)), 1)
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize durations.
+
+    Args:
+        samples (List[float]): Durations in milliseconds
+
+    Returns:
+        Dict[str, float]: p50, p95, p99, mean (ms) and throughput (ops/s)
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "mean": total / len(ordered),
+        "ops": len(ordered) / (total / 1000) if total else float("inf"),
+    }
+
+
+def print_table(results: Dict[str, Dict[str, float]], title: str = None):
+    """
+    Print summaries as an aligned table.
+
+    Args:
+        results (dict): name -> summarize() output
+        title (str): Optional table title
+    """
+    if title:
+        print(f"\n{title}")
+    width = max([len(name) for name in results] + [9])
+    # Durations are shown in microseconds, pure Python lookups take well below one millisecond
+    print(f"{'benchmark':<{width}} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'mean us':>9} {'ops/s':>10}")
+    for name, summary in results.items():
+        print(f"{name:<{width}} {summary['p50'] * 1000:9.1f} {summary['p95'] * 1000:9.1f} "
+              f"{summary['p99'] * 1000:9.1f} {summary['mean'] * 1000:9.1f} {summary['ops']:10.0f}")
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str):
+    """
+    Store summaries as the baseline for later comparisons.
+
+    Args:
+        results (dict): name -> summarize() output
+        path (str): Baseline JSON file
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    baseline = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Load stored baseline summaries.
+
+    Returns:
+        Dict[str, Dict[str, float]]: name -> summary, empty if there is no baseline
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float,
+            metric: str = "p50") -> List[str]:
+    """
+    Print results next to the baseline and find regressions.
+
+    Args:
+        results (dict): name -> summarize() output
+        baseline (dict): name -> stored summary
+        threshold (float): Allowed slowdown in percent
+        metric (str): Compared summary value
+
+    Returns:
+        List[str]: Names of benchmarks slower than the baseline by more than the threshold
+    """
+    regressions = []
+    width = max([len(name) for name in results] + [9])
+    print(f"\nComparison with baseline ({metric}, threshold {threshold:.0f}%)")
+    print(f"{'benchmark':<{width}} {'base us':>9} {'now us':>9} {'change':>8}")
+    for name, summary in results.items():
+        if name not in baseline:
+            print(f"{name:<{width}} {'-':>9} {summary[metric] * 1000:9.1f} {'new':>8}")
+            continue
+        before, now = baseline[name][metric], summary[metric]
+        change = (now - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<{width}} {before * 1000:9.1f} {now * 1000:9.1f} {change:+7.1f}%{flag}")
+    return regressions
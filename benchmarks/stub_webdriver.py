@@ -0,0 +1,179 @@
+"""
+Stub WebDriver Server
+Minimal local W3C WebDriver endpoint answering from memory, used to measure framework and transport
+overhead without a browser
+"""
+import base64
+import gzip
+import json
+import os
+import re
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.navigation_cache import CHECK_DOCUMENT_SCRIPT, MARK_DOCUMENT_SCRIPT, READ_STORAGE_SCRIPT
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+SESSION_ID = "stub-session"
+
+# Payload sizes of large responses, in bytes
+SCREENSHOT_BYTES = 400 * 1024
+PAGE_SOURCE_BYTES = 1024 * 1024
+
+# Responses smaller than this are never compressed
+GZIP_MIN_BYTES = 1024
+
+
+class StubState:
+    """Shared state of the stub server"""
+
+    def __init__(self, elements_per_find=1):
+        self.elements_per_find = elements_per_find
+        self.url = "about:blank"
+        # Navigation token of the current document, see utils.navigation_cache
+        self.token = None
+        self.storage = json.dumps([{}, {}])
+        # Incompressible bytes, like a real PNG
+        self.screenshot = base64.b64encode(os.urandom(SCREENSHOT_BYTES)).decode()
+        row = "<div class='row'><span class='cell'>stub content</span></div>\n"
+        self.page_source = "<html><body>" + row * (PAGE_SOURCE_BYTES // len(row)) + "</body></html>"
+        self.requests = 0
+        self.connections = set()
+
+
+def _element(index):
+    return {ELEMENT_KEY: f"stub-element-{index}"}
+
+
+def _navigate(state, body):
+    state.url, state.token = body.get("url"), None
+
+
+def _execute_sync(state, body):
+    """Answer the navigation cache's document scripts like a loaded, ready page; other scripts return 1."""
+    script, args = body.get("script"), body.get("args") or []
+    if script == MARK_DOCUMENT_SCRIPT:
+        state.token = args[0]
+        return {"href": state.url, "storage": state.storage}
+    if script == CHECK_DOCUMENT_SCRIPT:
+        return {"href": state.url, "token": state.token, "ready": True, "marker": True, "storage": state.storage}
+    if script == READ_STORAGE_SCRIPT:
+        return state.storage
+    return 1
+
+
+# (method, path pattern, handler(state, body) -> value)
+ROUTES = [
+    ("POST", r"/session", lambda state, body: {
+        "sessionId": SESSION_ID, "capabilities": {"browserName": "chrome", "browserVersion": "stub"}}),
+    ("DELETE", r"/session/[^/]+", lambda state, body: None),
+    ("GET", r"/session/[^/]+/title", lambda state, body: "Stub page"),
+    ("GET", r"/session/[^/]+/url", lambda state, body: state.url),
+    ("POST", r"/session/[^/]+/url", _navigate),
+    ("GET", r"/session/[^/]+/screenshot", lambda state, body: state.screenshot),
+    ("GET", r"/session/[^/]+/source", lambda state, body: state.page_source),
+    ("POST", r"/session/[^/]+/execute/sync", _execute_sync),
+    # Async scripts (ActionBatch) report success by calling back with null
+    ("POST", r"/session/[^/]+/execute/async", lambda state, body: None),
+    ("POST", r"/session/[^/]+/timeouts", lambda state, body: None),
+    ("GET", r"/session/[^/]+/cookie", lambda state, body: []),
+    ("DELETE", r"/session/[^/]+/cookie", lambda state, body: None),
+    ("POST", r"/session/[^/]+/element", lambda state, body: _element(0)),
+    ("POST", r"/session/[^/]+/elements", lambda state, body: [
+        _element(index) for index in range(state.elements_per_find)]),
+    ("POST", r"/session/[^/]+/element/[^/]+/element", lambda state, body: _element(0)),
+    ("POST", r"/session/[^/]+/element/[^/]+/elements", lambda state, body: [
+        _element(index) for index in range(state.elements_per_find)]),
+    ("GET", r"/session/[^/]+/element/[^/]+/displayed", lambda state, body: True),
+    ("GET", r"/session/[^/]+/element/[^/]+/enabled", lambda state, body: True),
+    ("GET", r"/session/[^/]+/element/[^/]+/text", lambda state, body: "Welcome stub"),
+    ("GET", r"/session/[^/]+/element/[^/]+/rect", lambda state, body: {
+        "x": 0, "y": 0, "width": 100, "height": 20}),
+    ("POST", r"/session/[^/]+/element/[^/]+/(clear|click|value)", lambda state, body: None),
+    ("GET", r"/status", lambda state, body: {"ready": True, "message": "stub ready"}),
+]
+COMPILED_ROUTES = [(method, re.compile(pattern + r"$"), handler) for method, pattern, handler in ROUTES]
+
+
+class StubWebDriverHandler(BaseHTTPRequestHandler):
+    """Answers WebDriver commands from COMPILED_ROUTES over HTTP/1.1 keep-alive connections"""
+
+    protocol_version = "HTTP/1.1"
+    state: StubState = None
+
+    def setup(self):
+        super().setup()
+        # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls on keep-alive connections
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        body = json.loads(raw_body) if raw_body else {}
+        self.state.requests += 1
+        self.state.connections.add(self.client_address)
+
+        for route_method, pattern, handler in COMPILED_ROUTES:
+            if route_method == method and pattern.match(self.path):
+                status, payload = 200, {"value": handler(self.state, body)}
+                break
+        else:
+            status, payload = 404, {"value": {"error": "unknown command", "message": self.path, "stacktrace": ""}}
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if len(data) >= GZIP_MIN_BYTES and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            data = gzip.compress(data, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+def start_stub_server(port=0, elements_per_find=1):
+    """
+    Start a stub WebDriver server in a background thread.
+
+    Args:
+        port (int): Port to listen on, 0 picks a free port
+        elements_per_find (int): Number of elements returned by find elements commands
+
+    Returns:
+        tuple: (server, url); stop with server.shutdown()
+    """
+    handler = type("BoundStubWebDriverHandler", (StubWebDriverHandler,),
+                   {"state": StubState(elements_per_find)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-webdriver", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def create_stub_driver(url):
+    """
+    Create a Selenium Remote WebDriver session against a stub server.
+
+    Args:
+        url (str): Stub server URL
+
+    Returns:
+        WebDriver: Driver whose commands are answered by the stub
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+    return webdriver.Remote(command_executor=url, options=ChromeOptions())
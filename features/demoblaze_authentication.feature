@@ -11,4 +11,15 @@ Feature: DemoBlaze User Authentication
     And I enter username "testuser"
     And I enter password "testpass"
     And I click the "Log in" button
-    Then I should see "Welcome testuser" message
\ No newline at end of file
+    Then I should see "Welcome testuser" message
+
+  @dataset.login_users
+  Scenario Outline: Login with dataset credentials
+    When I click on the "Log in" link
+    And I enter username "<username>"
+    And I enter password "<password>"
+    And I click the "Log in" button
+    Then I should see "Welcome <username>" message
+
+    Examples: Login users
+      | username | password |
@@ -4,75 +4,143 @@ This file handles the lifecycle of the WebDriver instance for behave tests.
 """
 
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.safari.options import Options as SafariOptions
-from utils.settings_manager import settings_manager, Environments
-from utils.screenshot_utils import ScreenshotUtils
-from selenium.webdriver.chrome.service import Service as ChromeService
-import shutil
-import tempfile
+from utils.settings_manager import settings_manager
+from utils.screenshot_utils import ScreenshotUtils, sanitize_filename, unique_screenshot_path
+from utils.screenshot_store import ScreenshotStore
+from utils.dataset_outline import bind_dataset_outlines
+from utils.metrics import metrics
+from utils.results_store import ResultsStore, DEFAULT_DB_PATH
+from utils.worker_info import get_worker_id
+from utils.driver_supervisor import DriverSupervisor
+from utils.remote_grid import get_remote_grid
+from utils.resource_tracker import ResourceTracker
+from utils.navigation_cache import navigation_cache
+from utils.matrix import MatrixReport, expand_features, get_feature_profile, get_matrix_profiles
+from utils.logging_config import configure_logging, set_log_context
 import os
-import traceback
 
-logging.basicConfig(level=logging.DEBUG)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
+def before_all(context):
+    """
+    Prepares the test run before any feature is executed.
+    Binds Scenario Outlines tagged with @dataset.<name> to their external datasets.
+    In matrix mode repeats the parsed features once per profile listed in matrix_profiles.
+    """
+    bound = bind_dataset_outlines(context._runner.features)
+    if bound:
+        logger.info(f"{bound} Scenario Outline(s) bound to external datasets")
+
+    context.matrix_report = None
+    profiles = get_matrix_profiles()
+    if profiles:
+        count = expand_features(context._runner.features, profiles)
+        context.matrix_report = MatrixReport(profiles)
+        logger.info(f"Matrix run: {count} features across profiles {', '.join(profiles)}")
+
+    # Record scenarios, steps and timing metrics in the results store
+    context.results_store = None
+    if settings_manager.get("results_store", True):
+        try:
+            context.results_store = ResultsStore(settings_manager.get("results_db", DEFAULT_DB_PATH))
+            context.results_store.start_run(settings_manager.environment, get_worker_id(),
+                                            label=", ".join(profiles) or None)
+            metrics.start()
+        except Exception as e:
+            logger.warning(f"Results store disabled: {str(e)}")
+            context.results_store = None
+
+    # Supervise driver processes, clean up leftovers of crashed runs; one supervisor (driver pool) per profile
+    context.driver_supervisors = {}
+    _activate_profile(context, profiles[0] if profiles else None).reap_orphans()
+
+    # One screenshot store (and index connection) for the whole run
+    context.screenshot_store = None
+    if settings_manager.get("screenshot_store", True):
+        context.screenshot_store = ScreenshotStore()
+
+    # Flag heap, file descriptor, process and temp directory growth across scenarios
+    context.resource_tracker = None
+    if settings_manager.get("resource_tracking", False):
+        context.resource_tracker = ResourceTracker()
+        context.resource_tracker.start()
+
+
+def after_all(context):
+    """
+    Finalizes the test run after all features have been executed.
+    """
+    remote = False
+    for profile, supervisor in context.driver_supervisors.items():
+        supervisor.shutdown()
+        print(f"\nDriver supervisor{f' [{profile}]' if profile else ''}: {supervisor.report()}")
+        with settings_manager.use_profile(profile):
+            remote = remote or settings_manager.get("browser", "chrome") == "remote"
+    settings_manager.set_profile(None)
+    print(f"Navigation: {navigation_cache.report()}")
+    if remote:
+        print(f"Remote nodes: {get_remote_grid().report()}")
+    if getattr(context, 'matrix_report', None):
+        print(f"Matrix results:\n{context.matrix_report.report()}")
+    if getattr(context, 'resource_tracker', None):
+        print(f"Resource tracking: {context.resource_tracker.report()}")
+        context.resource_tracker.stop()
+    if getattr(context, 'screenshot_store', None):
+        context.screenshot_store.close()
+    if getattr(context, 'results_store', None):
+        metrics.stop()
+        context.results_store.finish_run()
+        context.results_store.close()
+
+
+def after_step(context, step):
+    """
+    Records the finished step with the metrics collected while it ran.
+    """
+    if getattr(context, 'results_store', None):
+        context.results_store.record_step(step.keyword, step.name, step.status.name, step.duration * 1000,
+                                          metrics.drain())
+
+
+def _activate_profile(context, profile):
+    """
+    Switches settings to a matrix profile and returns the driver supervisor of the profile.
+    Profiles run one after another, so the idle and standby drivers of the previous profile are shut down.
+    """
+    active = settings_manager.active_profile
+    if profile != active and active in context.driver_supervisors:
+        context.driver_supervisors[active].shutdown()
+    settings_manager.set_profile(profile)
+    if profile not in context.driver_supervisors:
+        context.driver_supervisors[profile] = DriverSupervisor(profile=profile)
+    return context.driver_supervisors[profile]
+
+
 def before_scenario(context, scenario):
     """
     Sets up browser before each scenario.
     This runs before every test scenario in behave.
     """
+    set_log_context(scenario=scenario.name)
+    context.driver_supervisor = _activate_profile(context, get_feature_profile(scenario.feature))
     browser = settings_manager.get("browser", "chrome")
-    logger.info(f"Setting up {browser} browser for scenario: {scenario.name}")
+    profile = settings_manager.active_profile
+    logger.info(f"Setting up {browser} browser{f' ({profile} profile)' if profile else ''} "
+                f"for scenario: {scenario.name}")
+
+    if getattr(context, 'results_store', None):
+        metrics.drain()
+        context.results_store.start_scenario(scenario.feature.name, scenario.name)
     
     
     try:
-        if browser == "chrome":
-            options = ChromeOptions()
-            headless = settings_manager.get("headless", False)
-            window_width = settings_manager.get("window_width", 1920)
-            window_height = settings_manager.get("window_height", 1080)
-            
-            user_data_dir = tempfile.mkdtemp(dir="/var/tmp")
-            options.add_argument(f'--user-data-dir={user_data_dir}')
-            if headless:
-                options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument(f'--window-size={window_width},{window_height}')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-plugins')
-            context._chrome_user_data_dir = user_data_dir
-            
-            # Log Chrome options
-            logger.info(f"Chrome options: {options.arguments}")
-            
-            # Use Selenium Manager for development, fixed ChromeDriver for staging/AWS
-            if settings_manager.environment == Environments.DEVELOPMENT:
-                # Use Selenium Manager (default behavior)
-                context.driver = webdriver.Chrome(options=options)
-                logger.info("Chrome browser initialized successfully with Selenium Manager")
-            else:
-                # Use fixed ChromeDriver for AWS/staging environments
-                service = ChromeService(
-                    executable_path='/usr/local/bin/chromedriver',
-                    log_path='chromedriver.log'
-                )
-                context.driver = webdriver.Chrome(service=service, options=options)
-                logger.info("Chrome browser initialized successfully with custom ChromeDriver")
-            
-        elif browser == "safari":
-            context.driver = webdriver.Safari()
-            logger.info("Safari browser initialized successfully")
-            
-        else:
-            raise ValueError(f"Unsupported browser: {browser}")   
+        context._driver_handle = context.driver_supervisor.acquire()
+        context.driver = context._driver_handle.driver
         
         # Initialize screenshot utilities
-        context.screenshot_utils = ScreenshotUtils(context.driver)
+        context.screenshot_utils = ScreenshotUtils(context.driver, store=context.screenshot_store)
         logger.info("Screenshot utilities initialized")
         
         logger.info("Browser setup completed successfully")
@@ -99,6 +167,8 @@ def after_scenario(context, scenario):
                 )
                 if screenshot_path:
                     logger.info(f"Screenshot captured: {screenshot_path}")
+                    if getattr(context, 'results_store', None):
+                        context.results_store.record_artifact("screenshot", screenshot_path)
                     print(f"\n📸 Screenshot saved: {screenshot_path}")
             
         except Exception as e:
@@ -106,28 +176,35 @@ def after_scenario(context, scenario):
             # Fallback: try to capture screenshot without utility
             try:
                 if hasattr(context, 'driver'):
-                    from datetime import datetime
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"failure_{scenario.name}_{timestamp}.png"
-                    filepath = os.path.join("screenshots", filename)
-                    os.makedirs("screenshots", exist_ok=True)
+                    output_dir = settings_manager.get("screenshot_dir", "screenshots")
+                    os.makedirs(output_dir, exist_ok=True)
+                    filepath = unique_screenshot_path(output_dir, sanitize_filename(f"failure_{scenario.name}"))
                     context.driver.save_screenshot(filepath)
                     logger.info(f"Fallback screenshot saved: {filepath}")
                     print(f"\n📸 Fallback screenshot: {filepath}")
             except Exception as fallback_error:
                 logger.error(f"Fallback screenshot also failed: {str(fallback_error)}")
     
-    # Clean up browser
-    if hasattr(context, 'driver'):
-        try:
-            context.driver.quit()
+    # Clean up browser, its processes and user data directory
+    if getattr(context, '_driver_handle', None):
+        if not context.driver_supervisor.release(context._driver_handle):
+            logger.warning(f"Browser crashed or hung during scenario: {scenario.name}")
+        elif context.driver_supervisor.is_kept(context._driver_handle):
+            logger.info(f"Browser kept open for reuse after scenario: {scenario.name}")
+        else:
             logger.info(f"Browser closed successfully after scenario: {scenario.name}")
-        except Exception as e:
-            logger.warning(f"Error closing browser: {str(e)}")
-    
-    # Clear user data directory
-    if hasattr(context, '_chrome_user_data_dir'):
-        try:
-            shutil.rmtree(context._chrome_user_data_dir)
-        except Exception as e:
-            logger.warning(f"User data directory silinemedi: {e}")   
\ No newline at end of file
+        # Underscore attributes bypass behave's context layers and cannot be deleted with del
+        context._driver_handle = None
+
+    if getattr(context, 'resource_tracker', None):
+        context.resource_tracker.sample(scenario.name)
+
+    if getattr(context, 'matrix_report', None):
+        context.matrix_report.record(settings_manager.active_profile, scenario.feature.matrix_name, scenario.name,
+                                     scenario.status.name, scenario.duration * 1000)
+
+    # Store scenario result
+    if getattr(context, 'results_store', None):
+        context.results_store.record_metrics(metrics.drain())
+        context.results_store.finish_scenario(scenario.status.name, scenario.duration * 1000)
+    set_log_context(scenario=None)
@@ -0,0 +1,95 @@
+"""
+Runs page scripts in Node.js against a minimal fake DOM, so their browser-side decisions can be unit tested
+without a browser. Tests using it are skipped when node is not installed.
+"""
+import json
+import shutil
+import subprocess
+
+NODE = shutil.which("node")
+
+# Elements are described by dicts: tag (input, textarea, button, div), type, value, disabled, readOnly, maxLength,
+# hidden (not rendered) and coveredBy (id of an element on top of its centre).
+FAKE_DOM = r"""
+const spec = SPEC, elements = {};
+class HTMLElement {
+    constructor(id, options) {
+        Object.assign(this, {type: 'text', disabled: false, readOnly: false, maxLength: -1, hidden: false}, options);
+        this.id = id; this.clicks = 0; this._value = options.value || '';
+    }
+    get offsetWidth() { return this.hidden ? 0 : 10; }
+    get offsetHeight() { return this.hidden ? 0 : 10; }
+    getClientRects() { return this.hidden ? [] : [{}]; }
+    getBoundingClientRect() { return {left: 0, top: 0, width: 10, height: 10}; }
+    contains(other) { return other === this; }
+    focus() {}
+    dispatchEvent() {}
+    click() { if (!this.disabled) { this.clicks++; } }
+}
+class HTMLInputElement extends HTMLElement {}
+Object.defineProperty(HTMLInputElement.prototype, 'value', {
+    get() { return this._value; }, set(value) { this._value = value; }});
+class HTMLTextAreaElement extends HTMLInputElement {}
+class HTMLButtonElement extends HTMLElement {}
+const classes = {input: HTMLInputElement, textarea: HTMLTextAreaElement, button: HTMLButtonElement, div: HTMLElement};
+for (const [id, options] of Object.entries(spec)) {
+    elements[id] = new classes[options.tag || 'input'](id, options);
+}
+Object.assign(global, {HTMLElement, HTMLInputElement, HTMLTextAreaElement, HTMLButtonElement});
+global.Event = class { constructor(name) { this.name = name; } };
+global.document = {
+    readyState: 'complete',
+    getElementById: id => elements[id] || null,
+    querySelector: selector => elements[selector.replace(/^#/, '')] || null,
+    elementFromPoint: () => current,
+};
+// elementFromPoint answers for the element last looked up by id
+let current = null;
+const getElementById = document.getElementById;
+document.getElementById = id => {
+    const element = getElementById(id);
+    current = element && element.coveredBy ? elements[element.coveredBy] : element;
+    return element;
+};
+global.window = {getComputedStyle: () => ({visibility: 'visible'})};
+const stored = {};
+global.sessionStorage = {
+    setItem: (key, value) => { stored[key] = value; },
+    getItem: key => (key in stored ? stored[key] : null),
+    removeItem: key => { delete stored[key]; },
+};
+const state = () => Object.fromEntries(Object.entries(elements).map(
+    ([id, element]) => [id, {value: element._value, clicks: element.clicks}]));
+const args = ARGS.map(arg => (arg && arg.element ? elements[arg.element] : arg));
+const script = new Function(SCRIPT);
+if (ASYNC) {
+    args.push(result => { console.log(JSON.stringify({result, elements: state()})); process.exit(0); });
+    script(...args);
+} else {
+    console.log(JSON.stringify({result: script(...args), elements: state()}));
+}
+"""
+
+
+def element(element_id):
+    """Script argument referring to a fake DOM element."""
+    return {"element": element_id}
+
+
+def run_script(script, elements, *args, asynchronous=False):
+    """
+    Run a script against fake DOM elements.
+
+    Args:
+        script (str): Script body, as passed to execute_script
+        elements (dict): Element id -> element description
+        args: Script arguments; element() refers to an element
+        asynchronous (bool): Script calls back like execute_async_script
+
+    Returns:
+        dict: {"result": script result, "elements": {id: {"value", "clicks"}}}
+    """
+    program = (FAKE_DOM.replace("SPEC", json.dumps(elements)).replace("ARGS", json.dumps(list(args)))
+               .replace("ASYNC", json.dumps(asynchronous)).replace("SCRIPT", json.dumps(script)))
+    completed = subprocess.run([NODE, "-e", program], capture_output=True, text=True, timeout=30, check=True)
+    return json.loads(completed.stdout)
@@ -0,0 +1,130 @@
+"""
+Unit tests of the ActionBatch fallback after a failed batch script
+"""
+import unittest
+
+from selenium.common import JavascriptException
+from selenium.webdriver.common.by import By
+
+from Base.base_page import ActionBatch, BATCH_PROGRESS_SCRIPT, RUN_BATCH_SCRIPT
+from tests.script_runner import NODE, run_script
+
+FIRST, SECOND, THIRD = (By.ID, "first"), (By.ID, "second"), (By.ID, "third")
+
+
+class FakeDriver:
+    def __init__(self, script_result=None, script_error=None, progress=None):
+        self.script_result = script_result
+        self.script_error = script_error
+        self.progress = progress
+
+    def execute_async_script(self, script, *args):
+        if self.script_error:
+            raise self.script_error
+        return self.script_result
+
+    def execute_script(self, script, *args):
+        assert script == BATCH_PROGRESS_SCRIPT
+        return self.progress
+
+
+class FakeElement:
+    def __init__(self, page, locator):
+        self.page, self.locator = page, locator
+
+    def click(self):
+        self.page.actions.append(("click", self.locator))
+
+    def clear(self):
+        self.page.actions.append(("clear", self.locator))
+
+    def clear_and_type(self, text, mode=None):
+        self.page.actions.append(("type", self.locator))
+
+
+class FakePage:
+    def __init__(self, driver):
+        self.driver = driver
+        self.actions = []
+        self.timeouts = []
+
+    def _wait(self, locator, timeout):
+        self.timeouts.append(timeout)
+        return FakeElement(self, locator)
+
+    wait_for_element_clickable = wait_for_element_visible = _wait
+
+
+def batch(page, timeout=20):
+    return ActionBatch(page, timeout).type(FIRST, "user").click(SECOND).click(THIRD)
+
+
+class ActionBatchFallbackTest(unittest.TestCase):
+
+    def test_successful_script_is_one_round_trip(self):
+        page = FakePage(FakeDriver())
+        self.assertEqual(batch(page).run(), 1)
+        self.assertEqual(page.actions, [])
+
+    def test_reported_failure_continues_from_failed_step(self):
+        page = FakePage(FakeDriver(script_result={"index": 2, "error": "Element not visible"}))
+        batch(page).run()
+        self.assertEqual(page.actions, [("click", THIRD)])
+
+    def test_failed_script_call_skips_completed_steps(self):
+        page = FakePage(FakeDriver(script_error=JavascriptException("document unloaded"), progress=2))
+        self.assertEqual(batch(page).run(), 3)
+        self.assertEqual(page.actions, [("click", THIRD)])
+
+    def test_unknown_progress_does_not_repeat_steps(self):
+        page = FakePage(FakeDriver(script_error=JavascriptException("document unloaded"), progress=None))
+        with self.assertRaises(RuntimeError):
+            batch(page).run()
+        self.assertEqual(page.actions, [])
+
+    def test_fallback_only_gets_remaining_time(self):
+        page = FakePage(FakeDriver(script_result={"index": 0, "error": "Element not visible"}))
+        batch(page, timeout=5).run()
+        self.assertEqual(len(page.timeouts), 3)
+        self.assertTrue(all(0 <= timeout <= 5 for timeout in page.timeouts))
+        self.assertLessEqual(page.timeouts[-1], page.timeouts[0])
+
+
+@unittest.skipIf(NODE is None, "Script tests require node")
+class RunBatchScriptTest(unittest.TestCase):
+
+    STEPS = [{"action": "type", "using": "id", "value": "field", "text": "testuser"},
+             {"action": "click", "using": "id", "value": "submit"}]
+
+    def run_batch(self, field=None, submit=None, **extra):
+        elements = {"field": field or {}, "submit": dict({"tag": "button"}, **(submit or {})), **extra}
+        return run_script(RUN_BATCH_SCRIPT, elements, self.STEPS, 1000, "run-1", asynchronous=True)
+
+    def test_steps_run_in_the_browser(self):
+        outcome = self.run_batch()
+        self.assertIsNone(outcome["result"])
+        self.assertEqual(outcome["elements"]["field"]["value"], "testuser")
+        self.assertEqual(outcome["elements"]["submit"]["clicks"], 1)
+
+    def test_typed_value_is_truncated_to_maxlength(self):
+        outcome = self.run_batch(field={"maxLength": 4})
+        self.assertEqual(outcome["elements"]["field"]["value"], "test")
+
+    def test_steps_native_commands_would_reject_are_left_to_the_fallback(self):
+        cases = [
+            ({"field": {"disabled": True}}, 0),
+            ({"field": {"readOnly": True}}, 0),
+            ({"submit": {"disabled": True}}, 1),
+            ({"submit": {"coveredBy": "overlay"}, "overlay": {"tag": "div"}}, 1),
+        ]
+        for elements, failed_index in cases:
+            with self.subTest(elements=elements):
+                outcome = self.run_batch(**elements)
+                self.assertEqual(outcome["result"]["index"], failed_index)
+                self.assertEqual(outcome["elements"]["submit"]["clicks"], 0)
+                if failed_index == 0:
+                    self.assertEqual(outcome["elements"]["field"]["value"], "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests of DriverSupervisor health checks, release and driver reuse
+"""
+import pytest
+from selenium.common import (InvalidSessionIdException, NoSuchWindowException, UnexpectedAlertPresentException,
+                             WebDriverException)
+from urllib3.exceptions import MaxRetryError
+
+from utils import driver_supervisor
+from utils.driver_factory import DriverHandle
+from utils.driver_supervisor import DriverSupervisor
+
+
+class FakeDriver:
+    def __init__(self, error=None):
+        self.error = error
+        self.quit_calls = 0
+
+    def execute_script(self, script, *args):
+        if self.error:
+            raise self.error
+        return 1
+
+    def get_cookies(self):
+        return []
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def supervisor(reuse=False, prelaunch=False):
+    return DriverSupervisor(command_timeout=1, standby=False, prelaunch=prelaunch, reuse=reuse)
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    """Handles created by the supervisor, launched without a browser"""
+    handles = []
+
+    def create_driver():
+        handles.append(DriverHandle(driver=FakeDriver(), browser="chrome"))
+        return handles[-1]
+
+    monkeypatch.setattr(driver_supervisor, "create_driver", create_driver)
+    return handles
+
+
+@pytest.mark.parametrize("error, alive", [
+    (None, True),
+    (UnexpectedAlertPresentException("alert open", alert_text="Wrong password."), True),
+    (NoSuchWindowException("window closed"), True),
+    (WebDriverException("unknown error"), True),
+    (InvalidSessionIdException("session deleted"), False),
+    (MaxRetryError(None, "http://127.0.0.1:9515"), False),
+    (ConnectionRefusedError(), False),
+])
+def test_only_unanswered_sessions_are_dead(error, alive):
+    handle = DriverHandle(driver=FakeDriver(error), browser="chrome")
+    assert supervisor().is_alive(handle) is alive
+
+
+def test_driver_with_open_alert_is_quit_without_crash():
+    handle = DriverHandle(driver=FakeDriver(UnexpectedAlertPresentException("alert open")), browser="chrome")
+    pool = supervisor(reuse=True)
+    assert pool.release(handle)
+    assert not pool.is_kept(handle)
+    assert handle.driver.quit_calls == 1
+    assert pool.stats["crashes"] == 0
+
+
+def test_reused_driver_does_not_leave_an_idle_prelaunched_driver(launched):
+    pool = supervisor(reuse=True, prelaunch=True)
+    for _ in range(3):
+        handle = pool.acquire()
+        assert pool.release(handle) and pool.is_kept(handle)
+    pool.shutdown()
+    assert len(launched) == 1
+    assert (pool.stats["launched"], pool.stats["reused"], pool.stats["prelaunch_hits"]) == (1, 2, 0)
+
+
+def test_driver_quit_instead_of_reused_prelaunches_the_next(launched):
+    pool = supervisor(reuse=True, prelaunch=True)
+    first = pool.acquire()
+    first.driver.error = UnexpectedAlertPresentException("alert open")
+    assert pool.release(first) and not pool.is_kept(first)
+    second = pool.acquire()
+    assert second is launched[1] and pool.stats["prelaunch_hits"] == 1
+    pool.release(second)
+    pool.shutdown()
+    assert len(launched) == 2
@@ -0,0 +1,98 @@
+"""
+Unit tests of WrapWebElement typing strategy selection
+"""
+import unittest
+
+from selenium.webdriver.common.keys import Keys
+
+from Base.base_page import InputModes, SET_VALUE_SCRIPT, WrapWebElement
+from tests.script_runner import NODE, element, run_script
+
+
+class FakeElement:
+    id = "element-1"
+
+    def __init__(self):
+        self.calls = []
+
+    def clear(self):
+        self.calls.append(("clear",))
+
+    def send_keys(self, value):
+        self.calls.append(("send_keys", value))
+
+
+class FakeDriver:
+    def __init__(self, takes_value=True):
+        self.takes_value = takes_value
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        return self.takes_value
+
+
+class ResolveInputModeTest(unittest.TestCase):
+
+    def resolve(self, value, mode=InputModes.AUTO, clear=False):
+        return WrapWebElement._resolve_input_mode(value, mode, clear=clear)
+
+    def test_auto_clear_and_type_uses_one_script_for_short_values(self):
+        self.assertEqual(self.resolve("testuser", clear=True), InputModes.JS)
+
+    def test_auto_send_keys_uses_native_for_short_values(self):
+        self.assertEqual(self.resolve("testuser"), InputModes.NATIVE)
+        self.assertEqual(self.resolve("x" * 64), InputModes.JS)
+
+    def test_auto_types_key_sequences_natively(self):
+        self.assertEqual(self.resolve("x" * 80 + Keys.ENTER), InputModes.NATIVE)
+        self.assertEqual(self.resolve("user" + Keys.TAB, clear=True), InputModes.NATIVE)
+
+    def test_explicit_mode_is_kept(self):
+        self.assertEqual(self.resolve("testuser", InputModes.NATIVE, clear=True), InputModes.NATIVE)
+        self.assertEqual(WrapWebElement._resolve_input_mode("a", InputModes.JS, delay=0.1), InputModes.HUMANLIKE)
+
+    def test_unknown_mode_is_rejected(self):
+        for mode in ("javascript", "Auto"):
+            with self.assertRaises(ValueError):
+                self.resolve("testuser", mode)
+
+
+class ClearAndTypeTest(unittest.TestCase):
+
+    def test_fused_clear_and_type_is_a_single_script_call(self):
+        driver, element = FakeDriver(), FakeElement()
+        WrapWebElement(driver, element).clear_and_type("testuser", mode=InputModes.AUTO)
+        self.assertEqual(driver.scripts, [SET_VALUE_SCRIPT])
+        self.assertEqual(element.calls, [])
+
+    def test_elements_without_scripted_value_are_typed_natively(self):
+        # The script reports file inputs and non-input elements as not handled
+        driver, element = FakeDriver(takes_value=False), FakeElement()
+        WrapWebElement(driver, element).clear_and_type("/tmp/upload.txt", mode=InputModes.AUTO)
+        self.assertEqual(element.calls, [("clear",), ("send_keys", "/tmp/upload.txt")])
+
+
+@unittest.skipIf(NODE is None, "Script tests require node")
+class SetValueScriptTest(unittest.TestCase):
+
+    def set_value(self, options, value="testuser", clear=True):
+        outcome = run_script(SET_VALUE_SCRIPT, {"field": options}, element("field"), value, clear)
+        return outcome["result"], outcome["elements"]["field"]["value"]
+
+    def test_value_is_set(self):
+        self.assertEqual(self.set_value({"value": "old"}), (True, "testuser"))
+        self.assertEqual(self.set_value({"value": "old"}, clear=False), (True, "oldtestuser"))
+
+    def test_value_is_truncated_to_maxlength(self):
+        self.assertEqual(self.set_value({"maxLength": 4}), (True, "test"))
+        self.assertEqual(self.set_value({"maxLength": 0}), (True, ""))
+
+    def test_elements_rejecting_typing_are_left_to_native_typing(self):
+        for options in ({"disabled": True}, {"readOnly": True}, {"type": "file"}, {"tag": "div"}):
+            with self.subTest(options=options):
+                self.assertEqual(self.set_value(dict(options, value="old")), (False, "old"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Unit tests of matrix profile selection, feature expansion and the side-by-side report
+"""
+import pytest
+from behave.parser import parse_feature
+
+from utils import matrix
+from utils.matrix import MatrixReport, expand_features, get_feature_profile, get_matrix_profiles
+from utils.settings_manager import settings_manager
+
+FEATURE = """
+@smoke
+Feature: Login
+  Scenario: Valid login
+    Given I am on the DemoBlaze homepage
+
+  @dataset.login_users
+  Scenario Outline: Dataset login
+    When I enter username "<username>"
+
+    Examples:
+      | username |
+      | alice    |
+"""
+
+
+@pytest.fixture
+def declared(monkeypatch):
+    monkeypatch.setattr(settings_manager, "get_profiles", lambda: {"chrome": {}, "headless": {}, "mobile": {}})
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("", []),
+    ("all", ["chrome", "headless", "mobile"]),
+    (" ALL ", ["chrome", "headless", "mobile"]),
+    ("headless", ["headless"]),
+    ("mobile, chrome,mobile", ["mobile", "chrome"]),
+    ("chrome, firefox", ValueError),
+])
+def test_get_matrix_profiles(declared, value, expected):
+    if expected is ValueError:
+        with pytest.raises(ValueError):
+            get_matrix_profiles(value)
+    else:
+        assert get_matrix_profiles(value) == expected
+
+
+def test_profiles_default_to_the_setting(declared, monkeypatch):
+    monkeypatch.setattr(matrix.settings_manager, "get", lambda key, default=None: "chrome,mobile")
+    assert get_matrix_profiles() == ["chrome", "mobile"]
+
+
+@pytest.mark.parametrize("profiles", [["chrome"], ["chrome", "headless"], ["chrome", "headless", "mobile"]])
+def test_expand_features_repeats_features_per_profile(profiles):
+    original = parse_feature(FEATURE)
+    features = [original]
+    assert expand_features(features, profiles) == len(profiles)
+    assert features[0] is original
+    assert [get_feature_profile(feature) for feature in features] == profiles
+    assert [feature.name for feature in features] == [f"Login [{profile}]" for profile in profiles]
+    for feature in features:
+        assert feature.matrix_name == "Login"
+        assert [tag for tag in feature.tags] == ["smoke"]
+        assert [scenario.name for scenario in feature.walk_scenarios(with_outlines=True)][:2] == [
+            "Valid login", "Dataset login"]
+    # Copies do not share scenarios, so their run state stays separate
+    scenarios = [id(scenario) for feature in features for scenario in feature.walk_scenarios()]
+    assert len(set(scenarios)) == len(scenarios)
+
+
+def test_unexpanded_feature_has_no_profile():
+    assert get_feature_profile(parse_feature(FEATURE)) is None
+
+
+@pytest.mark.parametrize("results, differing", [
+    ([("chrome", "passed"), ("headless", "passed")], []),
+    ([("chrome", "passed"), ("headless", "failed")], [("Login", "Valid login")]),
+    ([("chrome", "passed")], [("Login", "Valid login")]),
+])
+def test_matrix_report_differences(results, differing):
+    report = MatrixReport(["chrome", "headless"])
+    for profile, status in results:
+        report.record(profile, "Login", "Valid login", status, 1500.0)
+    assert report.differences() == differing
+
+
+def test_matrix_report_table():
+    report = MatrixReport(["chrome", "headless"])
+    report.record("chrome", "Login", "Valid login", "passed", 1500.0)
+    report.record("headless", "Login", "Valid login", "failed", 2500.0)
+    lines = report.report().splitlines()
+    assert lines[0].split() == ["scenario", "chrome", "headless"]
+    assert lines[1].split() == ["Valid", "login", "passed", "1.5s", "failed", "2.5s"]
+    assert lines[2].split() == ["total", "1/1", "passed", "1.5s", "0/1", "passed", "2.5s"]
+    assert lines[3] == "1 scenario(s) differ between profiles: Valid login"
@@ -0,0 +1,107 @@
+"""
+Unit tests of NavigationCache against a fake driver
+"""
+import pytest
+from selenium.webdriver.common.by import By
+
+from utils.navigation_cache import (CHECK_DOCUMENT_SCRIPT, CLEAR_STORAGE_SCRIPT, MARK_DOCUMENT_SCRIPT,
+                                    NavigationCache, READ_STORAGE_SCRIPT)
+
+URL = "https://example.com/"
+READY = (By.ID, "nava")
+SOFT_RESET = "document.forms[0].reset();"
+
+
+class FakeDriver:
+    """Shows one document; tests change it like a scenario would"""
+
+    def __init__(self):
+        self.href, self.token, self.marker = URL, None, True
+        self.storage, self.cookies = "[{},{}]", [{"name": "session", "value": "1"}]
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if script == MARK_DOCUMENT_SCRIPT:
+            self.token = args[0]
+            return {"href": self.href, "storage": self.storage}
+        if script == CHECK_DOCUMENT_SCRIPT:
+            return {"href": self.href, "token": self.token, "ready": True, "marker": self.marker,
+                    "storage": self.storage}
+        if script == READ_STORAGE_SCRIPT:
+            return self.storage
+        if script == CLEAR_STORAGE_SCRIPT:
+            self.storage = "[{},{}]"
+        return None
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+
+@pytest.fixture
+def cache():
+    return NavigationCache(enabled=True)
+
+
+@pytest.fixture
+def driver(cache):
+    tracked = FakeDriver()
+    cache.track(tracked)
+    cache.record_load(tracked, URL)
+    return tracked
+
+
+def test_clean_document_is_reused_with_soft_reset(cache, driver):
+    assert cache.try_reuse(driver, URL, READY, SOFT_RESET)
+    assert driver.scripts[-1] == SOFT_RESET
+    assert cache.stats == {"full_loads": 1, "loads_avoided": 1, "session_resets": 0}
+
+
+@pytest.mark.parametrize("change", [
+    lambda driver: setattr(driver, "href", URL + "cart"),
+    lambda driver: setattr(driver, "token", "reloaded"),
+    lambda driver: setattr(driver, "marker", False),
+    lambda driver: setattr(driver, "storage", '[{"cart":"1"},{}]'),
+    lambda driver: driver.cookies.append({"name": "cart", "value": "1"}),
+])
+def test_changed_document_is_loaded_again(cache, driver, change):
+    change(driver)
+    assert not cache.try_reuse(driver, URL, READY, SOFT_RESET)
+    assert SOFT_RESET not in driver.scripts
+
+
+def test_other_url_is_loaded(cache, driver):
+    assert not cache.try_reuse(driver, URL + "cart", READY)
+
+
+def test_untracked_driver_pays_no_extra_round_trips(cache):
+    untracked = FakeDriver()
+    cache.record_load(untracked, URL)
+    assert untracked.scripts == []
+    assert not cache.try_reuse(untracked, URL, READY)
+    assert cache.stats["full_loads"] == 1
+
+
+def test_disabled_cache_records_nothing():
+    cache, driver = NavigationCache(enabled=False), FakeDriver()
+    cache.track(driver)
+    cache.record_load(driver, URL)
+    assert not cache.try_reuse(driver, URL, READY)
+    assert driver.scripts == []
+
+
+def test_reset_session_keeps_unchanged_state(cache, driver):
+    assert not cache.reset_session(driver)
+    assert driver.cookies
+    assert cache.try_reuse(driver, URL, READY)
+
+
+def test_reset_session_clears_changed_state(cache, driver):
+    driver.storage = '[{"cart":"1"},{}]'
+    assert cache.reset_session(driver)
+    assert driver.cookies == [] and driver.storage == "[{},{}]"
+    assert cache.stats["session_resets"] == 1
+    assert not cache.try_reuse(driver, URL, READY)
@@ -0,0 +1,83 @@
+"""
+Unit tests of profile directory ownership checks and orphan reaping
+"""
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from utils import driver_supervisor
+from utils.driver_factory import PROFILE_DIR_PREFIX, PROFILE_OWNER_FILE
+from utils.driver_supervisor import DriverSupervisor, _is_abandoned
+from utils.process_utils import find_descendants, is_running
+
+# Stand-in for chromedriver: starts a "browser" using the profile given as first argument and waits
+FAKE_CHROMEDRIVER = """
+import subprocess, sys, time
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)", "--user-data-dir=" + sys.argv[1]])
+time.sleep(60)
+"""
+
+
+def write_owner(path, pid):
+    with open(os.path.join(path, PROFILE_OWNER_FILE), "w") as owner_file:
+        owner_file.write(str(pid))
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_directory_of_running_owner_is_kept(tmp_path):
+    write_owner(tmp_path, os.getpid())
+    os.utime(tmp_path, (0, 0))
+    assert not _is_abandoned(str(tmp_path), grace_seconds=600)
+
+
+def test_directory_of_exited_owner_is_reaped_even_when_in_use(tmp_path):
+    write_owner(tmp_path, exited_pid())
+    assert _is_abandoned(str(tmp_path), grace_seconds=600, in_use=True)
+
+
+@pytest.mark.parametrize("age, in_use, abandoned", [
+    (0, False, False),  # another worker may not have written its marker yet
+    (601, False, True),
+    (601, True, False),
+])
+def test_directory_without_owner(tmp_path, age, in_use, abandoned):
+    past = time.time() - age
+    os.utime(tmp_path, (past, past))
+    assert _is_abandoned(str(tmp_path), grace_seconds=600, in_use=in_use) is abandoned
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="Process inspection requires /proc")
+def test_browser_and_chromedriver_of_dead_owner_are_killed(tmp_path, monkeypatch):
+    monkeypatch.setattr(driver_supervisor, "PROFILE_PARENT_DIR", str(tmp_path))
+    profile = tmp_path / f"{PROFILE_DIR_PREFIX}crashed"
+    profile.mkdir()
+    write_owner(profile, exited_pid())
+    chromedriver = subprocess.Popen([sys.executable, "-c", FAKE_CHROMEDRIVER, str(profile), "chromedriver"])
+    try:
+        deadline = time.time() + 10
+        while not find_descendants(chromedriver.pid) and time.time() < deadline:
+            time.sleep(0.05)
+        time.sleep(0.2)
+        browser_pids = find_descendants(chromedriver.pid)
+        assert browser_pids
+
+        supervisor = DriverSupervisor(command_timeout=1, standby=False, prelaunch=False, reuse=False)
+        assert supervisor.reap_orphans() == len(browser_pids) + 2
+        assert not profile.exists()
+        assert chromedriver.wait(timeout=5) is not None
+        # SIGKILL is delivered asynchronously, the browser may take a moment to go
+        deadline = time.time() + 5
+        while any(is_running(pid) for pid in browser_pids) and time.time() < deadline:
+            time.sleep(0.05)
+        assert not any(is_running(pid) for pid in browser_pids)
+    finally:
+        chromedriver.kill()
+        chromedriver.wait()
@@ -0,0 +1,76 @@
+"""
+Unit tests of pre-flight locator validation and feature checks
+"""
+import pytest
+from selenium.webdriver.common.by import By
+
+from utils.preflight import collect_locators, run_preflight, validate_css, validate_locator, validate_xpath
+
+
+@pytest.mark.parametrize("expression, valid", [
+    ("//div[@id='a']", True),
+    ("(//a)[1]", True),
+    ("//a[contains(text(),'Log in')]", True),
+    ("/", True),
+    ("", False),
+    ("//div[", False),
+    ("//a)", False),
+    ("//a[@id='x]", False),
+    ("//div[]", False),
+    ("//div/", False),
+    ("///div", False),
+])
+def test_validate_xpath(expression, valid):
+    assert (validate_xpath(expression) is None) is valid
+
+
+@pytest.mark.parametrize("selector, valid", [
+    ("#login", True),
+    ("div > a.cls", True),
+    ("a[href^='/x']", True),
+    ("input[type=text]", True),
+    ("li:nth-child(2)", True),
+    ("", False),
+    ("div >", False),
+    ("a,,b", False),
+    ("a[", False),
+    ("a[href='x]", False),
+    ("[=x]", False),
+    ("a:", False),
+])
+def test_validate_css(selector, valid):
+    assert (validate_css(selector) is None) is valid
+
+
+@pytest.mark.parametrize("locator, valid", [
+    ((By.ID, "login2"), True),
+    ((By.XPATH, "//a[text()='Cart']"), True),
+    ((By.TAG_NAME, "custom-element"), True),
+    ((By.ID, ""), False),
+    ((By.CLASS_NAME, "btn btn-primary"), False),
+    ((By.TAG_NAME, "1a"), False),
+    ((By.XPATH, "//a["), False),
+    (("bogus", "x"), False),
+    ((By.ID, 1), False),
+    ("login2", False),
+])
+def test_validate_locator(locator, valid):
+    assert (validate_locator(locator) is None) is valid
+
+
+def test_page_object_locators_are_valid():
+    locators = list(collect_locators("Pages"))
+    assert locators
+    assert [(owner, locator) for owner, locator in locators if validate_locator(locator)] == []
+
+
+def test_undefined_steps_are_reported(tmp_path):
+    (tmp_path / "broken.feature").write_text(
+        "Feature: Broken\n"
+        "  Scenario: Unknown step\n"
+        "    Given I am on the DemoBlaze homepage\n"
+        "    When I do something nobody implemented\n")
+    report = run_preflight(str(tmp_path), steps_path="features/steps")
+    assert (report.features, report.scenarios, report.steps) == (1, 1, 2)
+    assert [step for _, step in report.undefined_steps] == ["When I do something nobody implemented"]
+    assert report.errors == 1
@@ -0,0 +1,77 @@
+"""
+Unit tests of remote node selection
+"""
+import time
+
+import pytest
+
+from utils.remote_grid import RemoteGrid, parse_urls
+
+URLS = ["http://node-1:9515", "http://node-2:9515", "http://node-3:9515"]
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, []),
+    ("", []),
+    ("http://a:1", ["http://a:1"]),
+    ("http://a:1/, http://b:2", ["http://a:1", "http://b:2"]),
+    ("http://a:1 http://b:2\nhttp://a:1", ["http://a:1", "http://b:2"]),
+    (["http://a:1/", " ", "http://b:2"], ["http://a:1", "http://b:2"]),
+])
+def test_parse_urls(value, expected):
+    assert parse_urls(value) == expected
+
+
+@pytest.fixture
+def grid(monkeypatch):
+    """Grid over URLS whose health checks keep the state a test gives the nodes"""
+    monkeypatch.delenv("WORKER_INDEX", raising=False)
+    monkeypatch.delenv("WORKER_COUNT", raising=False)
+    monkeypatch.setattr(RemoteGrid, "check_health", lambda self, node: node.healthy)
+    remote_grid = RemoteGrid(urls=URLS, max_sessions=2, health_interval=3600, health_timeout=1)
+    for node in remote_grid.nodes:
+        node.checked_at = time.monotonic()
+    return remote_grid
+
+
+def node(grid, number):
+    return grid.nodes[number - 1]
+
+
+@pytest.mark.parametrize("setup, exclude, expected", [
+    ({}, (), 1),
+    ({1: {"active": 1}}, (), 2),
+    ({1: {"active": 1}, 2: {"active": 1}}, (), 3),
+    ({1: {"healthy": False}}, (), 2),
+    ({1: {"reported_load": 0.9}, 2: {"reported_load": 0.5}}, (), 3),
+    ({2: {"reported_load": 0.2}, 3: {"reported_load": 0.1}, 1: {"active": 1}}, (), 3),
+    ({}, ("http://node-1:9515",), 2),
+])
+def test_least_loaded_healthy_node_is_selected(grid, setup, exclude, expected):
+    for number, state in setup.items():
+        for name, value in state.items():
+            setattr(node(grid, number), name, value)
+    selected = grid.acquire(exclude)
+    assert selected is node(grid, expected)
+    assert (selected.active, selected.sessions) == (setup.get(expected, {}).get("active", 0) + 1, 1)
+
+
+def test_no_free_slot_raises(grid):
+    for remote_node in grid.nodes:
+        remote_node.active = remote_node.max_sessions
+    with pytest.raises(RuntimeError):
+        grid.acquire()
+
+
+def test_failed_release_frees_the_slot_and_forces_a_recheck(grid):
+    selected = grid.acquire()
+    grid.release(selected.url, failed=True)
+    assert (selected.active, selected.failures, selected.checked_at) == (0, 1, 0.0)
+
+
+@pytest.mark.parametrize("worker_index, first", [("0", 1), ("1", 2), ("2", 3), ("4", 2)])
+def test_ties_start_at_a_different_node_per_worker(monkeypatch, worker_index, first):
+    monkeypatch.setenv("WORKER_INDEX", worker_index)
+    monkeypatch.setenv("WORKER_COUNT", "5")
+    remote_grid = RemoteGrid(urls=URLS, max_sessions=2, health_interval=3600)
+    assert remote_grid.nodes[0].url == URLS[first - 1]
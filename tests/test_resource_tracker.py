@@ -0,0 +1,43 @@
+"""
+Unit tests of ResourceTracker counting
+"""
+import os
+from unittest import mock
+
+import pytest
+
+from utils import resource_tracker
+from utils.driver_factory import PROFILE_DIR_PREFIX, PROFILE_OWNER_FILE
+
+
+@pytest.fixture
+def temp_dirs(tmp_path, monkeypatch):
+    """Profile parent and temp directory with one own profile, one of another worker and one browser temp dir"""
+    profiles, temp = tmp_path / "profiles", tmp_path / "tmp"
+    for name, owner in (("own", os.getpid()), ("other", 1)):
+        profile = profiles / f"{PROFILE_DIR_PREFIX}{name}"
+        profile.mkdir(parents=True)
+        (profile / PROFILE_OWNER_FILE).write_text(str(owner))
+    (temp / "scoped_dir1234").mkdir(parents=True)
+    monkeypatch.setattr(resource_tracker, "PROFILE_PARENT_DIR", str(profiles))
+    monkeypatch.setattr(resource_tracker.tempfile, "gettempdir", lambda: str(temp))
+
+
+@pytest.mark.parametrize("worker_count, expected", [
+    # Own profile and the browser temp directory
+    (1, 2),
+    # Browser temp directories have no owner and are skipped with parallel workers
+    (4, 1),
+])
+def test_only_this_workers_directories_are_counted(temp_dirs, monkeypatch, worker_count, expected):
+    monkeypatch.setattr(resource_tracker, "get_worker_count", lambda: worker_count)
+    assert resource_tracker.count_temp_dirs() == expected
+
+
+def test_descriptors_are_counted_before_garbage_collection():
+    tracker = resource_tracker.ResourceTracker(warmup=0, count_tolerance=0)
+    with mock.patch.object(resource_tracker, "count_open_fds", side_effect=[10, 10, 20, 10]):
+        tracker.sample("baseline")
+        flags = tracker.sample("leaky")
+    assert (tracker.samples[-1].fds, tracker.samples[-1].fds_after_gc) == (20, 10)
+    assert "fds" in [flag.resource for flag in flags]
@@ -0,0 +1,64 @@
+"""
+Unit tests of ResultsStore percentiles and the metrics buffer feeding it
+"""
+import time
+
+import pytest
+
+from utils.metrics import Metric, MetricsRecorder
+from utils.results_store import ResultsStore, main
+
+DURATIONS = [float(value) for value in range(1, 21)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    results = ResultsStore(str(tmp_path / "results.db"))
+    results.start_run("test", "worker-0")
+    results.start_scenario("Feature", "Scenario")
+    results.record_metrics(Metric("wait", "BasePage.wait", duration, time.time()) for duration in DURATIONS)
+    results.finish_scenario("passed", 100.0)
+    yield results
+    results.close()
+
+
+@pytest.mark.parametrize("percentile, expected", [
+    (100, 20.0),
+    (95, 19.0),
+    (50, 10.0),
+    (5, 1.0),
+    (0.1, 1.0),
+])
+def test_percentile_is_nearest_rank(store, percentile, expected):
+    assert store.percentile("BasePage.wait", percentile) == (len(DURATIONS), expected)
+
+
+def test_percentile_without_samples(store):
+    assert store.percentile("Unknown.metric") == (0, None)
+
+
+@pytest.mark.parametrize("percentile", [0, -5, 100.5, 150])
+def test_percentile_outside_range_is_rejected(store, percentile):
+    with pytest.raises(ValueError):
+        store.percentile("BasePage.wait", percentile)
+
+
+def test_cli_rejects_percentile_outside_range(store, capsys):
+    # --p 150 used to fail with an IndexError
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--db", store.db_path, "percentile", "BasePage.wait", "--p", "150"])
+    assert exit_info.value.code == 2
+    assert "--p must be in range" in capsys.readouterr().err
+
+
+def test_metrics_are_only_buffered_while_collecting():
+    recorder = MetricsRecorder()
+    recorder.record("wait", "BasePage.wait", 1.0)
+    assert recorder.drain() == []
+    recorder.start()
+    recorder.record("wait", "BasePage.wait", 1.0)
+    assert [metric.name for metric in recorder.drain()] == ["BasePage.wait"]
+    recorder.record("wait", "BasePage.wait", 1.0)
+    recorder.stop()
+    recorder.record("wait", "BasePage.wait", 1.0)
+    assert recorder.drain() == []
@@ -0,0 +1,43 @@
+"""
+Unit tests of screenshot file naming
+"""
+import os
+from datetime import datetime
+
+import pytest
+
+from utils import screenshot_utils
+from utils.screenshot_utils import MAX_NAME_LENGTH, sanitize_filename, unique_screenshot_path
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Valid login", "Valid login"),
+    ("Login: user/pass?", "Login_ user_pass_"),
+    ("Outline -- @1.1 \nrow", "Outline -- @1.1 _row"),
+    ("..", "screenshot"),
+    ("x" * 300, "x" * MAX_NAME_LENGTH),
+])
+def test_sanitize_filename(name, expected):
+    assert sanitize_filename(name) == expected
+
+
+class FrozenDateTime:
+    @staticmethod
+    def now():
+        return datetime(2024, 1, 1, 12, 0, 0)
+
+
+def test_paths_are_unique_within_the_same_moment(tmp_path, monkeypatch):
+    monkeypatch.setattr(screenshot_utils, "datetime", FrozenDateTime)
+    paths = []
+    for _ in range(3):
+        path = unique_screenshot_path(str(tmp_path), "failure_Valid login")
+        open(path, "wb").close()
+        paths.append(path)
+    assert len(set(paths)) == 3
+    assert all(os.path.dirname(path) == str(tmp_path) for path in paths)
+
+
+def test_existing_file_is_not_overwritten_without_timestamp(tmp_path):
+    (tmp_path / "failure.png").write_bytes(b"")
+    assert unique_screenshot_path(str(tmp_path), "failure", include_timestamp=False) == str(tmp_path / "failure_1.png")
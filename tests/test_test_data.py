@@ -0,0 +1,103 @@
+"""
+Unit tests of test data source selection, setting substitution and worker partitioning
+"""
+import json
+
+import pytest
+
+from utils import test_data as test_data_module
+from utils.settings_manager import settings_manager
+from utils.worker_info import get_worker_index
+
+REMOTE = {"usernames": {"testuser": "remote"}}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    settings = {"test_data_dir": str(tmp_path)}
+    monkeypatch.setattr(settings_manager, "get", lambda key, default=None: settings.get(key, default))
+    return tmp_path
+
+
+def write(directory, name, username):
+    (directory / name).write_text(json.dumps({"usernames": {"testuser": username}}))
+
+
+def loaded_username(environment, monkeypatch, remote=REMOTE):
+    monkeypatch.setattr(test_data_module.TestData, "_read_remote_data", lambda self: remote)
+    data = test_data_module.TestData()
+    data.environment = environment
+    return data.get_username("testuser")
+
+
+@pytest.mark.parametrize("environment, files, remote, expected", [
+    ("staging", ["test_data_staging.json", "test_data.json"], REMOTE, "test_data_staging.json"),
+    ("staging", ["test_data.json"], REMOTE, "remote"),
+    ("staging", ["test_data.json"], None, "test_data.json"),
+    ("development", ["test_data.json"], REMOTE, "test_data.json"),
+    ("development", ["test_data_development.json", "test_data.json"], REMOTE, "test_data_development.json"),
+])
+def test_lookup_order(data_dir, monkeypatch, environment, files, remote, expected):
+    for name in files:
+        write(data_dir, name, name)
+    assert loaded_username(environment, monkeypatch, remote) == expected
+
+
+def test_configured_file_is_the_only_source(data_dir, monkeypatch):
+    write(data_dir, "custom.json", "custom")
+    settings = {"test_data_dir": str(data_dir), "test_data_file": str(data_dir / "custom.json")}
+    monkeypatch.setattr(settings_manager, "get", lambda key, default=None: settings.get(key, default))
+    assert loaded_username("staging", monkeypatch) == "custom"
+
+
+def test_defaults_without_any_source(data_dir, monkeypatch):
+    monkeypatch.setattr(test_data_module.TestData, "_read_remote_data", lambda self: None)
+    data = test_data_module.TestData()
+    data.environment = "staging"
+    assert data.get_url("homepage") == test_data_module.SETTING_DEFAULTS["base_url"]
+
+
+@pytest.mark.parametrize("index, count, expected", [
+    (None, None, 0),
+    ("0", "1", 0),
+    ("2", "3", 2),
+    ("3", "3", ValueError),
+    ("-1", "2", ValueError),
+    ("1", None, ValueError),
+])
+def test_worker_index_must_be_below_count(monkeypatch, index, count, expected):
+    for name, value in (("WORKER_INDEX", index), ("WORKER_COUNT", count)):
+        if value is None:
+            monkeypatch.delenv(name, raising=False)
+        else:
+            monkeypatch.setenv(name, value)
+    if expected is ValueError:
+        with pytest.raises(ValueError):
+            get_worker_index()
+    else:
+        assert get_worker_index() == expected
+
+
+@pytest.fixture
+def staging_profile(monkeypatch):
+    settings_manager.get_settings()
+    monkeypatch.setattr(settings_manager, "_profiles",
+                        {"staging": {"base_url": "https://staging.example.com", "headless": False}})
+    monkeypatch.delenv("HEADLESS", raising=False)
+    with settings_manager.use_profile("staging"):
+        yield
+
+
+def test_environment_variables_override_the_active_profile(staging_profile, monkeypatch):
+    assert settings_manager.get("headless") is False
+    monkeypatch.setenv("HEADLESS", "true")
+    assert settings_manager.get("headless") is True
+
+
+def test_substitutions_use_the_active_profile(staging_profile, monkeypatch):
+    monkeypatch.setattr(test_data_module.TestData, "_read_data", lambda self: test_data_module.DEFAULT_TEST_DATA)
+    data = test_data_module.TestData()
+    assert data.get_url("login") == "https://staging.example.com/login"
+    assert data.get_url("homepage") == "https://staging.example.com"
+    with settings_manager.use_profile(None):
+        assert data.get_url("homepage") != "https://staging.example.com"
@@ -0,0 +1,93 @@
+"""
+Unit tests of VisualDiff.compare on synthetic images
+"""
+import pytest
+
+np = pytest.importorskip("numpy", reason="Visual diff requires numpy and Pillow")
+pytest.importorskip("PIL", reason="Visual diff requires numpy and Pillow")
+from utils.visual_diff import VisualDiff  # noqa: E402
+
+SIZE = 64
+
+
+def gray(value=128):
+    return np.full((SIZE, SIZE, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def diff(tmp_path):
+    return VisualDiff(baseline_dir=str(tmp_path), diff_dir=str(tmp_path), tolerance=8, max_mismatch_ratio=0.001,
+                      max_perceptual_delta=0.02, max_forgiven_ratio=0.01)
+
+
+def test_identical_images_pass(diff):
+    result, differing = diff.compare(gray(), gray())
+    assert result.passed
+    assert result.mismatch_ratio == 0.0
+    assert not differing.any()
+
+
+def test_differences_within_tolerance_pass(diff):
+    result, _ = diff.compare(gray(133), gray(128))
+    assert result.passed
+    assert result.max_delta == 5
+
+
+def test_colour_change_of_equal_luminance_fails(diff):
+    red = np.zeros((SIZE, SIZE, 3), dtype=np.uint8)
+    red[..., 0] = 255
+    same_luminance = gray(round(255 * 0.299))
+    result, _ = diff.compare(red, same_luminance)
+    assert result.perceptual_delta < 0.02
+    assert result.mismatch_ratio == 1.0
+    assert not result.passed
+
+
+def test_inverted_checkerboard_fails(diff):
+    checkerboard = np.indices((SIZE, SIZE)).sum(axis=0) % 2 * 255
+    actual = np.repeat(checkerboard[..., None], 3, axis=2).astype(np.uint8)
+    result, _ = diff.compare(actual, 255 - actual)
+    assert result.perceptual_delta == 0.0
+    assert result.mismatch_ratio == 1.0
+    assert not result.passed
+
+
+def test_scattered_antialiasing_is_forgiven(diff):
+    actual = gray()
+    # 16 pixels (0.4%), one per 8x8 block, slightly brighter
+    actual[4::16, 4::16] += 30
+    result, _ = diff.compare(actual, gray())
+    assert result.mismatch_ratio > 0.001
+    assert result.passed
+
+
+def test_concentrated_change_is_not_forgiven(diff):
+    actual = gray()
+    actual[0:4, 0:4] = 255
+    result, _ = diff.compare(actual, gray())
+    assert result.mismatch_ratio <= 0.01
+    assert result.perceptual_delta > 0.02
+    assert not result.passed
+
+
+def test_mismatch_above_forgiven_ratio_fails(diff):
+    actual = gray()
+    # 256 pixels (6.25%), spread so every block changes only a little
+    actual[::4, ::4] += 12
+    result, _ = diff.compare(actual, gray())
+    assert result.perceptual_delta < 0.02
+    assert not result.passed
+
+
+def test_ignored_region_is_not_compared(diff):
+    actual = gray()
+    actual[8:24, 8:24] = 0
+    result, differing = diff.compare(actual, gray(), ignore=[(8, 8, 16, 16)])
+    assert result.passed
+    assert not differing.any()
+
+
+def test_size_mismatch_fails(diff):
+    result, differing = diff.compare(gray(), gray()[:32])
+    assert not result.passed
+    assert differing is None
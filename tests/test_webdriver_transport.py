@@ -0,0 +1,38 @@
+"""
+Unit tests of WebDriver transport tuning
+"""
+import unittest
+import warnings
+from urllib.parse import urlparse
+
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from utils.webdriver_transport import tune_executor
+
+URL = "http://127.0.0.1:9515"
+
+
+def executor():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return RemoteConnection(client_config=ClientConfig(remote_server_addr=URL))
+
+
+def accept_encoding(connection):
+    return connection.get_remote_connection_headers(urlparse(URL), True).get("Accept-Encoding")
+
+
+class CompressionHeaderTest(unittest.TestCase):
+
+    def test_gzip_is_requested_by_the_tuned_executor_only(self):
+        compressed, other = executor(), executor()
+        tune_executor(compressed, compression=True)
+        self.assertEqual(accept_encoding(compressed), "gzip")
+        self.assertIsNone(accept_encoding(other))
+        self.assertIsNone(accept_encoding(executor()))
+        self.assertIsNone(RemoteConnection.extra_headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Dataset-driven Scenario Outlines
+Binds Scenario Outlines to external CSV/JSONL datasets instead of inline Examples rows.
+
+A Scenario Outline tagged with ``@dataset.<name>`` takes its example rows from the
+test data dataset ``<name>`` (see utils/test_data.py). The outline keeps a header-only
+``Examples:`` table that declares which dataset columns are used as placeholders:
+
+    @dataset.login_users
+    Scenario Outline: Login with dataset credentials
+      When I enter username "<username>"
+      ...
+      Examples: Login users
+        | username | password |
+
+Rows are read lazily and turned into scenarios one at a time while the outline runs.
+Each worker only reads the rows of its own partition (WORKER_INDEX / WORKER_COUNT).
+"""
+import logging
+from typing import Iterator, Optional
+
+from behave.model import Examples, Row, Scenario, ScenarioOutline, ScenarioOutlineBuilder, Status
+
+from utils.test_data import test_data
+
+logger = logging.getLogger(__name__)
+
+DATASET_TAG_PREFIX = "dataset."
+
+
+class DatasetScenarioOutline(ScenarioOutline):
+    """
+    Scenario Outline whose scenarios are generated on demand from a dataset.
+
+    Only scenarios that have already run are kept (in ``scenarios``) so that
+    formatters and reporters can still report their status.
+    """
+
+    dataset = None
+
+    def _example(self) -> Optional[Examples]:
+        """Header-only Examples table declaring dataset columns (if present)."""
+        return self.examples[0] if self.examples else None
+
+    def iter_scenarios(self) -> Iterator[Scenario]:
+        """
+        Build scenarios lazily from this worker's partition of the dataset.
+
+        Yields:
+            Scenario: One scenario per dataset row
+        """
+        builder = ScenarioOutlineBuilder(self.annotation_schema)
+        example = self._example()
+        if example is None:
+            example = Examples(self.filename, self.line, u"Examples", self.dataset)
+        example.index = 1
+        headings = list(example.table.headings) if example.table else None
+
+        for row_index, record in enumerate(test_data.iter_partition(self.dataset)):
+            columns = headings or list(record.keys())
+            row = Row(columns, [str(record.get(column, "")) for column in columns], line=self.line)
+            row.index = row_index + 1
+            row.id = "%d.%d" % (example.index, row.index)
+            params = {
+                "examples.name": example.name,
+                "examples.index": str(example.index),
+                "row.index": str(row.index),
+                "row.id": row.id,
+            }
+            scenario_name = builder.make_scenario_name(self.name, example, row, params)
+            row_tags = builder.make_row_tags(self.tags, row, params)
+            row_tags.extend(example.tags)
+            steps = [builder.make_step_for_row(step, row, params) for step in self.steps]
+
+            scenario = Scenario(self.filename, self.line, self.keyword, scenario_name, row_tags, steps)
+            scenario.feature = self.feature
+            scenario.background = self.background
+            scenario._row = row     # pylint: disable=protected-access
+            yield scenario
+
+    @property
+    def scenarios(self):
+        """Scenarios generated so far (dataset rows are not pre-built)."""
+        return self._scenarios
+
+    def should_run_with_tags(self, tag_expression):
+        """Decide on outline tags only, so the dataset is not read for filtering."""
+        return tag_expression.check(self.effective_tags)
+
+    def should_run_with_name_select(self, config):
+        """Decide on the outline name only, so the dataset is not read for filtering."""
+        if not config.name:
+            return True
+        return bool(config.name_re.search(self.name))
+
+    def run(self, runner):
+        # pylint: disable=protected-access
+        self.clear_status()
+        failed_count = 0
+        for scenario in self.iter_scenarios():
+            self._scenarios.append(scenario)
+            runner.context._set_root_attribute("active_outline", scenario._row)
+            failed = scenario.run(runner)
+            if failed:
+                failed_count += 1
+                if runner.config.stop or runner.aborted:
+                    break
+        runner.context._set_root_attribute("active_outline", None)
+        if not self._scenarios:
+            logger.warning("Dataset '%s' has no rows for this worker: %s", self.dataset, self.name)
+            self.set_status(Status.skipped)
+        return failed_count > 0
+
+
+def get_dataset_name(tags) -> Optional[str]:
+    """
+    Get dataset name from a ``@dataset.<name>`` tag.
+
+    Args:
+        tags (list): Tags of a Scenario Outline
+
+    Returns:
+        str: Dataset name or None if the outline is not bound to a dataset
+    """
+    for tag in tags:
+        if tag.startswith(DATASET_TAG_PREFIX):
+            return tag[len(DATASET_TAG_PREFIX):]
+    return None
+
+
+def bind_dataset_outlines(features) -> int:
+    """
+    Convert dataset-tagged Scenario Outlines of parsed features into DatasetScenarioOutline.
+
+    Args:
+        features (list): Parsed behave features
+
+    Returns:
+        int: Number of outlines bound to a dataset
+    """
+    bound = 0
+    for feature in features:
+        for scenario in feature.scenarios:
+            if not isinstance(scenario, ScenarioOutline):
+                continue
+            dataset = get_dataset_name(scenario.tags)
+            if dataset:
+                scenario.__class__ = DatasetScenarioOutline
+                scenario.dataset = dataset
+                bound += 1
+                logger.info("Scenario Outline '%s' bound to dataset '%s'", scenario.name, dataset)
+    return bound
@@ -0,0 +1,146 @@
+"""
+WebDriver Factory
+Creates browser drivers from settings and tracks the processes and profile directory behind each one
+"""
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from utils.process_utils import find_descendants
+from utils.remote_grid import get_remote_grid
+from utils.settings_manager import settings_manager, Environments
+from utils.webdriver_transport import build_chrome_service, tune_connection
+
+logger = logging.getLogger(__name__)
+
+# Prefix of temporary Chrome profile directories, used to recognize leftovers of crashed runs
+PROFILE_DIR_PREFIX = "bdd-chrome-"
+PROFILE_PARENT_DIR = "/var/tmp"
+# Written into each profile directory with the pid of the test process that owns it
+PROFILE_OWNER_FILE = "bdd-owner.pid"
+
+
+@dataclass
+class DriverHandle:
+    """A launched driver with the resources that must be cleaned up with it"""
+    driver: object
+    browser: str
+    user_data_dir: Optional[str] = None
+    driver_pid: Optional[int] = None
+    browser_pids: List[int] = field(default_factory=list)
+    launch_ms: float = 0.0
+    remote_url: Optional[str] = None
+
+
+def build_chrome_options(user_data_dir: str = None) -> ChromeOptions:
+    """
+    Build Chrome options from settings.
+
+    Args:
+        user_data_dir (str): Profile directory for this browser instance, None lets Chrome pick one
+
+    Returns:
+        ChromeOptions: Configured options
+    """
+    options = ChromeOptions()
+    headless = settings_manager.get("headless", False)
+    window_width = settings_manager.get("window_width", 1920)
+    window_height = settings_manager.get("window_height", 1080)
+
+    if user_data_dir:
+        options.add_argument(f'--user-data-dir={user_data_dir}')
+    if headless:
+        options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument(f'--window-size={window_width},{window_height}')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-plugins')
+    return options
+
+
+def _create_chrome(handle: DriverHandle):
+    """Launch Chrome and fill driver and process information of the handle."""
+    handle.user_data_dir = tempfile.mkdtemp(prefix=PROFILE_DIR_PREFIX, dir=PROFILE_PARENT_DIR)
+    # Marks the directory as in use before Chrome starts, so other workers do not reap it as an orphan
+    with open(os.path.join(handle.user_data_dir, PROFILE_OWNER_FILE), "w") as owner_file:
+        owner_file.write(str(os.getpid()))
+    options = build_chrome_options(handle.user_data_dir)
+    logger.info("Chrome options: %s", options.arguments)
+
+    # Use Selenium Manager for development, fixed ChromeDriver for staging/AWS
+    if settings_manager.environment == Environments.DEVELOPMENT:
+        handle.driver = webdriver.Chrome(service=build_chrome_service(), options=options)
+        logger.info("Chrome browser initialized successfully with Selenium Manager")
+    else:
+        service = build_chrome_service(executable_path='/usr/local/bin/chromedriver')
+        handle.driver = webdriver.Chrome(service=service, options=options)
+        logger.info("Chrome browser initialized successfully with custom ChromeDriver")
+
+    process = getattr(handle.driver.service, 'process', None)
+    if process is not None:
+        handle.driver_pid = process.pid
+        handle.browser_pids = find_descendants(process.pid)
+
+
+def _create_remote(handle: DriverHandle):
+    """Start a Chrome session on the least-loaded healthy remote node, trying each node at most once."""
+    grid = get_remote_grid()
+    failed = {}
+    while len(failed) < len(grid.nodes):
+        try:
+            node = grid.acquire(exclude=failed)
+        except RuntimeError:
+            if not failed:
+                raise
+            break
+        try:
+            # The profile lives on the node, Chrome creates and removes it there
+            handle.driver = webdriver.Remote(command_executor=node.url, options=build_chrome_options())
+        except Exception as e:
+            grid.release(node.url, failed=True)
+            logger.warning("Remote node %s failed to start a session: %s", node.url, e)
+            failed[node.url] = str(e)
+            continue
+        handle.remote_url = node.url
+        logger.info("Remote browser initialized successfully on %s", node.url)
+        return
+    errors = "; ".join(f"{url}: {error}" for url, error in failed.items())
+    raise RuntimeError(f"No remote node could start a session: {errors}")
+
+
+def create_driver(browser: str = None) -> DriverHandle:
+    """
+    Create a driver for the configured browser.
+
+    Args:
+        browser (str): Browser name, defaults to "browser" setting
+
+    Returns:
+        DriverHandle: Launched driver with its tracked resources
+
+    Raises:
+        ValueError: If the browser is not supported
+    """
+    browser = browser or settings_manager.get("browser", "chrome")
+    start = time.perf_counter()
+    handle = DriverHandle(driver=None, browser=browser)
+    if browser == "chrome":
+        _create_chrome(handle)
+    elif browser == "remote":
+        _create_remote(handle)
+    elif browser == "safari":
+        handle.driver = webdriver.Safari()
+        logger.info("Safari browser initialized successfully")
+    else:
+        raise ValueError(f"Unsupported browser: {browser}")
+    tune_connection(handle.driver)
+    handle.launch_ms = (time.perf_counter() - start) * 1000
+    return handle
@@ -0,0 +1,363 @@
+"""
+Driver Supervisor
+Detects crashed or hung drivers, cleans up their processes and profile directories,
+and replaces them with a pre-launched standby driver
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Optional
+
+from selenium.common import InvalidSessionIdException, WebDriverException
+
+from utils.driver_factory import (DriverHandle, PROFILE_DIR_PREFIX, PROFILE_OWNER_FILE, PROFILE_PARENT_DIR,
+                                  create_driver)
+from utils.metrics import metrics
+from utils.navigation_cache import navigation_cache
+from utils.process_utils import find_descendants, get_cmdline, get_parent_map, is_running, kill_processes
+from utils.remote_grid import get_remote_grid
+from utils.settings_manager import settings_manager
+
+logger = logging.getLogger(__name__)
+
+
+def _run_with_timeout(function, timeout: float):
+    """
+    Run a WebDriver command in a watchdog thread.
+
+    Returns:
+        tuple: (finished, result, exception)
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = function()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return False, None, None
+    return True, outcome.get("result"), outcome.get("error")
+
+
+def _directory_size(path: str) -> int:
+    """Total size of files below a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _is_abandoned(path: str, grace_seconds: float, in_use: bool = False) -> bool:
+    """
+    Check if a profile directory no longer belongs to a running test process.
+
+    Args:
+        path (str): Profile directory
+        grace_seconds (float): Minimum age of directories without a readable owner marker
+        in_use (bool): A running process uses the directory
+
+    Returns:
+        bool: True if the owner process is gone, or the directory has no owner, is unused
+        and is older than the grace period
+    """
+    try:
+        with open(os.path.join(path, PROFILE_OWNER_FILE)) as owner_file:
+            return not is_running(int(owner_file.read().strip()))
+    except (OSError, ValueError):
+        pass
+    if in_use:
+        return False
+    try:
+        return time.time() - os.path.getmtime(path) > grace_seconds
+    except OSError:
+        return False
+
+
+class DriverSupervisor:
+    """
+    Owns driver lifecycle for a test run.
+
+    - acquire(): returns a driver, using the standby driver after a crash (or always, with prelaunch)
+    - release(): quits the driver under a watchdog, kills leftover processes, removes its profile;
+      with driver_reuse a healthy driver is kept for the next scenario instead
+    - reap_orphans(): removes browsers and profiles left behind by crashed runs
+    """
+
+    def __init__(self, command_timeout: float = None, standby: bool = None, prelaunch: bool = None,
+                 reuse: bool = None, profile: str = None):
+        # Settings profile of the drivers, see settings_manager.set_profile(); one supervisor per matrix profile
+        self.profile = profile
+        with settings_manager.use_profile(profile):
+            self.command_timeout = float(command_timeout or settings_manager.get("driver_command_timeout", 10))
+            self.standby_enabled = settings_manager.get("driver_standby", False) if standby is None else standby
+            # Prelaunch: the next scenario's driver starts in the background while the current scenario runs
+            self.prelaunch_enabled = (settings_manager.get("driver_prelaunch", False) if prelaunch is None
+                                      else prelaunch)
+            # Reuse: a healthy driver stays open for the next scenario, with cookies and storage reset if changed
+            self.reuse_enabled = settings_manager.get("driver_reuse", False) if reuse is None else reuse
+        self._idle: Optional[DriverHandle] = None
+        self._standby: Optional[DriverHandle] = None
+        self._standby_thread: Optional[threading.Thread] = None
+        self._use_standby = False
+        self.stats = {"launched": 0, "crashes": 0, "hung_commands": 0, "standby_swaps": 0,
+                      "prelaunch_hits": 0, "reused": 0, "launch_ms_total": 0.0, "launch_ms_hidden": 0.0,
+                      "processes_killed": 0, "orphans_reaped": 0, "bytes_reclaimed": 0}
+
+    def _create_driver(self) -> DriverHandle:
+        """Launch a driver with the settings of this supervisor's profile, also from background threads."""
+        with settings_manager.use_profile(self.profile):
+            handle = create_driver()
+        if self.reuse_enabled:
+            navigation_cache.track(handle.driver)
+        return handle
+
+    # -- Standby driver
+
+    def _launch_standby(self):
+        try:
+            self._standby = self._create_driver()
+            self.stats["launched"] += 1
+            logger.info("Standby driver ready after %.0f ms", self._standby.launch_ms)
+        except Exception as e:
+            logger.warning("Failed to launch standby driver: %s", e)
+            self._standby = None
+
+    def start_standby(self):
+        """Launch a standby driver in the background if enabled and none is pending."""
+        if not (self.standby_enabled or self.prelaunch_enabled) or self._standby is not None:
+            return
+        if self._standby_thread is not None and self._standby_thread.is_alive():
+            return
+        self._standby_thread = threading.Thread(target=self._launch_standby, name="standby-driver", daemon=True)
+        self._standby_thread.start()
+
+    def _take_standby(self) -> Optional[DriverHandle]:
+        """Wait for the pending standby launch and take the standby driver if it is healthy."""
+        if self._standby_thread is not None:
+            self._standby_thread.join()
+        handle, self._standby = self._standby, None
+        if handle is not None and not self.is_alive(handle):
+            self._cleanup(handle, crashed=True)
+            return None
+        return handle
+
+    # -- Lifecycle
+
+    def acquire(self) -> DriverHandle:
+        """
+        Get a driver for the next scenario.
+
+        Returns:
+            DriverHandle: Prelaunched/standby driver if available, otherwise a new driver
+        """
+        if self._idle is not None:
+            handle, self._idle = self._idle, None
+            if self.is_alive(handle):
+                self.stats["reused"] += 1
+                return handle
+            self._cleanup(handle, crashed=True)
+        after_crash, self._use_standby = self._use_standby, False
+        if after_crash or self.prelaunch_enabled:
+            wait_start = time.perf_counter()
+            handle = self._take_standby()
+            if handle is not None:
+                waited_ms = (time.perf_counter() - wait_start) * 1000
+                self._record_launch(handle.launch_ms, max(handle.launch_ms - waited_ms, 0.0))
+                if after_crash:
+                    self.stats["standby_swaps"] += 1
+                    logger.info("Swapped in standby driver after driver crash")
+                if self.prelaunch_enabled:
+                    self.stats["prelaunch_hits"] += 1
+                    logger.info("Using prelaunched driver, %.0f ms of %.0f ms launch time hidden",
+                                max(handle.launch_ms - waited_ms, 0.0), handle.launch_ms)
+                self._prepare_next()
+                return handle
+        handle = self._create_driver()
+        self.stats["launched"] += 1
+        self._record_launch(handle.launch_ms, 0.0)
+        self._prepare_next()
+        return handle
+
+    def _prepare_next(self):
+        """Launch the next standby driver, unless the acquired driver is expected to be reused by the next scenario."""
+        if not self.reuse_enabled:
+            self.start_standby()
+
+    def _record_launch(self, launch_ms: float, hidden_ms: float):
+        """Account launch time of an acquired driver and how much of it ran in the background."""
+        self.stats["launch_ms_total"] += launch_ms
+        self.stats["launch_ms_hidden"] += hidden_ms
+        metrics.record("driver", "DriverSupervisor.launch_wait", launch_ms - hidden_ms)
+
+    def is_alive(self, handle: DriverHandle) -> bool:
+        """
+        Check that driver and browser processes run and a WebDriver command answers within the timeout.
+
+        Only timeouts, connection errors and an invalid session count as dead. Other WebDriver errors, such as an
+        open alert, are answers of a working session; release() then quits the driver normally, because its
+        session cannot be reset for reuse.
+
+        Args:
+            handle (DriverHandle): Driver to check
+
+        Returns:
+            bool: True if the driver is usable
+        """
+        if handle.driver_pid is not None and not is_running(handle.driver_pid):
+            return False
+        finished, result, error = _run_with_timeout(lambda: handle.driver.execute_script("return 1;"),
+                                                    self.command_timeout)
+        if not finished:
+            self.stats["hung_commands"] += 1
+            logger.warning("Driver did not answer within %s seconds", self.command_timeout)
+            return False
+        if error is None:
+            return result == 1
+        if isinstance(error, InvalidSessionIdException) or not isinstance(error, WebDriverException):
+            return False
+        logger.info("Driver answered the health check with %s, session is alive", type(error).__name__)
+        return True
+
+    def release(self, handle: DriverHandle) -> bool:
+        """
+        Quit a driver and clean up its processes and profile directory.
+        With driver_reuse a healthy driver is kept for the next acquire() instead, after its
+        cookies and web storage were reset if the scenario changed them.
+
+        Args:
+            handle (DriverHandle): Driver to release
+
+        Returns:
+            bool: False if the driver had crashed or hung
+        """
+        healthy = self.is_alive(handle)
+        if healthy and self.reuse_enabled and self._idle is None:
+            finished, _, error = _run_with_timeout(lambda: navigation_cache.reset_session(handle.driver),
+                                                   self.command_timeout)
+            if finished and error is None:
+                self._idle = handle
+                return True
+            logger.warning("Could not reset driver for reuse: %s", error or "timed out")
+        healthy = self._quit(handle, healthy)
+        if self.reuse_enabled:
+            # No driver is kept for the next scenario, so it needs the standby/prelaunched one after all
+            self.start_standby()
+        return healthy
+
+    def is_kept(self, handle: DriverHandle) -> bool:
+        """Check if release() kept a driver open for reuse instead of quitting it."""
+        return self._idle is handle
+
+    def _quit(self, handle: DriverHandle, healthy: bool) -> bool:
+        """Quit a driver under the watchdog and clean up; returns False if it had crashed or hung."""
+        navigation_cache.forget(handle.driver)
+        if healthy:
+            finished, _, error = _run_with_timeout(handle.driver.quit, self.command_timeout)
+            if not finished:
+                self.stats["hung_commands"] += 1
+                healthy = False
+            elif error is not None:
+                logger.warning("Error closing browser: %s", error)
+        if not healthy:
+            self.stats["crashes"] += 1
+            self._use_standby = self.standby_enabled
+            logger.warning("Driver crashed or hung, killing its processes")
+        self._cleanup(handle, crashed=not healthy)
+        return healthy
+
+    def _cleanup(self, handle: DriverHandle, crashed: bool = False):
+        """Kill remaining driver/browser processes, remove the profile directory and free the remote slot."""
+        if handle.remote_url is not None:
+            get_remote_grid().release(handle.remote_url, failed=crashed)
+        if handle.driver_pid is not None:
+            pids = [handle.driver_pid] + find_descendants(handle.driver_pid) + handle.browser_pids
+            self.stats["processes_killed"] += kill_processes(list(dict.fromkeys(pids)))
+        if handle.user_data_dir and os.path.isdir(handle.user_data_dir):
+            self.stats["bytes_reclaimed"] += _directory_size(handle.user_data_dir)
+            shutil.rmtree(handle.user_data_dir, ignore_errors=True)
+
+    def reap_orphans(self) -> int:
+        """
+        Kill orphaned browsers and remove profile directories left behind by crashed runs.
+
+        A profile is orphaned when the test process named by its owner marker has exited. Every process using it,
+        its chromedriver parent (reparented to init when the test process died) and their descendants are killed,
+        then the directory is removed. Directories without an owner marker are only removed when no process uses
+        them and they are older than driver_orphan_grace_seconds (default 600), because another worker may have
+        just created one for a browser that is still starting.
+
+        Returns:
+            int: Number of orphaned processes and directories removed
+        """
+        parents = get_parent_map()
+        children = {}
+        for pid, parent in parents.items():
+            children.setdefault(parent, []).append(pid)
+        # Profile directory -> processes started with it
+        users = {}
+        profile_marker = f"--user-data-dir={os.path.join(PROFILE_PARENT_DIR, PROFILE_DIR_PREFIX)}"
+        for pid in parents:
+            cmdline = get_cmdline(pid)
+            if profile_marker in cmdline:
+                users.setdefault(cmdline.split("--user-data-dir=")[1].split()[0], []).append(pid)
+
+        reaped = 0
+        grace_seconds = float(settings_manager.get("driver_orphan_grace_seconds", 600))
+        if os.path.isdir(PROFILE_PARENT_DIR):
+            for entry in os.listdir(PROFILE_PARENT_DIR):
+                path = os.path.join(PROFILE_PARENT_DIR, entry)
+                if not (entry.startswith(PROFILE_DIR_PREFIX) and os.path.isdir(path)
+                        and _is_abandoned(path, grace_seconds, in_use=path in users)):
+                    continue
+                roots = list(users.get(path, []))
+                roots += [parents[pid] for pid in roots if "chromedriver" in get_cmdline(parents.get(pid, 0))]
+                pids, pending = [], roots
+                while pending:
+                    pid = pending.pop()
+                    if pid not in pids:
+                        pids.append(pid)
+                        pending.extend(children.get(pid, []))
+                reaped += kill_processes(pids)
+                self.stats["bytes_reclaimed"] += _directory_size(path)
+                shutil.rmtree(path, ignore_errors=True)
+                reaped += 1
+        self.stats["orphans_reaped"] += reaped
+        if reaped:
+            logger.info("Reaped %d orphaned browser processes/profile directories", reaped)
+        return reaped
+
+    def shutdown(self):
+        """Release the standby driver and log the supervision report."""
+        if self._standby_thread is not None:
+            self._standby_thread.join()
+        if self._standby is not None:
+            self._quit(self._standby, self.is_alive(self._standby))
+            self._standby = None
+        if self._idle is not None:
+            self._quit(self._idle, self.is_alive(self._idle))
+            self._idle = None
+        logger.info("Driver supervisor report: %s", self.report())
+
+    def report(self) -> str:
+        """
+        Summary of supervision counters.
+
+        Returns:
+            str: Human readable counters
+        """
+        stats = dict(self.stats)
+        stats["mb_reclaimed"] = round(stats.pop("bytes_reclaimed") / (1024 * 1024), 1)
+        stats["launch_ms_total"] = round(stats["launch_ms_total"])
+        stats["launch_ms_hidden"] = round(stats["launch_ms_hidden"])
+        return ", ".join(f"{key}={value}" for key, value in stats.items())
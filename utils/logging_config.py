@@ -0,0 +1,149 @@
+"""
+Logging Configuration
+Routes all log records through a queue to a background listener thread that writes console text and per-worker
+JSON-lines files, with per-module levels from settings and scenario/worker IDs on every record
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from utils.settings_manager import settings_manager
+from utils.worker_info import get_worker_id
+
+# Chatty libraries log every WebDriver HTTP request at DEBUG
+DEFAULT_MODULE_LEVELS = {"selenium": "WARNING", "urllib3": "WARNING", "botocore": "WARNING", "boto3": "WARNING"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(worker)s] %(name)s: %(message)s"
+
+# Scenario and worker of the records logged from now on, see set_log_context()
+_log_context = {"worker": get_worker_id(), "scenario": None}
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_module_levels(value) -> Dict[str, str]:
+    """
+    Parse the log_levels setting.
+
+    Args:
+        value: "module=LEVEL" pairs separated by commas, e.g. "selenium=WARNING, utils.remote_grid=DEBUG"
+
+    Returns:
+        Dict[str, str]: Logger name -> level name
+
+    Raises:
+        ValueError: If a pair is malformed or names an unknown level
+    """
+    levels = {}
+    for pair in (value or "").split(","):
+        if not pair.strip():
+            continue
+        name, separator, level = pair.partition("=")
+        level = level.strip().upper()
+        if not separator or not name.strip() or not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Invalid log_levels entry: {pair.strip()}")
+        levels[name.strip()] = level
+    return levels
+
+
+def set_log_context(**fields):
+    """
+    Set fields attached to every following record, e.g. set_log_context(scenario=scenario.name).
+
+    Args:
+        fields: Context values, None clears a field
+    """
+    _log_context.update(fields)
+
+
+class ContextFilter(logging.Filter):
+    """Adds the log context to records in the logging thread, before they are queued"""
+
+    def filter(self, record):
+        for key, value in _log_context.items():
+            setattr(record, key, value)
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, sortable and mergeable across workers by its UTC timestamp"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="microseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker": getattr(record, "worker", None),
+            "scenario": getattr(record, "scenario", None),
+            "message": record.getMessage(),
+        }
+        # Queued records carry their traceback in the message, exc_info is only set when formatted directly
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _build_handlers(log_format: str, log_dir: Optional[str]):
+    console = logging.StreamHandler()
+    console.setFormatter(JsonLinesFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    handlers = [console]
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.FileHandler(os.path.join(log_dir, f"{_log_context['worker']}.jsonl"),
+                                           encoding="utf-8")
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+    return handlers
+
+
+def configure_logging(level: str = None, module_levels: Dict[str, str] = None, log_format: str = None,
+                      log_dir: str = None):
+    """
+    Configure the root logger with a queue handler and start the background listener.
+
+    Settings: log_level (INFO), log_levels (per-module levels merged over DEFAULT_MODULE_LEVELS),
+    log_format (text or json console output) and log_dir (per-worker <worker>.jsonl files, off when unset).
+    Calling it again replaces the previous configuration.
+    """
+    global _listener
+    level = (level or settings_manager.get("log_level", "INFO")).upper()
+    module_levels = {**DEFAULT_MODULE_LEVELS,
+                     **(module_levels or parse_module_levels(settings_manager.get("log_levels")))}
+    log_format = (log_format or settings_manager.get("log_format", "text")).lower()
+    log_dir = log_dir or settings_manager.get("log_dir")
+    if log_format not in ("text", "json"):
+        raise ValueError(f"Unsupported log_format: {log_format}")
+
+    shutdown_logging()
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *_build_handlers(log_format, log_dir))
+    _listener.start()
+
+
+def shutdown_logging():
+    """Stop the listener after it has written all queued records and close its handlers."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,139 @@
+"""
+Matrix Runs
+Runs the suite across several browser/option profiles in one behave invocation. Settings, parsed features and
+test data are loaded once; every profile gets a copy of the features and its own driver supervisor
+"""
+import copy
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from utils.settings_manager import settings_manager
+
+logger = logging.getLogger(__name__)
+
+
+def get_matrix_profiles(value=None) -> List[str]:
+    """
+    Resolve the profiles of a matrix run.
+
+    Args:
+        value: Comma separated profile names or "all", defaults to the matrix_profiles setting
+
+    Returns:
+        List[str]: Profile names in run order, empty if matrix mode is off
+
+    Raises:
+        ValueError: If a name is not declared as a [profile:<name>] section
+    """
+    value = settings_manager.get("matrix_profiles") if value is None else value
+    declared = settings_manager.get_profiles()
+    if not value:
+        return []
+    if str(value).strip().lower() == "all":
+        return list(declared)
+    names = [name.strip() for name in str(value).split(",") if name.strip()]
+    unknown = [name for name in names if name not in declared]
+    if unknown:
+        raise ValueError(f"Undeclared matrix profile(s): {', '.join(unknown)}; "
+                         f"declared: {', '.join(declared) or 'none'}")
+    return list(dict.fromkeys(names))
+
+
+def _copy_feature(feature):
+    """Deep copy of a parsed feature; behave tags are immutable and cannot be copied, so they are shared."""
+    tags = {}
+    for model in [feature] + list(feature.walk_scenarios(with_outlines=True)):
+        for tag in model.tags:
+            tags[id(tag)] = tag
+        for example in getattr(model, "examples", []):
+            for tag in example.tags:
+                tags[id(tag)] = tag
+    return copy.deepcopy(feature, tags)
+
+
+def expand_features(features: list, profiles: List[str]) -> int:
+    """
+    Repeat the parsed features once per profile, in place and profile by profile.
+
+    The first profile runs the parsed features themselves, later profiles run copies.
+    Feature names get a "[profile]" suffix, so formatters and the results store tell the runs apart.
+
+    Args:
+        features (list): Parsed behave features (the runner's list)
+        profiles (List[str]): Profile names in run order
+
+    Returns:
+        int: Number of features in the expanded list
+    """
+    # Copy before the first profile renames the parsed features
+    runs = [(profile, [feature if index == 0 else _copy_feature(feature) for feature in features])
+            for index, profile in enumerate(profiles)]
+    features[:] = []
+    for profile, profile_features in runs:
+        for feature in profile_features:
+            feature.matrix_name = feature.name
+            feature.matrix_profile = profile
+            feature.name = f"{feature.name} [{profile}]"
+            features.append(feature)
+    return len(features)
+
+
+def get_feature_profile(feature) -> Optional[str]:
+    """Profile a (possibly expanded) feature runs with, None outside of matrix runs."""
+    return getattr(feature, "matrix_profile", None)
+
+
+class MatrixReport:
+    """Scenario results per profile, reported side by side"""
+
+    def __init__(self, profiles: List[str]):
+        self.profiles = list(profiles)
+        # (feature, scenario) -> profile -> (status, duration_ms)
+        self.results: Dict[Tuple[str, str], Dict[str, Tuple[str, float]]] = {}
+
+    def record(self, profile: str, feature: str, scenario: str, status: str, duration_ms: float):
+        """
+        Record the result of a scenario run with a profile.
+
+        Args:
+            profile (str): Profile name
+            feature (str): Feature name without the profile suffix
+            scenario (str): Scenario name
+            status (str): Scenario status name
+            duration_ms (float): Scenario duration
+        """
+        self.results.setdefault((feature, scenario), {})[profile] = (status, duration_ms)
+
+    def differences(self) -> List[Tuple[str, str]]:
+        """
+        Scenarios whose status is not the same for every profile.
+
+        Returns:
+            List[Tuple[str, str]]: (feature, scenario) pairs
+        """
+        return [key for key, runs in self.results.items()
+                if len({runs.get(profile, ("not run", 0.0))[0] for profile in self.profiles}) > 1]
+
+    def report(self) -> str:
+        """
+        Table of scenario status and duration with one column per profile, followed by totals.
+
+        Returns:
+            str: Human readable table
+        """
+        cells = [[scenario] + [f"{runs[profile][0]} {runs[profile][1] / 1000:.1f}s" if profile in runs else "-"
+                               for profile in self.profiles]
+                 for (_, scenario), runs in self.results.items()]
+        totals = ["total"]
+        for profile in self.profiles:
+            runs = [results[profile] for results in self.results.values() if profile in results]
+            passed = sum(1 for status, _ in runs if status == "passed")
+            totals.append(f"{passed}/{len(runs)} passed {sum(duration for _, duration in runs) / 1000:.1f}s")
+        rows = [["scenario"] + self.profiles] + cells + [totals]
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows]
+        differences = self.differences()
+        if differences:
+            lines.append(f"{len(differences)} scenario(s) differ between profiles: "
+                         f"{', '.join(scenario for _, scenario in differences)}")
+        return "\n".join(lines)
@@ -0,0 +1,86 @@
+"""
+Metrics Recorder
+Collects in-process timing metrics (page object actions, element waits) for the current scenario
+"""
+import threading
+import time
+from functools import wraps
+from typing import List, NamedTuple
+
+
+class Metric(NamedTuple):
+    """Single timing measurement"""
+    kind: str
+    name: str
+    duration_ms: float
+    recorded_at: float
+
+
+class MetricsRecorder:
+    """
+    Thread-safe buffer of timing metrics, drained by the results store after each step.
+
+    Metrics are only buffered between start() and stop(), while a consumer drains them;
+    otherwise record() does nothing and the buffer cannot grow for the whole run.
+    """
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._lock = threading.Lock()
+        self.collecting = False
+
+    def start(self):
+        """Start buffering metrics for a consumer that drains them."""
+        self.collecting = True
+
+    def stop(self):
+        """Stop buffering metrics and discard the ones not drained."""
+        self.collecting = False
+        self.drain()
+
+    def record(self, kind: str, name: str, duration_ms: float):
+        """
+        Record a timing measurement.
+
+        Args:
+            kind (str): Metric category (e.g. "action", "wait")
+            name (str): Metric name (e.g. "LoginPage.click_login_button")
+            duration_ms (float): Measured duration in milliseconds
+        """
+        if not self.collecting:
+            return
+        with self._lock:
+            self._metrics.append(Metric(kind, name, duration_ms, time.time()))
+
+    def drain(self) -> List[Metric]:
+        """
+        Return all buffered metrics and clear the buffer.
+
+        Returns:
+            List[Metric]: Metrics recorded since the previous drain
+        """
+        with self._lock:
+            metrics, self._metrics = self._metrics, []
+        return metrics
+
+    def timed(self, kind: str, name: str):
+        """
+        Decorator recording the duration of every call of the decorated function.
+
+        Args:
+            kind (str): Metric category
+            name (str): Metric name
+        """
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(kind, name, (time.perf_counter() - start) * 1000)
+            return wrapper
+        return decorator
+
+
+metrics = MetricsRecorder()
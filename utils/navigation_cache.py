@@ -0,0 +1,187 @@
+"""
+Navigation Cache
+Tracks the document each driver shows, so navigating to the page a (reused) driver already displays in a clean
+state becomes a cheap in-page soft reset instead of a full page load
+"""
+import hashlib
+import json
+import logging
+import time
+import uuid
+import weakref
+from typing import NamedTuple
+
+from utils.metrics import metrics
+from utils.settings_manager import settings_manager
+
+logger = logging.getLogger(__name__)
+
+# Marks a loaded document, so a later check can tell it was not replaced by another navigation
+TOKEN_PROPERTY = "__bddNavigationToken"
+
+MARK_DOCUMENT_SCRIPT = f"""
+window.{TOKEN_PROPERTY} = arguments[0];
+return {{href: location.href, storage: JSON.stringify([localStorage, sessionStorage])}};
+"""
+
+# Returns the state of the current document and whether the readiness marker is visible
+CHECK_DOCUMENT_SCRIPT = f"""
+var using = arguments[0], value = arguments[1], element = null;
+try {{
+    if (using === 'id') {{ element = document.getElementById(value); }}
+    else if (using === 'xpath') {{
+        element = document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }}
+    else {{ element = document.querySelector(value); }}
+}} catch (e) {{}}
+return {{
+    href: location.href,
+    token: window.{TOKEN_PROPERTY} || null,
+    ready: document.readyState === 'complete',
+    marker: !!element && !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length),
+    storage: JSON.stringify([localStorage, sessionStorage])
+}};
+"""
+
+READ_STORAGE_SCRIPT = "return JSON.stringify([localStorage, sessionStorage]);"
+
+CLEAR_STORAGE_SCRIPT = "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+
+
+class DocumentState(NamedTuple):
+    """A document loaded through the cache"""
+    url: str
+    href: str
+    token: str
+    fingerprint: str
+
+
+class NavigationCache:
+    """
+    Skips full loads of the page a driver already shows.
+
+    A navigation is skipped when the driver still shows the document loaded for the same URL (same in-page token),
+    the document is complete, the readiness marker is visible, and cookies and web storage are unchanged since the
+    load. The page's soft reset script then restores in-page state instead of a reload.
+
+    Documents are only recorded for drivers registered with track(), the ones the driver supervisor may hand to a
+    later scenario; for other drivers recording would cost round trips without any chance of a hit.
+    """
+
+    def __init__(self, enabled: bool = None):
+        self._enabled = enabled
+        self._documents = weakref.WeakKeyDictionary()
+        self._tracked = weakref.WeakSet()
+        self.stats = {"full_loads": 0, "loads_avoided": 0, "session_resets": 0}
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            self._enabled = settings_manager.get("navigation_cache", True)
+        return self._enabled
+
+    @staticmethod
+    def _fingerprint(driver, storage: str) -> str:
+        """Digest of cookies (including HttpOnly) and web storage of the current document."""
+        cookies = sorted((cookie.get("domain", ""), cookie.get("path", ""), cookie["name"], cookie.get("value", ""))
+                         for cookie in driver.get_cookies())
+        return hashlib.sha1(json.dumps([cookies, storage]).encode()).hexdigest()
+
+    @staticmethod
+    def _script_locator(locator):
+        """Locator as (using, value) understood by CHECK_DOCUMENT_SCRIPT."""
+        from Base.base_page import BATCH_CSS_STRATEGIES
+
+        using, value = locator
+        if using in BATCH_CSS_STRATEGIES:
+            return "css selector", BATCH_CSS_STRATEGIES[using](value)
+        return using, value
+
+    def try_reuse(self, driver, url: str, ready_locator, soft_reset_script: str = None) -> bool:
+        """
+        Reuse the current document if it is the clean, ready document loaded for url.
+
+        Args:
+            driver: WebDriver instance
+            url (str): Requested URL
+            ready_locator: Locator of the element marking the page as ready
+            soft_reset_script (str): Script restoring in-page state (closing dialogs, resetting forms)
+
+        Returns:
+            bool: True if the full load was avoided
+        """
+        state = self._documents.get(driver)
+        if not self.enabled or state is None or state.url != url:
+            return False
+        start = time.perf_counter()
+        document = driver.execute_script(CHECK_DOCUMENT_SCRIPT, *self._script_locator(ready_locator))
+        if not (document["href"] == state.href and document["token"] == state.token and document["ready"]
+                and document["marker"] and self._fingerprint(driver, document["storage"]) == state.fingerprint):
+            logger.debug("Navigation cache miss for %s", url)
+            return False
+        if soft_reset_script:
+            driver.execute_script(soft_reset_script)
+        self.stats["loads_avoided"] += 1
+        metrics.record("navigation", "NavigationCache.soft_reset", (time.perf_counter() - start) * 1000)
+        logger.info("Full load of %s avoided, page soft reset", url)
+        return True
+
+    def record_load(self, driver, url: str, load_ms: float = None):
+        """
+        Remember the document just loaded for url.
+
+        Args:
+            driver: WebDriver instance
+            url (str): Requested URL
+            load_ms (float): Duration of the full load, recorded as a metric
+        """
+        self.stats["full_loads"] += 1
+        if load_ms is not None:
+            metrics.record("navigation", "NavigationCache.full_load", load_ms)
+        if not self.enabled or driver not in self._tracked:
+            return
+        token = uuid.uuid4().hex
+        document = driver.execute_script(MARK_DOCUMENT_SCRIPT, token)
+        self._documents[driver] = DocumentState(url, document["href"], token,
+                                                self._fingerprint(driver, document["storage"]))
+
+    def track(self, driver):
+        """Record the documents of a driver that may be reused by later scenarios."""
+        self._tracked.add(driver)
+
+    def forget(self, driver):
+        """Drop the tracked document of a driver."""
+        self._documents.pop(driver, None)
+
+    def reset_session(self, driver) -> bool:
+        """
+        Prepare a driver for reuse by the next scenario.
+
+        Cookies and web storage are kept if they are unchanged since the tracked document was loaded,
+        otherwise they are cleared (cookies of the current domain) and the document is forgotten.
+
+        Returns:
+            bool: True if session state had to be cleared
+        """
+        state = self._documents.get(driver)
+        if state is not None:
+            storage = driver.execute_script(READ_STORAGE_SCRIPT)
+            if self._fingerprint(driver, storage) == state.fingerprint:
+                return False
+        driver.delete_all_cookies()
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        self.forget(driver)
+        self.stats["session_resets"] += 1
+        return True
+
+    def report(self) -> str:
+        """
+        Summary of navigation counters.
+
+        Returns:
+            str: Human readable counters
+        """
+        return ", ".join(f"{key}={value}" for key, value in self.stats.items())
+
+
+navigation_cache = NavigationCache()
@@ -0,0 +1,318 @@
+"""
+Pre-flight Validation
+Checks features, step definitions, page object locators and datasets without starting a browser, so broken
+runs fail in well under a second instead of after the first browser has launched
+
+    python -m utils.preflight features --strict
+"""
+import argparse
+import importlib
+import inspect
+import os
+import pkgutil
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional dependency
+    etree = None
+try:
+    import cssselect
+except ImportError:  # pragma: no cover - optional dependency
+    cssselect = None
+
+BY_STRATEGIES = {value for name, value in vars(By).items() if name.isupper()}
+
+TAG_NAME_PATTERN = re.compile(r"^[A-Za-z][\w-]*$")
+# Body of a CSS attribute selector, with quoted values already blanked out
+CSS_ATTRIBUTE_PATTERN = re.compile(r"^\s*[-\w|*:]+\s*(?:[~|^$*]?=\s*(?:\"\"|''|[-\w]+)\s*[iIsS]?\s*)?$")
+# Placeholders of locator templates such as "//a[contains(text(),'{}')]"
+TEMPLATE_FIELD_PATTERN = re.compile(r"\{[^{}]*\}")
+
+
+@dataclass
+class PreflightReport:
+    """Findings of a validation run; errors fail the run, unused steps only with --strict"""
+    features: int = 0
+    scenarios: int = 0
+    steps: int = 0
+    locators: int = 0
+    undefined_steps: List[Tuple[str, str]] = field(default_factory=list)
+    invalid_locators: List[Tuple[str, Tuple[str, str], str]] = field(default_factory=list)
+    dataset_errors: List[Tuple[str, str]] = field(default_factory=list)
+    unused_steps: List[Tuple[str, str]] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    @property
+    def errors(self) -> int:
+        return len(self.undefined_steps) + len(self.invalid_locators) + len(self.dataset_errors)
+
+
+def _check_delimiters(expression: str, escapes: bool) -> Optional[str]:
+    """Check that quotes are closed and brackets/parentheses are balanced outside of string literals."""
+    closing = {"[": "]", "(": ")"}
+    stack, quote, index = [], None, 0
+    while index < len(expression):
+        char = expression[index]
+        if escapes and char == "\\":
+            index += 2
+            continue
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in closing:
+            stack.append(closing[char])
+        elif char in "])":
+            if not stack or stack.pop() != char:
+                return f"unbalanced '{char}' at position {index}"
+        index += 1
+    if quote:
+        return f"unclosed {quote} quote"
+    if stack:
+        return f"missing '{stack[-1]}'"
+    return None
+
+
+def _strip_literals(expression: str) -> str:
+    """Blank out quoted string literals, keeping the quotes."""
+    return re.sub(r"\"[^\"]*\"|'[^']*'", lambda match: match.group(0)[0] * 2, expression)
+
+
+def validate_xpath(expression: str) -> Optional[str]:
+    """
+    Check the syntax of an XPath expression (full parse with lxml when installed).
+
+    Returns:
+        str: Reason the expression is invalid, None if it is valid
+    """
+    if not expression.strip():
+        return "empty XPath"
+    if etree is not None:
+        try:
+            etree.XPath(expression)
+        except etree.XPathSyntaxError as e:
+            return str(e)
+        return None
+    reason = _check_delimiters(expression, escapes=False)
+    if reason:
+        return reason
+    bare = _strip_literals(expression).strip()
+    if re.search(r"\[\s*\]", bare):
+        return "empty predicate '[]'"
+    if bare != "/" and bare.endswith(("/", "@", "::", ",", "|", "=", "(")):
+        return "incomplete expression"
+    if re.search(r"/{3,}", bare):
+        return "invalid '///' step"
+    return None
+
+
+def validate_css(selector: str) -> Optional[str]:
+    """
+    Check the syntax of a CSS selector (full parse with cssselect when installed).
+
+    Returns:
+        str: Reason the selector is invalid, None if it is valid
+    """
+    if not selector.strip():
+        return "empty CSS selector"
+    if cssselect is not None:
+        try:
+            cssselect.parse(selector)
+        except cssselect.SelectorError as e:
+            return str(e)
+        return None
+    reason = _check_delimiters(selector, escapes=True)
+    if reason:
+        return reason
+    bare = _strip_literals(re.sub(r"\\.", "_", selector)).strip()
+    if any(not group.strip() for group in bare.split(",")):
+        return "empty selector group"
+    if re.search(r"[>+~]\s*(,|$)", bare) or re.match(r"^[>+~]", bare):
+        return "dangling combinator"
+    for attribute in re.findall(r"\[([^\]]*)\]", bare):
+        if not CSS_ATTRIBUTE_PATTERN.match(attribute):
+            return f"invalid attribute selector [{attribute}]"
+    if re.search(r"(?<!:):{1,2}(?![-\w:])", bare):
+        return "pseudo-class without a name"
+    return None
+
+
+def validate_locator(locator) -> Optional[str]:
+    """
+    Check a (By strategy, value) locator without a browser.
+
+    Returns:
+        str: Reason the locator is invalid, None if it is valid
+    """
+    if not isinstance(locator, tuple) or len(locator) != 2 or not isinstance(locator[1], str):
+        return "locator must be a (By strategy, value) tuple"
+    strategy, value = locator
+    if strategy not in BY_STRATEGIES:
+        return f"unknown strategy {strategy!r}"
+    if strategy == By.XPATH:
+        return validate_xpath(value)
+    if strategy == By.CSS_SELECTOR:
+        return validate_css(value)
+    if not value.strip():
+        return "empty value"
+    if strategy == By.CLASS_NAME and re.search(r"\s", value):
+        return "compound class names are not supported, use a CSS selector"
+    if strategy == By.TAG_NAME and not TAG_NAME_PATTERN.match(value):
+        return "invalid tag name"
+    return None
+
+
+def collect_locators(package: str = "Pages") -> Iterator[Tuple[str, Tuple[str, str]]]:
+    """
+    Find locator constants of the page objects in a package.
+
+    Upper case class attributes holding a (By strategy, value) tuple are locators, as are XPath template strings;
+    template fields are filled with a placeholder before validation.
+
+    Yields:
+        tuple: ("PageClass.ATTRIBUTE", locator)
+    """
+    from Base.base_page import BasePage
+
+    pages = importlib.import_module(package)
+    for module_info in pkgutil.iter_modules(pages.__path__):
+        module = importlib.import_module(f"{package}.{module_info.name}")
+        for cls in vars(module).values():
+            if not (inspect.isclass(cls) and issubclass(cls, BasePage) and cls.__module__ == module.__name__):
+                continue
+            for name, value in vars(cls).items():
+                if not name.isupper():
+                    continue
+                if isinstance(value, tuple) and len(value) == 2 and value[0] in BY_STRATEGIES:
+                    locator = value
+                elif isinstance(value, str) and value.lstrip("(").startswith("/"):
+                    locator = (By.XPATH, value)
+                else:
+                    continue
+                yield f"{cls.__name__}.{name}", (locator[0], TEMPLATE_FIELD_PATTERN.sub("x", locator[1]))
+
+
+def _iter_steps(feature, report: PreflightReport):
+    """Steps to resolve: background steps once, then the steps of every scenario or outline example."""
+    from behave.model import ScenarioOutline
+    from utils.dataset_outline import get_dataset_name
+    from utils.test_data import test_data
+
+    if feature.background:
+        yield from feature.background.steps
+    for scenario in feature.scenarios:
+        if not isinstance(scenario, ScenarioOutline):
+            report.scenarios += 1
+            yield from scenario.steps
+            continue
+        dataset = get_dataset_name(scenario.tags)
+        if dataset:
+            location = f"{scenario.filename}:{scenario.line}"
+            try:
+                path = test_data.get_dataset_path(dataset)
+                if not os.path.isfile(path):
+                    report.dataset_errors.append((location, f"dataset {dataset}: file {path} not found"))
+            except LookupError as e:
+                report.dataset_errors.append((location, str(e)))
+        # Dataset outlines have header-only Examples; their template steps stand in for the rows
+        examples = scenario.scenarios
+        report.scenarios += max(len(examples), 1)
+        if examples:
+            for example in examples:
+                yield from example.steps
+        else:
+            yield from scenario.steps
+
+
+def run_preflight(features_path: str = "features", steps_path: str = None,
+                  pages_package: str = "Pages") -> PreflightReport:
+    """
+    Validate features, step definitions and page object locators without a browser.
+
+    Args:
+        features_path (str): Feature file or directory
+        steps_path (str): Step definitions directory, defaults to <features directory>/steps
+        pages_package (str): Package with the page objects
+
+    Returns:
+        PreflightReport: Validation findings
+    """
+    from behave.parser import parse_file
+    from behave.runner_util import load_step_modules
+    from behave.step_registry import registry
+
+    start = time.perf_counter()
+    report = PreflightReport()
+    if os.path.isdir(features_path):
+        feature_files = sorted(os.path.join(root, name) for root, _, files in os.walk(features_path)
+                               for name in files if name.endswith(".feature"))
+        features_dir = features_path
+    else:
+        feature_files, features_dir = [features_path], os.path.dirname(features_path)
+    load_step_modules([steps_path or os.path.join(features_dir, "steps")])
+
+    used = set()
+    for feature_file in feature_files:
+        feature = parse_file(feature_file)
+        if feature is None:
+            continue
+        report.features += 1
+        for step in _iter_steps(feature, report):
+            report.steps += 1
+            match = registry.find_match(step)
+            if match is None:
+                report.undefined_steps.append((f"{step.filename}:{step.line}", f"{step.keyword} {step.name}"))
+            else:
+                used.add(match.func)
+
+    seen = set()
+    for step_type, matchers in registry.steps.items():
+        for matcher in matchers:
+            if matcher.func not in used and matcher.func not in seen:
+                seen.add(matcher.func)
+                report.unused_steps.append((matcher.location, f"@{step_type} {matcher.string}"))
+
+    for owner, locator in collect_locators(pages_package):
+        report.locators += 1
+        reason = validate_locator(locator)
+        if reason:
+            report.invalid_locators.append((owner, locator, reason))
+
+    report.duration_ms = (time.perf_counter() - start) * 1000
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate features, steps and locators without a browser")
+    parser.add_argument("features", nargs="?", default="features", help="Feature file or directory")
+    parser.add_argument("--steps", help="Step definitions directory (default: <features>/steps)")
+    parser.add_argument("--pages", default="Pages", help="Page object package")
+    parser.add_argument("--strict", action="store_true", help="Fail on unused step definitions")
+    args = parser.parse_args(argv)
+
+    report = run_preflight(args.features, args.steps, args.pages)
+    for location, step in report.undefined_steps:
+        print(f"UNDEFINED STEP  {location}: {step}")
+    for owner, locator, reason in report.invalid_locators:
+        print(f"INVALID LOCATOR {owner} {locator}: {reason}")
+    for location, reason in report.dataset_errors:
+        print(f"DATASET ERROR   {location}: {reason}")
+    for location, step in report.unused_steps:
+        print(f"UNUSED STEP     {location}: {step}")
+    print(f"{report.features} features, {report.scenarios} scenarios, {report.steps} steps, "
+          f"{report.locators} locators checked in {report.duration_ms:.0f} ms: {report.errors} errors, "
+          f"{len(report.unused_steps)} unused steps")
+    failed = report.errors or (args.strict and report.unused_steps)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Process Utilities
+Minimal /proc based helpers to inspect and terminate browser process trees (Linux only, no-ops elsewhere)
+"""
+import os
+import signal
+from typing import Dict, List, Optional
+
+PROC_DIR = "/proc"
+
+
+def _read_stat(pid: int) -> Optional[List[str]]:
+    """Fields of /proc/<pid>/stat after the command name, or None if unavailable."""
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "stat")) as stat_file:
+            stat = stat_file.read()
+    except OSError:
+        return None
+    return stat[stat.rfind(")") + 2:].split()
+
+
+def get_parent_map() -> Dict[int, int]:
+    """
+    Map every visible process to its parent process.
+
+    Returns:
+        Dict[int, int]: pid -> parent pid (empty when /proc is unavailable)
+    """
+    parents = {}
+    if not os.path.isdir(PROC_DIR):
+        return parents
+    for entry in os.listdir(PROC_DIR):
+        if entry.isdigit():
+            fields = _read_stat(int(entry))
+            if fields:
+                parents[int(entry)] = int(fields[1])
+    return parents
+
+
+def find_descendants(pid: int) -> List[int]:
+    """
+    Get all descendant processes of a process.
+
+    Args:
+        pid (int): Root process id
+
+    Returns:
+        List[int]: Descendant process ids
+    """
+    children = {}
+    for child, parent in get_parent_map().items():
+        children.setdefault(parent, []).append(child)
+    descendants, pending = [], [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            descendants.append(child)
+            pending.append(child)
+    return descendants
+
+
+def is_running(pid: int) -> bool:
+    """
+    Check if a process exists and is not a zombie.
+
+    Args:
+        pid (int): Process id
+
+    Returns:
+        bool: True if the process is running
+    """
+    fields = _read_stat(pid)
+    if fields is not None:
+        return fields[0] not in ("Z", "X")
+    try:
+        os.kill(pid, 0)
+    except (ProcessLookupError, PermissionError):
+        return False
+    return not os.path.isdir(PROC_DIR)
+
+
+def get_cmdline(pid: int) -> str:
+    """
+    Get the command line of a process.
+
+    Returns:
+        str: Command line with arguments separated by spaces (empty if unavailable)
+    """
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "cmdline"), "rb") as cmdline_file:
+            return cmdline_file.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
+        return ""
+
+
+def kill_processes(pids: List[int]) -> int:
+    """
+    Kill processes and reap those that are children of this process.
+
+    Args:
+        pids (List[int]): Process ids to kill
+
+    Returns:
+        int: Number of processes that were still running and got killed
+    """
+    killed = 0
+    for pid in pids:
+        if not is_running(pid):
+            continue
+        try:
+            os.kill(pid, signal.SIGKILL)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            continue
+    for pid in pids:
+        try:
+            os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            pass
+    return killed
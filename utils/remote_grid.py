@@ -0,0 +1,303 @@
+"""
+Remote Grid
+Spreads remote WebDriver sessions over several endpoints (Selenium Grid hubs or plain chromedriver
+instances) using health checks and least-loaded selection
+"""
+import argparse
+import json
+import logging
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+from utils.settings_manager import settings_manager
+from utils.worker_info import get_worker_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NODE_PORT = 9515
+
+
+def parse_urls(value) -> List[str]:
+    """
+    Parse the remote_urls setting.
+
+    Args:
+        value: Comma or whitespace separated URLs, or a list of URLs
+
+    Returns:
+        List[str]: URLs without trailing slashes, duplicates removed
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = re.split(r"[,\s]+", value)
+    return list(dict.fromkeys(url.strip().rstrip("/") for url in value if url and url.strip()))
+
+
+@dataclass
+class RemoteNode:
+    """A remote WebDriver endpoint with its health and the sessions this worker runs on it"""
+    url: str
+    max_sessions: int
+    active: int = 0
+    healthy: bool = True
+    checked_at: float = 0.0
+    # Share of busy slots reported by a Selenium Grid /status, None for plain driver servers
+    reported_load: Optional[float] = None
+    sessions: int = 0
+    failures: int = 0
+
+    @property
+    def load(self) -> float:
+        return max(self.active / self.max_sessions, self.reported_load or 0.0)
+
+
+class RemoteGrid:
+    """
+    Picks the endpoint for each new remote session.
+
+    - health: GET <url>/status, rechecked every remote_health_interval seconds and right after a failure
+    - selection: healthy node with the lowest load; ties start at a different node for every worker,
+      so parallel workers fan out over the nodes
+    """
+
+    def __init__(self, urls=None, max_sessions: int = None, health_interval: float = None,
+                 health_timeout: float = None):
+        urls = parse_urls(settings_manager.get("remote_urls") if urls is None else urls)
+        if not urls:
+            raise ValueError("browser = remote requires remote_urls in settings")
+        max_sessions = int(max_sessions or settings_manager.get("remote_max_sessions", 2))
+        self.health_interval = float(health_interval or settings_manager.get("remote_health_interval", 30))
+        self.health_timeout = float(health_timeout or settings_manager.get("remote_health_timeout", 3))
+
+        offset = get_worker_index() % len(urls)
+        self.nodes = [RemoteNode(url, max_sessions) for url in urls[offset:] + urls[:offset]]
+        self._lock = threading.Lock()
+
+    def _find(self, url: str) -> RemoteNode:
+        return next(node for node in self.nodes if node.url == url)
+
+    def check_health(self, node: RemoteNode) -> bool:
+        """
+        Query the /status endpoint of a node and update its health and reported load.
+
+        Args:
+            node (RemoteNode): Node to check
+
+        Returns:
+            bool: True if the node is ready for new sessions
+        """
+        try:
+            with urllib.request.urlopen(f"{node.url}/status", timeout=self.health_timeout) as response:
+                status = json.loads(response.read()).get("value") or {}
+            node.healthy = bool(status.get("ready", True))
+            slots = [slot for grid_node in status.get("nodes") or []
+                     if grid_node.get("availability", "UP") == "UP" for slot in grid_node.get("slots") or []]
+            node.reported_load = (sum(1 for slot in slots if slot.get("session")) / len(slots)) if slots else None
+        except Exception as e:
+            logger.warning("Remote node %s failed health check: %s", node.url, e)
+            node.healthy = False
+        node.checked_at = time.monotonic()
+        return node.healthy
+
+    def refresh(self, force: bool = False):
+        """
+        Health check nodes whose last check is older than the health interval, in parallel.
+
+        Args:
+            force (bool): Check every node regardless of its last check
+        """
+        now = time.monotonic()
+        stale = [node for node in self.nodes if force or now - node.checked_at >= self.health_interval]
+        if stale:
+            with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+                list(executor.map(self.check_health, stale))
+
+    def _select(self, exclude) -> Optional[RemoteNode]:
+        with self._lock:
+            candidates = [node for node in self.nodes
+                          if node.healthy and node.active < node.max_sessions and node.url not in exclude]
+            if not candidates:
+                return None
+            node = min(candidates, key=lambda candidate: candidate.load)
+            node.active += 1
+            node.sessions += 1
+            return node
+
+    def acquire(self, exclude=()) -> RemoteNode:
+        """
+        Reserve a session slot on the least-loaded healthy node.
+
+        Args:
+            exclude: URLs of nodes not to select
+
+        Returns:
+            RemoteNode: Selected node, give it back with release()
+
+        Raises:
+            RuntimeError: If no node is healthy or has a free slot
+        """
+        self.refresh()
+        node = self._select(exclude)
+        if node is None:
+            self.refresh(force=True)
+            node = self._select(exclude)
+        if node is None:
+            raise RuntimeError(f"No healthy remote node with a free session slot: {self.report()}")
+        logger.debug("Selected remote node %s (load %.2f)", node.url, node.load)
+        return node
+
+    def release(self, url: str, failed: bool = False):
+        """
+        Free the session slot of a node.
+
+        Args:
+            url (str): Node URL
+            failed (bool): The session could not be created or crashed; the node is rechecked
+                before it is selected again
+        """
+        with self._lock:
+            node = self._find(url)
+            node.active = max(node.active - 1, 0)
+            if failed:
+                node.failures += 1
+                node.checked_at = 0.0
+
+    def report(self) -> str:
+        """
+        Summary of node health and usage.
+
+        Returns:
+            str: Human readable node states
+        """
+        return "; ".join(f"{node.url} healthy={node.healthy} active={node.active} sessions={node.sessions} "
+                         f"failures={node.failures}" for node in self.nodes)
+
+
+_remote_grid = None
+
+
+def get_remote_grid() -> RemoteGrid:
+    """Shared RemoteGrid configured from settings."""
+    global _remote_grid
+    if _remote_grid is None:
+        _remote_grid = RemoteGrid()
+    return _remote_grid
+
+
+def find_chromedriver() -> str:
+    """
+    Locate chromedriver on PATH, falling back to Selenium Manager.
+
+    Returns:
+        str: Path of the chromedriver executable
+    """
+    path = shutil.which("chromedriver")
+    if path:
+        return path
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.common.driver_finder import DriverFinder
+    return DriverFinder(ChromeService(), ChromeOptions()).get_driver_path()
+
+
+def start_local_nodes(count: int, port: int = DEFAULT_NODE_PORT, chromedriver: str = None,
+                      allowed_ips: str = None, ready_timeout: float = 10) -> List[tuple]:
+    """
+    Start chromedriver instances that stand in for remote nodes.
+
+    Args:
+        count (int): Number of nodes
+        port (int): Port of the first node, the others use the following ports
+        chromedriver (str): Chromedriver executable, located automatically if None
+        allowed_ips (str): Comma separated client IPs allowed besides localhost
+        ready_timeout (float): Seconds to wait for each node to answer /status
+
+    Returns:
+        List[tuple]: (process, url) per node; stop them with stop_local_nodes()
+
+    Raises:
+        RuntimeError: If a node does not become ready
+    """
+    chromedriver = chromedriver or find_chromedriver()
+    log_level = str(settings_manager.get("chromedriver_log_level", "WARNING")).upper()
+    nodes = []
+    try:
+        for index in range(count):
+            arguments = [chromedriver, f"--port={port + index}", f"--log-level={log_level}"]
+            if allowed_ips:
+                arguments.append(f"--allowed-ips={allowed_ips}")
+            process = subprocess.Popen(arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            nodes.append((process, f"http://127.0.0.1:{port + index}"))
+
+        checker = RemoteGrid(urls=[url for _, url in nodes], health_timeout=1)
+        deadline = time.monotonic() + ready_timeout
+        pending = list(checker.nodes)
+        while pending:
+            pending = [node for node in pending if not checker.check_health(node)]
+            if pending and time.monotonic() > deadline:
+                raise RuntimeError(f"Local nodes not ready: {', '.join(node.url for node in pending)}")
+            if pending:
+                time.sleep(0.2)
+    except Exception:
+        stop_local_nodes(nodes)
+        raise
+    return nodes
+
+
+def stop_local_nodes(nodes: List[tuple]):
+    """Terminate nodes started by start_local_nodes()."""
+    for process, _ in nodes:
+        process.terminate()
+    for process, _ in nodes:
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Remote WebDriver nodes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    nodes_parser = subparsers.add_parser("nodes", help="Run local chromedriver instances as remote nodes")
+    nodes_parser.add_argument("--count", type=int, default=2)
+    nodes_parser.add_argument("--port", type=int, default=DEFAULT_NODE_PORT)
+    nodes_parser.add_argument("--chromedriver", help="Chromedriver executable")
+    nodes_parser.add_argument("--allowed-ips", help="Comma separated client IPs allowed besides localhost")
+
+    subparsers.add_parser("status", help="Health check the nodes in remote_urls")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        grid = RemoteGrid()
+        grid.refresh(force=True)
+        for node in grid.nodes:
+            load = "-" if node.reported_load is None else f"{node.reported_load:.0%}"
+            print(f"{node.url:<40} {'healthy' if node.healthy else 'UNHEALTHY':<10} grid load {load}")
+        return 0 if any(node.healthy for node in grid.nodes) else 1
+
+    nodes = start_local_nodes(args.count, args.port, args.chromedriver, args.allowed_ips)
+    print(f"remote_urls = {', '.join(url for _, url in nodes)}")
+    print("Press Ctrl+C to stop the nodes")
+    try:
+        while all(process.poll() is None for process, _ in nodes):
+            time.sleep(1)
+        print("A node exited, stopping", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        stop_local_nodes(nodes)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
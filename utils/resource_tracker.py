@@ -0,0 +1,209 @@
+"""
+Resource Tracker
+Samples heap, file descriptors, child processes, temporary directories, log handlers and threads at scenario
+boundaries and flags resources that keep growing, so long-running workers can be checked for leaks
+"""
+import gc
+import logging
+import os
+import tempfile
+import threading
+import tracemalloc
+from typing import Dict, List, NamedTuple, Optional
+
+from utils.driver_factory import PROFILE_DIR_PREFIX, PROFILE_OWNER_FILE, PROFILE_PARENT_DIR
+from utils.process_utils import find_descendants
+from utils.settings_manager import settings_manager
+from utils.worker_info import get_worker_count
+
+logger = logging.getLogger(__name__)
+
+# Temporary directories created by Chrome and chromedriver outside of our profile directories
+BROWSER_TEMP_PREFIXES = (".org.chromium.Chromium.", ".com.google.Chrome.", "scoped_dir")
+
+COUNTED_RESOURCES = ("fds", "children", "temp_dirs", "log_handlers", "threads")
+
+
+class ResourceSample(NamedTuple):
+    """Resource usage after one scenario"""
+    scenario: str
+    heap_bytes: int
+    fds: int
+    children: int
+    temp_dirs: int
+    log_handlers: int
+    threads: int
+    # Open file descriptors left after gc.collect(); fds - fds_after_gc are held by unreachable objects
+    fds_after_gc: int
+
+
+class ResourceFlag(NamedTuple):
+    """A resource that grew beyond its tolerance since the baseline"""
+    scenario: str
+    resource: str
+    baseline: int
+    value: int
+    details: str
+
+
+def count_open_fds() -> int:
+    """Number of open file descriptors of this process (-1 if unknown)."""
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(fd_dir):
+            return len(os.listdir(fd_dir))
+    return -1
+
+
+def _owned_by(path: str, pid: int) -> bool:
+    """Check if a profile directory carries the owner marker of a process."""
+    try:
+        with open(os.path.join(path, PROFILE_OWNER_FILE)) as owner_file:
+            return owner_file.read().strip() == str(pid)
+    except OSError:
+        return False
+
+
+def count_temp_dirs() -> int:
+    """
+    Number of browser profile and browser temporary directories of this worker.
+
+    Profile directories are counted by their owner marker. Chrome and chromedriver temporary directories carry no
+    owner, so they are only counted when this is the only worker (WORKER_COUNT=1); with parallel workers they would
+    include the other workers' browsers.
+
+    Returns:
+        int: Directory count
+    """
+    pid, total = os.getpid(), 0
+    if os.path.isdir(PROFILE_PARENT_DIR):
+        total += sum(1 for entry in os.listdir(PROFILE_PARENT_DIR) if entry.startswith(PROFILE_DIR_PREFIX)
+                     and _owned_by(os.path.join(PROFILE_PARENT_DIR, entry), pid))
+    temp_dir = tempfile.gettempdir()
+    if get_worker_count() == 1 and os.path.isdir(temp_dir):
+        total += sum(1 for entry in os.listdir(temp_dir) if entry.startswith(BROWSER_TEMP_PREFIXES))
+    return total
+
+
+def count_log_handlers() -> int:
+    """Number of handlers attached to the root logger and all named loggers."""
+    loggers = [logging.getLogger()] + [log for log in logging.Logger.manager.loggerDict.values()
+                                       if isinstance(log, logging.Logger)]
+    return sum(len(log.handlers) for log in loggers)
+
+
+class ResourceTracker:
+    """
+    Tracks resource usage across scenarios.
+
+    The first resource_warmup_scenarios scenarios fill caches and pools; the sample after them is the baseline.
+    A counted resource is flagged when it exceeds the baseline by more than resource_count_tolerance, the heap when
+    it grows by more than resource_heap_tolerance_mb, with the allocation sites that grew most. A resource is flagged
+    again only when it grows past its previously flagged value.
+    """
+
+    def __init__(self, warmup: int = None, count_tolerance: int = None, heap_tolerance_mb: float = None,
+                 frames: int = None):
+        self.warmup = int(settings_manager.get("resource_warmup_scenarios", 3) if warmup is None else warmup)
+        self.count_tolerance = int(settings_manager.get("resource_count_tolerance", 2)
+                                   if count_tolerance is None else count_tolerance)
+        self.heap_tolerance = float(settings_manager.get("resource_heap_tolerance_mb", 5)
+                                    if heap_tolerance_mb is None else heap_tolerance_mb) * 1024 * 1024
+        self.frames = int(frames or settings_manager.get("resource_tracemalloc_frames", 5))
+        self.samples: List[ResourceSample] = []
+        self.flags: List[ResourceFlag] = []
+        self.baseline: Optional[ResourceSample] = None
+        self._baseline_snapshot = None
+        self._flagged: Dict[str, int] = {}
+        self._started_tracing = False
+
+    def start(self):
+        """Start tracing Python allocations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def stop(self):
+        """Stop tracing allocations if this tracker started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._baseline_snapshot = None
+
+    def sample(self, scenario: str) -> List[ResourceFlag]:
+        """
+        Record resource usage after a scenario and flag growth.
+
+        Args:
+            scenario (str): Name of the finished scenario
+
+        Returns:
+            List[ResourceFlag]: Resources flagged by this sample
+        """
+        # Counted as found: descriptors of unclosed pools, sockets and sqlite connections are growth to report.
+        # The count after gc.collect() tells which part only the garbage collector would have released.
+        fds = count_open_fds()
+        gc.collect()
+        current = ResourceSample(
+            scenario=scenario,
+            heap_bytes=tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0,
+            fds=fds,
+            children=len(find_descendants(os.getpid())),
+            temp_dirs=count_temp_dirs(),
+            log_handlers=count_log_handlers(),
+            threads=threading.active_count(),
+            fds_after_gc=count_open_fds(),
+        )
+        self.samples.append(current)
+        if len(self.samples) == self.warmup + 1:
+            self.baseline = current
+            if tracemalloc.is_tracing():
+                self._baseline_snapshot = tracemalloc.take_snapshot()
+            return []
+        if self.baseline is None:
+            return []
+
+        flags = []
+        for resource in COUNTED_RESOURCES:
+            value, baseline = getattr(current, resource), getattr(self.baseline, resource)
+            if value - self._flagged.get(resource, baseline) > self.count_tolerance:
+                details = f"({current.fds_after_gc} after gc.collect())" if resource == "fds" else ""
+                flags.append(ResourceFlag(scenario, resource, baseline, value, details))
+        if current.heap_bytes - self._flagged.get("heap_bytes", self.baseline.heap_bytes) > self.heap_tolerance:
+            flags.append(ResourceFlag(scenario, "heap_bytes", self.baseline.heap_bytes, current.heap_bytes,
+                                      self._top_allocations()))
+
+        for flag in flags:
+            self._flagged[flag.resource] = flag.value
+            logger.warning("Resource growth after scenario %r: %s %d -> %d %s", scenario, flag.resource,
+                           flag.baseline, flag.value, flag.details)
+        self.flags.extend(flags)
+        return flags
+
+    def _top_allocations(self, limit: int = 5) -> str:
+        """Allocation sites that grew most since the baseline snapshot."""
+        if self._baseline_snapshot is None:
+            return ""
+        stats = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )).compare_to(self._baseline_snapshot, "lineno")
+        return "; ".join(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                         f"+{stat.size_diff / 1024:.0f} KiB" for stat in stats[:limit] if stat.size_diff > 0)
+
+    def report(self) -> str:
+        """
+        Growth of every resource since the baseline, total and per scenario.
+
+        Returns:
+            str: Human readable growth summary
+        """
+        if self.baseline is None or len(self.samples) <= self.warmup + 1:
+            return f"{len(self.samples)} scenarios sampled, not enough after {self.warmup} warm-up scenarios"
+        last = self.samples[-1]
+        scenarios = len(self.samples) - self.warmup - 1
+        parts = [f"heap {(last.heap_bytes - self.baseline.heap_bytes) / 1024:+.0f} KiB "
+                 f"({(last.heap_bytes - self.baseline.heap_bytes) / 1024 / scenarios:+.1f} KiB/scenario)"]
+        parts += [f"{resource} {getattr(last, resource) - getattr(self.baseline, resource):+d}"
+                  for resource in COUNTED_RESOURCES]
+        parts.insert(2, f"fds after gc.collect() {last.fds_after_gc - self.baseline.fds_after_gc:+d}")
+        return f"{scenarios} scenarios after baseline: {', '.join(parts)}, {len(self.flags)} growth flags"
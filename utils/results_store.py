@@ -0,0 +1,287 @@
+"""
+Run Results Store
+Append-only SQLite store of scenarios, steps, timing metrics and artifacts across builds,
+with a small query CLI:
+
+    python -m utils.results_store percentile LoginPage.click_login_button --p 95 --last-runs 50
+    python -m utils.results_store slowest --kind action --last-runs 10
+    python -m utils.results_store runs
+"""
+import argparse
+import math
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from utils.metrics import Metric
+
+DEFAULT_DB_PATH = os.path.join("results", "results.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    environment TEXT,
+    worker_id TEXT,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    feature TEXT,
+    name TEXT NOT NULL,
+    status TEXT,
+    duration_ms REAL,
+    started_at REAL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    scenario_id INTEGER,
+    keyword TEXT,
+    name TEXT NOT NULL,
+    status TEXT,
+    duration_ms REAL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    scenario_id INTEGER,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    recorded_at REAL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    scenario_id INTEGER,
+    kind TEXT,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_name_run ON metrics (name, run_id, duration_ms);
+CREATE INDEX IF NOT EXISTS idx_steps_name_run ON steps (name, run_id, duration_ms);
+CREATE INDEX IF NOT EXISTS idx_scenarios_name_run ON scenarios (name, run_id, duration_ms);
+CREATE INDEX IF NOT EXISTS idx_metrics_name_duration ON metrics (name, duration_ms, run_id);
+CREATE INDEX IF NOT EXISTS idx_steps_name_duration ON steps (name, duration_ms, run_id);
+CREATE INDEX IF NOT EXISTS idx_scenarios_name_duration ON scenarios (name, duration_ms, run_id);
+"""
+
+# Tables that can be queried for durations (whitelist for query building)
+DURATION_TABLES = {"metrics": "metrics", "steps": "steps", "scenarios": "scenarios"}
+
+
+class ResultsStore:
+    """
+    Append-only results store backed by SQLite.
+
+    One store instance records a single run; each step is committed together
+    with the metrics collected while it ran, in one transaction.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or DEFAULT_DB_PATH
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path, timeout=30)
+        # WAL lets parallel workers append to the same file
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.run_id: Optional[int] = None
+        self._scenario_id: Optional[int] = None
+
+    def start_run(self, environment: str = None, worker_id: str = None, label: str = None) -> int:
+        """
+        Register a new run.
+
+        Returns:
+            int: Identifier of the run
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, environment, worker_id, label) VALUES (?, ?, ?, ?)",
+                (time.time(), environment, worker_id, label))
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def finish_run(self):
+        """Mark the current run as finished."""
+        with self.connection:
+            self.connection.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), self.run_id))
+
+    def start_scenario(self, feature: str, name: str) -> int:
+        """
+        Register a scenario of the current run.
+
+        Returns:
+            int: Identifier of the scenario
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO scenarios (run_id, feature, name, started_at) VALUES (?, ?, ?, ?)",
+                (self.run_id, feature, name, time.time()))
+        self._scenario_id = cursor.lastrowid
+        return self._scenario_id
+
+    def record_step(self, keyword: str, name: str, status: str, duration_ms: float,
+                    metrics: Iterable[Metric] = ()):
+        """Record a finished step together with the metrics collected while it ran."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO steps (run_id, scenario_id, keyword, name, status, duration_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.run_id, self._scenario_id, keyword, name, status, duration_ms))
+            self._insert_metrics(metrics)
+
+    def record_metrics(self, metrics: Iterable[Metric]):
+        """Record metrics collected outside of a step (e.g. in hooks)."""
+        with self.connection:
+            self._insert_metrics(metrics)
+
+    def _insert_metrics(self, metrics: Iterable[Metric]):
+        self.connection.executemany(
+            "INSERT INTO metrics (run_id, scenario_id, kind, name, duration_ms, recorded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(self.run_id, self._scenario_id, m.kind, m.name, m.duration_ms, m.recorded_at) for m in metrics])
+
+    def record_artifact(self, kind: str, path: str):
+        """Record an artifact (e.g. failure screenshot) of the current scenario."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO artifacts (run_id, scenario_id, kind, path) VALUES (?, ?, ?, ?)",
+                (self.run_id, self._scenario_id, kind, path))
+
+    def finish_scenario(self, status: str, duration_ms: float):
+        """Store final status and duration of the current scenario."""
+        with self.connection:
+            self.connection.execute(
+                "UPDATE scenarios SET status = ?, duration_ms = ? WHERE id = ?",
+                (status, duration_ms, self._scenario_id))
+        self._scenario_id = None
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    # -- Queries
+
+    def _first_run_id(self, last_runs: Optional[int]) -> int:
+        """Smallest run id among the last N runs (0 for all runs)."""
+        if not last_runs:
+            return 0
+        row = self.connection.execute(
+            "SELECT MIN(id) FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (last_runs,)).fetchone()
+        return row[0] or 0
+
+    def percentile(self, name: str, percentile: float = 95, last_runs: Optional[int] = None,
+                   table: str = "metrics") -> Tuple[int, Optional[float]]:
+        """
+        Nearest-rank percentile of durations recorded under a name.
+
+        Args:
+            name (str): Metric, step or scenario name
+            percentile (float): Percentile in range (0, 100]
+            last_runs (int): Restrict to the last N runs
+            table (str): One of "metrics", "steps", "scenarios"
+
+        Returns:
+            Tuple[int, float]: Sample count and percentile duration in milliseconds
+
+        Raises:
+            ValueError: If the percentile is not in range (0, 100]
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError(f"Percentile must be in range (0, 100], got {percentile:g}")
+        table = DURATION_TABLES[table]
+        condition = f"FROM {table} WHERE name = ? AND run_id >= ? AND duration_ms IS NOT NULL"
+        params = (name, self._first_run_id(last_runs))
+        # Counted on (name, run_id, duration_ms); the ranked row is read from (name, duration_ms, run_id),
+        # which returns durations in order, so neither query sorts
+        count = self.connection.execute(f"SELECT COUNT(*) {condition}", params).fetchone()[0]
+        if not count:
+            return 0, None
+        rank = max(math.ceil(percentile / 100 * count), 1)
+        row = self.connection.execute(f"SELECT duration_ms {condition} ORDER BY duration_ms LIMIT 1 OFFSET ?",
+                                      params + (rank - 1,)).fetchone()
+        return count, row[0] if row else None
+
+    def slowest(self, kind: Optional[str] = None, last_runs: Optional[int] = None,
+                limit: int = 10) -> List[tuple]:
+        """
+        Metric names ordered by average duration.
+
+        Returns:
+            List[tuple]: Rows of (name, count, avg_ms, max_ms)
+        """
+        query = ("SELECT name, COUNT(*), AVG(duration_ms), MAX(duration_ms) FROM metrics WHERE run_id >= ?"
+                 + (" AND kind = ?" if kind else "") + " GROUP BY name ORDER BY AVG(duration_ms) DESC LIMIT ?")
+        params = [self._first_run_id(last_runs)] + ([kind] if kind else []) + [limit]
+        return self.connection.execute(query, params).fetchall()
+
+    def runs(self, limit: int = 10) -> List[tuple]:
+        """
+        Latest runs with their scenario counts.
+
+        Returns:
+            List[tuple]: Rows of (id, started_at, environment, worker_id, passed, failed)
+        """
+        return self.connection.execute(
+            "SELECT r.id, r.started_at, r.environment, r.worker_id, "
+            "SUM(s.status = 'passed'), SUM(s.status = 'failed') "
+            "FROM runs r LEFT JOIN scenarios s ON s.run_id = r.id "
+            "GROUP BY r.id ORDER BY r.id DESC LIMIT ?", (limit,)).fetchall()
+
+
+def main(argv=None):
+    """Command line entry point for querying the results store."""
+    parser = argparse.ArgumentParser(description="Query the run results store")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to results database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    percentile_parser = commands.add_parser("percentile", help="Duration percentile of a metric/step/scenario")
+    percentile_parser.add_argument("name")
+    percentile_parser.add_argument("--p", type=float, default=95)
+    percentile_parser.add_argument("--last-runs", type=int)
+    percentile_parser.add_argument("--table", choices=sorted(DURATION_TABLES), default="metrics")
+
+    slowest_parser = commands.add_parser("slowest", help="Slowest metrics by average duration")
+    slowest_parser.add_argument("--kind")
+    slowest_parser.add_argument("--last-runs", type=int)
+    slowest_parser.add_argument("--limit", type=int, default=10)
+
+    runs_parser = commands.add_parser("runs", help="Latest runs")
+    runs_parser.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+    if args.command == "percentile" and not 0 < args.p <= 100:
+        parser.error(f"--p must be in range (0, 100], got {args.p:g}")
+    if not os.path.exists(args.db):
+        print(f"Results database not found: {args.db}", file=sys.stderr)
+        return 1
+
+    store = ResultsStore(args.db)
+    try:
+        if args.command == "percentile":
+            count, value = store.percentile(args.name, args.p, args.last_runs, args.table)
+            if value is None:
+                print(f"No samples for {args.name}")
+            else:
+                print(f"p{args.p:g} {args.name}: {value:.1f} ms ({count} samples)")
+        elif args.command == "slowest":
+            for name, count, average, maximum in store.slowest(args.kind, args.last_runs, args.limit):
+                print(f"{average:10.1f} ms avg {maximum:10.1f} ms max {count:8d}x  {name}")
+        elif args.command == "runs":
+            for run_id, started_at, environment, worker_id, passed, failed in store.runs(args.limit):
+                started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started_at))
+                print(f"#{run_id} {started} {environment} {worker_id} passed={passed or 0} failed={failed or 0}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
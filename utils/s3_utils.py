@@ -48,14 +48,8 @@ class S3Downloader:
         self.bucket = self.s3_resource.Bucket(self.bucket_name)
     
     def _setup_logging(self):
-        """Setup logging for S3 operations."""
+        """Setup logging for S3 operations; handlers and levels come from utils.logging_config."""
         self.logger = logging.getLogger(__name__)
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
     
     def _create_s3_session(self):
         """Create S3 session with proper error handling."""
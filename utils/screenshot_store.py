@@ -0,0 +1,174 @@
+"""
+Content-addressed Screenshot Store
+Deduplicates screenshots by content hash, optionally re-encodes them and keeps disk usage bounded
+"""
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from utils.settings_manager import settings_manager
+
+logger = logging.getLogger(__name__)
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scenario TEXT,
+    step TEXT,
+    hash TEXT NOT NULL,
+    captured_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_captures_scenario ON captures (scenario, step);
+CREATE INDEX IF NOT EXISTS idx_blobs_last_used ON blobs (last_used_at);
+"""
+
+
+class ScreenshotStore:
+    """
+    Stores screenshots as blobs named by the SHA-256 of their PNG bytes.
+
+    Identical captures are written once; an index maps scenario and step names to blobs.
+    Optional re-encoding (WebP) and downscaling require Pillow.
+    """
+
+    def __init__(self, root=None, image_format=None, max_width=None, max_bytes=None, max_age_days=None):
+        self.root = Path(root or settings_manager.get("screenshot_dir", "screenshots"))
+        self.image_format = (image_format or settings_manager.get("screenshot_format", "png")).lower()
+        self.max_width = max_width or settings_manager.get("screenshot_max_width")
+        max_mb = settings_manager.get("screenshot_max_mb")
+        self.max_bytes = max_bytes or (max_mb * 1024 * 1024 if max_mb else None)
+        self.max_age_days = max_age_days or settings_manager.get("screenshot_max_age_days")
+        (self.root / "blobs").mkdir(parents=True, exist_ok=True)
+        self.index = sqlite3.connect(str(self.root / "index.db"), timeout=30)
+        self.index.executescript(INDEX_SCHEMA)
+
+    def _encode(self, png_bytes: bytes):
+        """Re-encode or downscale image if configured, returns (bytes, extension)."""
+        if self.image_format == "png" and not self.max_width:
+            return png_bytes, "png"
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.warning("Pillow is not installed, storing screenshot as PNG")
+            return png_bytes, "png"
+
+        image = Image.open(io.BytesIO(png_bytes))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height))
+        output = io.BytesIO()
+        if self.image_format == "webp":
+            image.save(output, format="WEBP", quality=80, method=4)
+            return output.getvalue(), "webp"
+        image.save(output, format="PNG", optimize=True)
+        return output.getvalue(), "png"
+
+    def save(self, png_bytes: bytes, scenario: str = None, step: str = None) -> str:
+        """
+        Store a screenshot unless an identical one is already stored.
+
+        Args:
+            png_bytes (bytes): Screenshot as PNG bytes
+            scenario (str): Scenario name the capture belongs to
+            step (str): Step name the capture belongs to
+
+        Returns:
+            str: Path of the stored blob
+        """
+        digest = hashlib.sha256(png_bytes).hexdigest()
+        now = time.time()
+        with self.index:
+            row = self.index.execute("SELECT path FROM blobs WHERE hash = ?", (digest,)).fetchone()
+            if row and os.path.exists(row[0]):
+                path = row[0]
+                self.index.execute("UPDATE blobs SET last_used_at = ? WHERE hash = ?", (now, digest))
+                logger.info("Identical screenshot already stored: %s", path)
+            else:
+                data, extension = self._encode(png_bytes)
+                blob_dir = self.root / "blobs" / digest[:2]
+                blob_dir.mkdir(parents=True, exist_ok=True)
+                path = str(blob_dir / f"{digest}.{extension}")
+                temp_path = f"{path}.tmp"
+                with open(temp_path, "wb") as blob:
+                    blob.write(data)
+                os.replace(temp_path, path)
+                self.index.execute("INSERT OR REPLACE INTO blobs (hash, path, size, created_at, last_used_at) "
+                                   "VALUES (?, ?, ?, ?, ?)", (digest, path, len(data), now, now))
+            self.index.execute("INSERT INTO captures (scenario, step, hash, captured_at) VALUES (?, ?, ?, ?)",
+                               (scenario, step, digest, now))
+        self.evict(keep=digest)
+        return path
+
+    def find(self, scenario: str, step: str = None) -> Optional[str]:
+        """
+        Get the latest blob captured for a scenario (and step).
+
+        Returns:
+            str: Blob path or None
+        """
+        query = ("SELECT b.path FROM captures c JOIN blobs b ON b.hash = c.hash WHERE c.scenario = ?"
+                 + (" AND c.step = ?" if step else "") + " ORDER BY c.id DESC LIMIT 1")
+        row = self.index.execute(query, (scenario, step) if step else (scenario,)).fetchone()
+        return row[0] if row else None
+
+    def _delete_blobs(self, hashes_and_paths):
+        """Remove blobs from disk and index, returns reclaimed bytes."""
+        reclaimed = 0
+        for digest, path, size in hashes_and_paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            reclaimed += size
+            self.index.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+            self.index.execute("DELETE FROM captures WHERE hash = ?", (digest,))
+        return reclaimed
+
+    def evict(self, keep: str = None) -> int:
+        """
+        Evict blobs older than max age, then least recently used blobs above max size.
+
+        Args:
+            keep (str): Hash of a blob that must not be evicted (e.g. the one just saved)
+
+        Returns:
+            int: Reclaimed bytes
+        """
+        reclaimed = 0
+        with self.index:
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                reclaimed += self._delete_blobs(self.index.execute(
+                    "SELECT hash, path, size FROM blobs WHERE last_used_at < ?", (cutoff,)).fetchall())
+            if self.max_bytes:
+                total = self.index.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+                if total > self.max_bytes:
+                    victims = []
+                    for digest, path, size in self.index.execute(
+                            "SELECT hash, path, size FROM blobs ORDER BY last_used_at"):
+                        if total <= self.max_bytes:
+                            break
+                        if digest == keep:
+                            continue
+                        victims.append((digest, path, size))
+                        total -= size
+                    reclaimed += self._delete_blobs(victims)
+        if reclaimed:
+            logger.info("Evicted screenshots, reclaimed %d bytes", reclaimed)
+        return reclaimed
+
+    def close(self):
+        """Close the index database."""
+        self.index.close()
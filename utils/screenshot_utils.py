@@ -7,30 +7,78 @@ import logging
 from datetime import datetime
 from pathlib import Path
 from utils.settings_manager import settings_manager
+from utils.screenshot_store import ScreenshotStore
 
 logger = logging.getLogger(__name__)
 
+# Keeps names well below the usual 255 byte file name limit once the timestamp is appended
+MAX_NAME_LENGTH = 150
+
+
+def sanitize_filename(filename):
+    """Sanitize filename for safe file system usage"""
+    # Remove or replace invalid and control characters
+    invalid_chars = '<>:"/\\|?*'
+    filename = "".join('_' if char in invalid_chars or not char.isprintable() else char for char in filename)
+    return filename.strip(" .")[:MAX_NAME_LENGTH] or "screenshot"
+
+
+def unique_screenshot_path(output_dir, name, include_timestamp=True):
+    """
+    Build a path for a new screenshot that does not overwrite an existing one
+
+    Args:
+        output_dir (str): Directory the screenshot goes to
+        name (str): Sanitized screenshot name
+        include_timestamp (bool): Whether to include timestamp in filename
+
+    Returns:
+        str: Path to save the screenshot to
+    """
+    if include_timestamp:
+        name = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    filepath = os.path.join(output_dir, f"{name}.png")
+    counter = 1
+    while os.path.exists(filepath):
+        filepath = os.path.join(output_dir, f"{name}_{counter}.png")
+        counter += 1
+    return filepath
+
 
 class ScreenshotUtils:
     """Simple utility class for capturing screenshots"""
     
-    def __init__(self, driver, output_dir=None):
+    def __init__(self, driver, output_dir=None, store=None):
         self.driver = driver
         # Get screenshot directory from settings, fallback to "screenshots"
         self.output_dir = output_dir or settings_manager.get("screenshot_dir", "screenshots")
         self._ensure_output_dir()
+        # Content-addressed store deduplicates identical captures; a store passed in stays open after close()
+        self.store = store
+        self._owns_store = False
+        if self.store is None and settings_manager.get("screenshot_store", True):
+            self.store = ScreenshotStore(self.output_dir)
+            self._owns_store = True
+
+    def close(self):
+        """Close the screenshot store if this instance opened it"""
+        if self._owns_store:
+            self.store.close()
+            self.store = None
+            self._owns_store = False
     
     def _ensure_output_dir(self):
         """Ensure the output directory exists"""
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
     
-    def capture_screenshot(self, name=None, include_timestamp=True):
+    def capture_screenshot(self, name=None, include_timestamp=True, step_name=None):
         """
         Capture a screenshot and save it to the output directory
         
         Args:
             name (str): Name for the screenshot file
             include_timestamp (bool): Whether to include timestamp in filename
+            step_name (str): Step the screenshot belongs to (used by the screenshot store index)
             
         Returns:
             str: Path to the saved screenshot file
@@ -38,14 +86,13 @@ class ScreenshotUtils:
         try:
             if name is None:
                 name = "screenshot"
+
+            if self.store is not None:
+                filepath = self.store.save(self.driver.get_screenshot_as_png(), name, step_name)
+                logger.info(f"Screenshot saved: {filepath}")
+                return filepath
             
-            if include_timestamp:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{name}_{timestamp}.png"
-            else:
-                filename = f"{name}.png"
-            
-            filepath = os.path.join(self.output_dir, filename)
+            filepath = unique_screenshot_path(self.output_dir, name, include_timestamp)
             
             # Take screenshot
             self.driver.save_screenshot(filepath)
@@ -68,13 +115,11 @@ class ScreenshotUtils:
         Returns:
             str: Path to the saved screenshot file
         """
+        if self.store is not None:
+            return self.capture_screenshot(scenario_name, step_name=step_name or "failure")
         safe_name = self._sanitize_filename(f"{scenario_name}_{step_name or 'failure'}")
         return self.capture_screenshot(safe_name)
     
     def _sanitize_filename(self, filename):
         """Sanitize filename for safe file system usage"""
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        return filename 
\ No newline at end of file
+        return sanitize_filename(filename)
@@ -5,10 +5,15 @@ Supports both local INI files and remote configurations (AWS/CI)
 import configparser
 import logging
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Any, Optional
 from utils.s3_utils import S3Downloader
 
+# Sections such as [profile:chrome_headless] declare browser/option profiles for matrix runs
+PROFILE_SECTION_PREFIX = "profile:"
+
 
 class Environments:
     """Environment constants"""
@@ -16,14 +21,25 @@ class Environments:
     STAGING = "staging"
 
 
+class _ProfileOverlay(threading.local):
+    """Profile active in a thread; class defaults keep lookups in threads without a profile cheap"""
+    name = None
+    values = None
+
+
 class SettingsManager:
     """Centralized settings management with support for:
     - Local INI files (development)
     - Remote configurations (staging)
     - Environment variable overrides
+    - Browser/option profiles overlaid per thread (matrix runs)
      """
     def __init__(self):
         self._settings = None
+        self._profiles = {}
+        self._local = _ProfileOverlay()
+        # Skips the per-thread lookup in get() for runs that never activate a profile
+        self._profiles_used = False
         self.environment = self._detect_environment()
         self.project_dir = self._get_project_dir()
         
@@ -54,6 +70,9 @@ class SettingsManager:
             if config.has_section(section):
                 for key, value in config.items(section):
                     settings[key] = self._parse_value(value)
+        self._profiles = {section[len(PROFILE_SECTION_PREFIX):].strip():
+                          {key: self._parse_value(value) for key, value in config.items(section)}
+                          for section in config.sections() if section.startswith(PROFILE_SECTION_PREFIX)}
         return settings
     
     def _load_local_settings(self) -> Dict[str, Any]:
@@ -155,10 +174,63 @@ class SettingsManager:
             key (str): Setting key to retrieve
             default (Any): Default value if key not found
             
+        Environment variables take precedence over the active profile, which
+        takes precedence over the settings file.
+
         Returns:
             Any: Setting value or default
         """
         settings = self.get_settings()
+        if self._profiles_used:
+            profile = self._local.values
+            if profile is not None and key in profile:
+                for name, value in os.environ.items():
+                    if name.upper() == key.upper():
+                        return self._parse_value(value)
+                return profile[key]
         return settings.get(key, default)
+
+    def get_profiles(self) -> Dict[str, Dict[str, Any]]:
+        """Get the browser/option profiles declared in [profile:<name>] sections.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Profile name -> settings it overrides
+        """
+        self.get_settings()
+        return self._profiles
+
+    @property
+    def active_profile(self) -> Optional[str]:
+        """Name of the profile active in the current thread, None if no profile is active."""
+        return self._local.name
+
+    def set_profile(self, name: Optional[str]):
+        """Overlay a profile's settings on all settings read by the current thread.
+
+        Args:
+            name (Optional[str]): Profile name, None removes the overlay
+
+        Raises:
+            KeyError: If the profile is not declared
+        """
+        if name is not None and name not in self.get_profiles():
+            raise KeyError(f"Unknown settings profile: {name}")
+        self._local.name = name
+        self._local.values = self._profiles[name] if name is not None else None
+        self._profiles_used = self._profiles_used or name is not None
+
+    @contextmanager
+    def use_profile(self, name: Optional[str]):
+        """Activate a profile in the current thread for the duration of a with block.
+
+        Args:
+            name (Optional[str]): Profile name, None runs the block without a profile
+        """
+        previous = self.active_profile
+        self.set_profile(name)
+        try:
+            yield
+        finally:
+            self.set_profile(previous)
     
 settings_manager = SettingsManager() 
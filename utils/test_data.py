@@ -1,69 +1,254 @@
 """
 Test data mapping system for environment-specific values.
 Maps feature variables to actual values based on current environment.
+
+Mappings are loaded once from a per-environment data file (or from S3 for remote
+environments, before the generic local file) and kept in precomputed lookup tables. Bulk datasets (CSV or JSONL)
+are streamed row by row and can be partitioned across parallel workers.
 """
+import csv
+import json
+import logging
+import os
+from string import Template
+from typing import Any, Dict, Iterator, Optional
+
+from utils.settings_manager import settings_manager, Environments
+from utils.worker_info import get_worker_count, get_worker_index
+
+logger = logging.getLogger(__name__)
+
+# Used when no test data file is available for the current environment
+DEFAULT_TEST_DATA = {
+    "usernames": {"testuser": "${test_username}"},
+    "passwords": {"testpass": "${test_password}"},
+    "urls": {"homepage": "${base_url}", "login": "${base_url}/login"},
+    "datasets": {},
+}
+
+# Fallbacks for settings referenced by the default mappings
+SETTING_DEFAULTS = {"base_url": "https://www.demoblaze.com"}
+
+
+class _SettingsLookup(dict):
+    """Mapping for Template substitution that reads each name through the settings manager."""
+
+    def __missing__(self, name: str) -> str:
+        value = settings_manager.get(name, SETTING_DEFAULTS.get(name))
+        if value is None:
+            raise KeyError(name)
+        return str(value)
 
-from utils.settings_manager import settings_manager
 
 class TestData:
     """
     Maps feature variables to environment-specific test data.
     """
-    
+
     def __init__(self):
         self.environment = settings_manager.environment
-    
-    def get_username(self, feature_username):
+        self._usernames: Optional[Dict[str, Any]] = None
+        self._profile: Optional[str] = None
+        self._passwords: Dict[str, Any] = {}
+        self._urls: Dict[str, Any] = {}
+        self._datasets: Dict[str, str] = {}
+        self._claims: Dict[str, Iterator[Dict[str, str]]] = {}
+
+    @staticmethod
+    def _read_local_data(path: str) -> Optional[Dict[str, Any]]:
+        """Read a local test data file if it exists."""
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as data_file:
+            logger.info("Loading test data from %s", path)
+            return json.load(data_file)
+
+    def _read_data(self) -> Optional[Dict[str, Any]]:
+        """
+        Read test data from the first available source.
+
+        A configured test_data_file is the only source. Otherwise the lookup order is the environment's own file,
+        then S3 (remote environments only), then the generic data/test_data.json.
+
+        Returns:
+            Optional[Dict[str, Any]]: Test data, None if no source has any
+        """
+        configured = settings_manager.get("test_data_file")
+        if configured:
+            return self._read_local_data(configured)
+        data_dir = settings_manager.get("test_data_dir", "data")
+        data = self._read_local_data(os.path.join(data_dir, f"test_data_{self.environment}.json"))
+        if data is None and self.environment != Environments.DEVELOPMENT:
+            data = self._read_remote_data()
+        if data is None:
+            data = self._read_local_data(os.path.join(data_dir, "test_data.json"))
+        return data
+
+    def _read_remote_data(self) -> Optional[Dict[str, Any]]:
+        """Read test data file from S3 for remote environments."""
+        if not os.getenv('S3_BUCKET_NAME'):
+            return None
+        from utils.s3_utils import S3Downloader
+
+        s3_key = settings_manager.get("test_data_s3_key", "s3_test_data.json")
+        s3_downloader = S3Downloader()
+        if not s3_downloader.file_exists(s3_key):
+            return None
+        temp_file = s3_downloader.download_file_to_temp(s3_key)
+        try:
+            with open(temp_file.name, encoding='utf-8') as data_file:
+                return json.load(data_file)
+        finally:
+            s3_downloader.cleanup_temp_file(temp_file)
+
+    @staticmethod
+    def _resolve(value):
+        """Substitute ${setting} references with values from the settings manager, active profile included."""
+        if not isinstance(value, str) or '$' not in value:
+            return value
+        if value.startswith('${') and value.endswith('}') and value.count('$') == 1:
+            name = value[2:-1]
+            return settings_manager.get(name, SETTING_DEFAULTS.get(name))
+        return Template(value).safe_substitute(_SettingsLookup())
+
+    def _ensure_loaded(self):
+        """Build lookup tables on first use and again whenever the active profile changes."""
+        profile = settings_manager.active_profile
+        if self._usernames is not None and self._profile == profile:
+            return
+        self._profile = profile
+        data = self._read_data()
+        if data is None:
+            data = DEFAULT_TEST_DATA
+
+        self._passwords = {k: self._resolve(v) for k, v in data.get("passwords", {}).items()}
+        self._urls = {k: self._resolve(v) for k, v in data.get("urls", {}).items()}
+        self._datasets = dict(data.get("datasets", {}))
+        self._usernames = {k: self._resolve(v) for k, v in data.get("usernames", {}).items()}
+
+    def reload(self):
+        """Drop cached lookup tables so they are rebuilt on next access."""
+        self._usernames = None
+        self._claims.clear()
+
+    def get_username(self, feature_username: str) -> str:
         """
         Maps feature username to environment-specific username.
-        
+
         Args:
             feature_username (str): Username from feature file (e.g., "testuser")
-            
+
         Returns:
             str: Environment-specific username
         """
+        self._ensure_loaded()
+        return self._usernames.get(feature_username, feature_username)
 
-        username_mapping = {
-            'testuser': settings_manager.get("test_username"),
-        }
-        
-        return username_mapping.get(feature_username, feature_username)
-    
-    def get_password(self, feature_password):
+    def get_password(self, feature_password: str) -> str:
         """
         Maps feature password to environment-specific password.
-        
+
         Args:
             feature_password (str): Password from feature file (e.g., "testpass")
-            
+
         Returns:
             str: Environment-specific password
         """
+        self._ensure_loaded()
+        return self._passwords.get(feature_password, feature_password)
 
-        password_mapping = {
-            'testpass': settings_manager.get("test_password"),
-        }
-        
-        return password_mapping.get(feature_password, feature_password)
-    
-    def get_url(self, feature_url):
+    def get_url(self, feature_url: str) -> str:
         """
         Maps feature URL to environment-specific URL.
-        
+
         Args:
             feature_url (str): URL from feature file (e.g., "homepage")
-            
+
         Returns:
             str: Environment-specific URL
         """
+        self._ensure_loaded()
+        return self._urls.get(feature_url, feature_url)
+
+    def get_dataset_path(self, dataset: str) -> str:
+        """
+        Resolve a dataset name to its file path.
+
+        Args:
+            dataset (str): Dataset name declared in the test data file, or a direct file path
+
+        Returns:
+            str: Path to the CSV or JSONL dataset file
+
+        Raises:
+            LookupError: If the dataset is unknown
+        """
+        self._ensure_loaded()
+        if dataset in self._datasets:
+            return self._datasets[dataset]
+        if os.path.splitext(dataset)[1] in ('.csv', '.jsonl'):
+            return dataset
+        raise LookupError(f"Unknown test dataset: {dataset}")
+
+    def iter_dataset(self, dataset: str) -> Iterator[Dict[str, str]]:
+        """
+        Stream rows of a bulk dataset without loading the whole file.
+
+        Args:
+            dataset (str): Dataset name or path (.csv or .jsonl)
+
+        Yields:
+            Dict[str, str]: One row per record
+        """
+        path = self.get_dataset_path(dataset)
+        with open(path, newline='', encoding='utf-8') as data_file:
+            if path.endswith('.jsonl'):
+                for line in data_file:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                yield from csv.DictReader(data_file)
+
+    def iter_partition(self, dataset: str, worker_index: Optional[int] = None,
+                       worker_count: Optional[int] = None) -> Iterator[Dict[str, str]]:
+        """
+        Stream only the dataset rows owned by a worker.
+
+        Row N belongs to worker N % worker_count, so parallel workers never share a row.
+
+        Args:
+            dataset (str): Dataset name or path
+            worker_index (int): Worker index, defaults to WORKER_INDEX
+            worker_count (int): Total workers, defaults to WORKER_COUNT
+
+        Yields:
+            Dict[str, str]: Rows belonging to the worker
+        """
+        count = worker_count or get_worker_count()
+        index = get_worker_index() if worker_index is None else worker_index
+        for row_number, row in enumerate(self.iter_dataset(dataset)):
+            if row_number % count == index:
+                yield row
+
+    def claim_user(self, dataset: str) -> Dict[str, str]:
+        """
+        Take the next unused account of this worker's dataset partition.
+
+        Args:
+            dataset (str): Dataset name or path
+
+        Returns:
+            Dict[str, str]: Dataset row describing the account
+
+        Raises:
+            LookupError: If the worker's partition is exhausted
+        """
+        if dataset not in self._claims:
+            self._claims[dataset] = self.iter_partition(dataset)
+        try:
+            return next(self._claims[dataset])
+        except StopIteration:
+            raise LookupError(f"No unclaimed accounts left in dataset: {dataset}")
 
-        base_url = settings_manager.get("base_url", "https://www.demoblaze.com")
-        url_mapping = {
-            'homepage': base_url,
-            'login': f"{base_url}/login"
-        }
-        
-        return url_mapping.get(feature_url, feature_url)
 
-test_data = TestData() 
\ No newline at end of file
+test_data = TestData()
@@ -0,0 +1,214 @@
+"""
+Visual Diff Engine
+Compares element screenshots against stored baselines using vectorized (NumPy) pixel and perceptual diffs.
+
+Requires the optional dependencies numpy and Pillow:
+
+    pip install numpy Pillow
+"""
+import io
+import logging
+from pathlib import Path
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+from utils.settings_manager import settings_manager
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Rectangle as (x, y, width, height) relative to the compared region
+Rect = Tuple[int, int, int, int]
+
+# Block size used by the perceptual (luminance block mean) comparison
+PERCEPTUAL_BLOCK = 8
+
+
+class DiffResult(NamedTuple):
+    """Outcome of a visual comparison"""
+    passed: bool
+    mismatch_ratio: float
+    perceptual_delta: float
+    max_delta: int
+    message: str
+
+
+class VisualDiff:
+    """
+    Visual regression helper.
+
+    Baselines are stored per page object as ``<baseline_dir>/<page>/<name>.png``. Missing
+    baselines are recorded on first run (or always when ``visual_update_baselines`` is set).
+    """
+
+    def __init__(self, baseline_dir=None, diff_dir=None, tolerance=None, max_mismatch_ratio=None,
+                 max_perceptual_delta=None, max_forgiven_ratio=None):
+        if np is None:
+            raise ImportError("Visual diff requires numpy and Pillow: pip install numpy Pillow")
+        self.baseline_dir = Path(baseline_dir or settings_manager.get("visual_baseline_dir", "visual_baselines"))
+        self.diff_dir = Path(diff_dir or settings_manager.get("visual_diff_dir", "visual_diffs"))
+        self.tolerance = self._setting(tolerance, "visual_tolerance", 8)
+        self.max_mismatch_ratio = float(self._setting(max_mismatch_ratio, "visual_max_mismatch_ratio", 0.001))
+        self.max_perceptual_delta = float(self._setting(max_perceptual_delta, "visual_max_perceptual_delta", 0.02))
+        # Ceiling of differing pixels a small perceptual delta can forgive (anti-aliasing, sub-pixel shifts)
+        self.max_forgiven_ratio = float(self._setting(max_forgiven_ratio, "visual_max_forgiven_ratio", 0.01))
+        self.update_baselines = settings_manager.get("visual_update_baselines", False)
+        # Decoded baselines keyed by path, invalidated by file modification time
+        self._baselines = {}
+
+    @staticmethod
+    def _setting(value, key, default):
+        """Explicit value, then setting, then default."""
+        return value if value is not None else settings_manager.get(key, default)
+
+    @staticmethod
+    def load_image(png_bytes: bytes):
+        """Decode PNG bytes into an RGB uint8 array of shape (height, width, 3)."""
+        return np.asarray(Image.open(io.BytesIO(png_bytes)).convert("RGB"))
+
+    @staticmethod
+    def build_mask(shape, ignore: Sequence[Rect] = ()):
+        """
+        Build a boolean mask of pixels to compare (False for ignored rectangles).
+
+        Args:
+            shape (tuple): Image shape (height, width, ...)
+            ignore (list): Rectangles (x, y, width, height) excluded from comparison
+        """
+        mask = np.ones(shape[:2], dtype=bool)
+        for x, y, width, height in ignore:
+            mask[max(y, 0):max(y + height, 0), max(x, 0):max(x + width, 0)] = False
+        return mask
+
+    @staticmethod
+    def _luminance_blocks(image):
+        """Mean luminance per PERCEPTUAL_BLOCK x PERCEPTUAL_BLOCK block."""
+        luminance = image[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        height = luminance.shape[0] // PERCEPTUAL_BLOCK * PERCEPTUAL_BLOCK
+        width = luminance.shape[1] // PERCEPTUAL_BLOCK * PERCEPTUAL_BLOCK
+        if not height or not width:
+            return luminance
+        blocks = luminance[:height, :width].reshape(height // PERCEPTUAL_BLOCK, PERCEPTUAL_BLOCK,
+                                                    width // PERCEPTUAL_BLOCK, PERCEPTUAL_BLOCK)
+        return blocks.mean(axis=(1, 3))
+
+    def compare(self, actual, baseline, ignore: Sequence[Rect] = ()) -> Tuple[DiffResult, Optional[object]]:
+        """
+        Compare two RGB arrays.
+
+        Args:
+            actual: Actual image array
+            baseline: Baseline image array
+            ignore (list): Rectangles excluded from comparison
+
+        Returns:
+            Tuple[DiffResult, ndarray]: Result and boolean array of differing pixels
+        """
+        if actual.shape != baseline.shape:
+            message = f"Size mismatch: actual {actual.shape[1]}x{actual.shape[0]}, " \
+                      f"baseline {baseline.shape[1]}x{baseline.shape[0]}"
+            return DiffResult(False, 1.0, 1.0, 255, message), None
+
+        mask = self.build_mask(actual.shape, ignore)
+        delta = np.abs(actual.astype(np.int16) - baseline.astype(np.int16)).max(axis=2)
+        delta[~mask] = 0
+        differing = delta > self.tolerance
+        compared = int(mask.sum()) or 1
+        mismatch_ratio = float(differing.sum()) / compared
+
+        masked_actual, masked_baseline = actual, baseline
+        if ignore:
+            masked_actual = np.where(mask[..., None], actual, 0)
+            masked_baseline = np.where(mask[..., None], baseline, 0)
+        perceptual_delta = float(np.abs(self._luminance_blocks(masked_actual)
+                                        - self._luminance_blocks(masked_baseline)).max(initial=0)) / 255
+
+        # Block luminance ignores colour and changes that average out within a block, so it only forgives
+        # a few differing pixels (anti-aliasing, sub-pixel shifts), never a large mismatch
+        forgiven = (mismatch_ratio <= self.max_forgiven_ratio
+                    and perceptual_delta <= self.max_perceptual_delta)
+        passed = mismatch_ratio <= self.max_mismatch_ratio or forgiven
+        message = f"{mismatch_ratio:.4%} pixels differ (max delta {int(delta.max(initial=0))}), " \
+                  f"perceptual delta {perceptual_delta:.4f}"
+        return DiffResult(passed, mismatch_ratio, perceptual_delta, int(delta.max(initial=0)), message), differing
+
+    def _write_diff(self, page: str, name: str, actual, differing):
+        """Save actual image with differing pixels highlighted in red."""
+        path = self.diff_dir / page / f"{name}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        highlighted = actual.copy()
+        if differing is not None:
+            highlighted[differing] = (255, 0, 0)
+        Image.fromarray(highlighted).save(str(path))
+        return str(path)
+
+    def _load_baseline(self, path: Path):
+        """Decode a baseline once and reuse it until the file changes."""
+        mtime = path.stat().st_mtime
+        cached = self._baselines.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self.load_image(path.read_bytes()))
+            self._baselines[path] = cached
+        return cached[1]
+
+    def check(self, png_bytes: bytes, page: str, name: str, ignore: Sequence[Rect] = ()) -> DiffResult:
+        """
+        Compare a screenshot with its baseline, recording the baseline if missing.
+
+        Args:
+            png_bytes (bytes): Screenshot of the region as PNG
+            page (str): Page object name (baseline folder)
+            name (str): Baseline name
+            ignore (list): Rectangles excluded from comparison
+
+        Returns:
+            DiffResult: Comparison result
+        """
+        baseline_path = self.baseline_dir / page / f"{name}.png"
+        if self.update_baselines or not baseline_path.exists():
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_bytes(png_bytes)
+            logger.info("Visual baseline recorded: %s", baseline_path)
+            return DiffResult(True, 0.0, 0.0, 0, f"Baseline recorded: {baseline_path}")
+
+        actual = self.load_image(png_bytes)
+        baseline = self._load_baseline(baseline_path)
+        result, differing = self.compare(actual, baseline, ignore)
+        if not result.passed:
+            diff_path = self._write_diff(page, name, actual, differing)
+            result = result._replace(message=f"{result.message}, diff saved: {diff_path}")
+        return result
+
+
+def relative_rect(region_rect: dict, element_rect: dict, scale: float = 1.0) -> Rect:
+    """
+    Convert an element rect (WebElement.rect) into a rectangle relative to a region, in image pixels.
+
+    Args:
+        region_rect (dict): Rect of the compared region element
+        element_rect (dict): Rect of the element to ignore
+        scale (float): Device pixel ratio of the screenshot
+
+    Returns:
+        Rect: (x, y, width, height)
+    """
+    return (int((element_rect['x'] - region_rect['x']) * scale),
+            int((element_rect['y'] - region_rect['y']) * scale),
+            int(round(element_rect['width'] * scale)),
+            int(round(element_rect['height'] * scale)))
+
+
+_visual_diff = None
+
+
+def get_visual_diff() -> VisualDiff:
+    """Shared VisualDiff instance (created on first use)."""
+    global _visual_diff
+    if _visual_diff is None:
+        _visual_diff = VisualDiff()
+    return _visual_diff
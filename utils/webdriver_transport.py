@@ -0,0 +1,124 @@
+"""
+WebDriver Transport Tuning
+Configures the HTTP connection between Selenium and the driver server (chromedriver, remote nodes)
+and the chromedriver service logging from settings
+"""
+import logging
+from typing import Any, Dict
+
+import urllib3
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from utils.settings_manager import settings_manager
+
+logger = logging.getLogger(__name__)
+
+# Chromedriver --log-level values
+CHROMEDRIVER_LOG_LEVELS = ("ALL", "DEBUG", "INFO", "WARNING", "SEVERE", "OFF")
+
+
+def get_transport_settings() -> Dict[str, Any]:
+    """
+    Read transport settings with their defaults.
+
+    Returns:
+        Dict[str, Any]: keep_alive, timeout (seconds), pool_size, connect_retries, compression
+    """
+    return {
+        "keep_alive": settings_manager.get("webdriver_keep_alive", True),
+        "timeout": float(settings_manager.get("webdriver_timeout", 120)),
+        "pool_size": settings_manager.get("webdriver_pool_size", 4),
+        "connect_retries": settings_manager.get("webdriver_connect_retries", 2),
+        "compression": settings_manager.get("webdriver_compression", False),
+    }
+
+
+def build_chrome_service(executable_path: str = None) -> ChromeService:
+    """
+    Build a chromedriver service with log level and log path from settings.
+
+    Logs are discarded unless chromedriver_log_path is set.
+
+    Args:
+        executable_path (str): Fixed chromedriver path, None lets Selenium Manager resolve it
+
+    Returns:
+        ChromeService: Configured service
+    """
+    log_path = settings_manager.get("chromedriver_log_path")
+    log_level = str(settings_manager.get("chromedriver_log_level", "WARNING")).upper()
+    if log_level not in CHROMEDRIVER_LOG_LEVELS:
+        raise ValueError(f"Unsupported chromedriver_log_level: {log_level}")
+    return ChromeService(
+        executable_path=executable_path,
+        service_args=[f"--log-level={log_level}"],
+        log_output=log_path or None,
+    )
+
+
+def tune_connection(driver):
+    """
+    Apply transport settings to the command executor of a driver.
+
+    Args:
+        driver: WebDriver instance
+    """
+    tune_executor(driver.command_executor)
+
+
+def _request_gzip(executor):
+    """
+    Add a gzip Accept-Encoding header to the requests of one command executor.
+
+    RemoteConnection.extra_headers (and ClientConfig.extra_headers, which Selenium copies onto it) is shared by
+    every connection in the process, so the header is added by an instance override instead.
+    urllib3 decodes compressed responses transparently.
+
+    Args:
+        executor: RemoteConnection instance
+    """
+    class_headers = executor.get_remote_connection_headers
+
+    def get_remote_connection_headers(parsed_url, keep_alive=False):
+        return {**class_headers(parsed_url, keep_alive), "Accept-Encoding": "gzip"}
+
+    executor.get_remote_connection_headers = get_remote_connection_headers
+
+
+def tune_executor(executor, **overrides):
+    """
+    Apply transport settings to a command executor (RemoteConnection).
+
+    - keep-alive connection pool sized by webdriver_pool_size
+    - timeout for every command (webdriver_timeout)
+    - retries for connection errors only, so commands are never sent twice
+    - optional gzip Accept-Encoding for large payloads (screenshots, page source)
+
+    Args:
+        executor: RemoteConnection instance
+        overrides: Values replacing get_transport_settings() entries
+    """
+    client_config = getattr(executor, "_client_config", None)
+    if client_config is None:
+        logger.warning("Command executor has no client config, transport settings not applied")
+        return
+
+    transport = {**get_transport_settings(), **overrides}
+    client_config.keep_alive = transport["keep_alive"]
+    client_config.timeout = transport["timeout"]
+    client_config.init_args_for_pool_manager = {
+        "init_args_for_pool_manager": {
+            "maxsize": transport["pool_size"],
+            "retries": urllib3.Retry(total=transport["connect_retries"], connect=transport["connect_retries"],
+                                     read=0, status=0, other=0, redirect=3, backoff_factor=0.1),
+        }
+    }
+    if transport["compression"]:
+        _request_gzip(executor)
+
+    if transport["keep_alive"]:
+        previous_pool = getattr(executor, "_conn", None)
+        executor._conn = executor._get_connection_manager()
+        if previous_pool is not None:
+            previous_pool.clear()
+    logger.debug("WebDriver transport tuned: %s", transport)
@@ -0,0 +1,49 @@
+"""
+Worker Identification Utilities
+Resolves the index of the current worker process when a suite is split across parallel workers
+"""
+import os
+
+
+def get_worker_count() -> int:
+    """Get the total number of parallel workers.
+
+    Read from the WORKER_COUNT environment variable, defaults to 1 (serial run).
+
+    Returns:
+        int: Number of workers, never less than 1
+    """
+    try:
+        return max(int(os.getenv('WORKER_COUNT', '1')), 1)
+    except ValueError:
+        return 1
+
+
+def get_worker_index() -> int:
+    """Get the zero-based index of the current worker.
+
+    Read from the WORKER_INDEX environment variable, defaults to 0.
+
+    Returns:
+        int: Worker index in range [0, worker count)
+
+    Raises:
+        ValueError: If the index is outside [0, worker count); wrapping it would make workers share data rows
+    """
+    try:
+        index = int(os.getenv('WORKER_INDEX', '0'))
+    except ValueError:
+        index = 0
+    count = get_worker_count()
+    if not 0 <= index < count:
+        raise ValueError(f"WORKER_INDEX must be in range [0, {count}), got {index} (WORKER_COUNT={count})")
+    return index
+
+
+def get_worker_id() -> str:
+    """Get a printable identifier of the current worker (e.g. "worker-0").
+
+    Returns:
+        str: Worker identifier
+    """
+    return f"worker-{get_worker_index()}"